@@ -0,0 +1,392 @@
+"""Client overhead benchmark.
+
+Measures what k5lib itself costs per call: URL and header building, request body
+encoding, response decoding and result extraction. Every public list_, iter_ and get_
+function, plus create and delete pairs, is driven against k5lib.standin running in a
+separate process, so CPU time and memory of the client are not mixed with the server.
+
+Modes:
+  sequential  one call after another
+  threaded    calls from a thread pool over the shared session
+  asyncio     calls of k5lib.aio counterparts on one event loop, needs aiohttp
+
+Rate limiting, the name cache and coalescing of concurrent GETs are switched off, so every
+call sends its own request.
+
+Every case reports calls/sec, p50, p99 and mean latency, client CPU microseconds per
+call and, in sequential mode, bytes allocated per call (tracemalloc peak) and bytes
+still held after the call. Results are written as JSON, compare two runs with --compare.
+
+Usage:
+  python benchmarks/client_overhead.py --output before.json
+  python benchmarks/client_overhead.py --output after.json --compare before.json
+
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import inspect
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import k5lib
+from k5lib import aio
+from k5lib import standin
+
+REGION = 'fi-1'
+USER = 'benchmark'
+PASSWORD = 'benchmark'
+CONTRACT = 'contract'
+PROJECT = 'project'
+MODES = ('sequential', 'threaded', 'asyncio')
+# Functions without HTTP requests
+NOT_CALLS = ('get_session', 'get_token_manager', 'get_rate', 'get_token_cache')
+
+
+def serve(connection, options):
+    """Run a seeded stand-in until parent closes the pipe."""
+    server = standin.StandIn(latency=options['latency'])
+    server.seed(PROJECT, CONTRACT, networks=options['networks'], subnets=1, ports=options['ports'],
+                routers=2, servers=options['servers'], floating_ips=2, security_groups=2, connectors=1,
+                vpn_services=1, stacks=2, secrets=2)
+    server.start()
+    connection.send(server.url_template)
+    try:
+        connection.recv()
+    except EOFError:
+        pass
+    server.stop()
+
+
+def first(items, key):
+    """Value of key in first item of a list response."""
+    for item in items:
+        if isinstance(item, dict):
+            return item.get(key)
+    return None
+
+
+def context():
+    """Argument values by parameter name, taken from the seeded project."""
+    token = k5lib.get_project_token(USER, PASSWORD, CONTRACT, PROJECT, REGION)
+    project_id = k5lib.get_project_id(USER, PASSWORD, CONTRACT, PROJECT, REGION)
+    domain_id = k5lib.get_domain_id(USER, PASSWORD, CONTRACT)
+    networks = k5lib.list_networks(token, REGION)['networks']
+    subnets = k5lib.list_subnets(token, REGION)['subnets']
+    ports = k5lib.list_ports(token, REGION)['ports']
+    routers = k5lib.list_routers(token, REGION)['routers']
+    servers = k5lib.list_servers(token, REGION, project_id)['servers']
+    images = k5lib.list_images(token, REGION)['images']
+    stacks = k5lib.list_stacks(token, REGION, project_id)['stacks']
+    endpoints = k5lib.list_network_connector_endpoints(token, REGION)['network_connector_endpoints']
+    connectors = k5lib.list_network_connectors(token, REGION)['network_connectors']
+    services = k5lib.list_ipsec_vpn_services(token, REGION)['vpnservices']
+    ike_policies = k5lib.list_ike_policies(token, REGION)['ikepolicies']
+    ipsec_policies = k5lib.list_ipsec_policies(token, REGION)['ipsecpolicies']
+    connections = k5lib.list_ipsec_vpn_connections(token, REGION)['ipsec_site_connections']
+    ssl_connections = k5lib.list_ssl_vpn_connections(token, REGION)['ssl_vpn_v2_connections']
+    server_id = first(servers, 'id')
+    server_ports = [port for port in ports if port['device_id'] == server_id]
+    return {'project_token': token, 'projectToken': token, 'region': REGION, 'project_id': project_id,
+            'projectId': project_id, 'user': USER, 'password': PASSWORD, 'contract': CONTRACT,
+            'project_name': PROJECT, 'domain_id': domain_id, 'region_id': REGION,
+            'domain_token': k5lib.get_global_token(USER, PASSWORD, CONTRACT),
+            'region_token': k5lib.get_region_token(USER, PASSWORD, CONTRACT, REGION),
+            'az': 'fi-1a', 'network_id': first(networks, 'id'), 'network_name': first(networks, 'name'),
+            'subnet_id': first(subnets, 'id'), 'subnet_name': first(subnets, 'name'),
+            'port_id': first(server_ports, 'id'), 'port_name': first(ports, 'name'),
+            'router_name': first(routers, 'name'), 'sg_name': 'default',
+            'server_id': server_id, 'server_name': first(servers, 'name'), 'flavor_name': 'S-1',
+            'image_id': first(images, 'id'), 'image_name': first(images, 'name'),
+            'stack_id': first(stacks, 'id'), 'stack_name': first(stacks, 'stack_name'),
+            'network_connector_endpoint_id': first(endpoints, 'id'), 'endpoint_name': first(endpoints, 'name'),
+            'connector_name': first(connectors, 'name'),
+            'service_id': first(services, 'id'), 'service_name': first(services, 'name'),
+            'connection_id': first(connections, 'id'), 'connection_name': first(connections, 'name'),
+            'ike_policy': (first(ike_policies, 'id'), first(ike_policies, 'name')),
+            'ipsec_policy': (first(ipsec_policies, 'id'), first(ipsec_policies, 'name')),
+            'ssl_connection_name': first(ssl_connections, 'name')}
+
+
+def arguments(name, function, values):
+    """Keyword arguments of a public function, or None if some cannot be filled."""
+    args = {}
+    for parameter in inspect.signature(function).parameters.values():
+        key = parameter.name
+        if key in ('policy_id', 'policy_name'):
+            policy = values['ike_policy' if 'ike' in name else 'ipsec_policy']
+            value = policy[0] if key == 'policy_id' else policy[1]
+        elif key == 'connection_name' and 'ssl' in name:
+            value = values['ssl_connection_name']
+        elif key in values:
+            value = values[key]
+        elif parameter.default is not inspect.Parameter.empty:
+            continue
+        else:
+            return None
+        if value is None:
+            return None
+        args[key] = value
+    return args
+
+
+def cases(values):
+    """
+    Cases to run.
+
+    :return: Tuple of dictionary of callables by case name and list of names of functions skipped.
+
+    """
+    calls = {}
+    skipped = []
+    for name in sorted(dir(k5lib)):
+        function = getattr(k5lib, name)
+        if not name.startswith(('list_', 'iter_', 'get_')) or name in NOT_CALLS or not inspect.isfunction(function):
+            continue
+        args = arguments(name, function, values)
+        if args is None:
+            skipped.append(name)
+            continue
+        if name.startswith('iter_'):
+            calls[name] = (lambda function, args: lambda: list(function(**args)))(function, args)
+        else:
+            calls[name] = (lambda function, args: lambda: function(**args))(function, args)
+
+    token = values['project_token']
+    counter = iter(range(10 ** 9))
+
+    def network_pair():
+        network_id = k5lib.create_network(token, REGION, 'fi-1a', 'bench-net-' + str(next(counter)))
+        return k5lib.delete_network(token, REGION, network_id)
+
+    def port_pair():
+        port_id = k5lib.create_port_on_network(token, REGION, 'fi-1a', values['network_id'],
+                                               port_name='bench-port-' + str(next(counter)))
+        return k5lib.delete_port(token, REGION, port_id)
+
+    def security_group_pair():
+        group_id = k5lib.create_security_group(token, REGION, 'bench-sg-' + str(next(counter)), 'benchmark')
+        return k5lib.delete_security_group(token, REGION, group_id)
+
+    calls['create_delete_network'] = network_pair
+    calls['create_delete_port'] = port_pair
+    calls['create_delete_security_group'] = security_group_pair
+    return calls, skipped
+
+
+def failed(result):
+    """True if a k5lib result is an error."""
+    if isinstance(result, str):
+        return result.startswith('Error')
+    if isinstance(result, list) and result and isinstance(result[-1], str):
+        return result[-1].startswith('Error')
+    return getattr(result, 'status_code', 200) >= 400
+
+
+def percentile(latencies, fraction):
+    """Latency below which fraction of calls finished, nearest rank."""
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))]
+
+
+def summary(case, mode, latencies, errors, elapsed, cpu):
+    """Result record of one case and mode."""
+    calls = len(latencies)
+    return {'case': case, 'mode': mode, 'calls': calls, 'errors': errors,
+            'calls_per_sec': round(calls / elapsed, 1) if elapsed else None,
+            'p50_ms': round(percentile(latencies, 0.50) * 1000, 3),
+            'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+            'mean_ms': round(statistics.mean(latencies) * 1000, 3),
+            'client_cpu_us_per_call': round(cpu / calls * 1e6, 1)}
+
+
+def timed(call):
+    """Run a call, return latency and error flag."""
+    start = time.perf_counter()
+    try:
+        error = failed(call())
+    except Exception:
+        error = True
+    return time.perf_counter() - start, error
+
+
+def run_sequential(name, call, calls):
+    """Run calls one after another."""
+    cpu = time.process_time()
+    start = time.perf_counter()
+    outcomes = [timed(call) for _ in range(calls)]
+    elapsed = time.perf_counter() - start
+    return summary(name, 'sequential', [latency for latency, _ in outcomes],
+                   sum(error for _, error in outcomes), elapsed, time.process_time() - cpu)
+
+
+def run_threaded(name, call, calls, workers):
+    """Run calls from a thread pool."""
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        cpu = time.process_time()
+        start = time.perf_counter()
+        outcomes = list(executor.map(lambda _: timed(call), range(calls)))
+        elapsed = time.perf_counter() - start
+        cpu = time.process_time() - cpu
+    return summary(name, 'threaded', [latency for latency, _ in outcomes],
+                   sum(error for _, error in outcomes), elapsed, cpu)
+
+
+def run_asyncio(name, function, args, calls, workers):
+    """Run calls of an aio coroutine function on one event loop."""
+    async def timed_call(semaphore):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                error = failed(await function(**args))
+            except Exception:
+                error = True
+            return time.perf_counter() - start, error
+
+    async def run():
+        semaphore = asyncio.Semaphore(workers)
+        await timed_call(semaphore)
+        cpu = time.process_time()
+        start = time.perf_counter()
+        outcomes = await asyncio.gather(*[timed_call(semaphore) for _ in range(calls)])
+        elapsed = time.perf_counter() - start
+        cpu = time.process_time() - cpu
+        await aio.close()
+        return outcomes, elapsed, cpu
+
+    outcomes, elapsed, cpu = asyncio.run(run())
+    return summary(name, 'asyncio', [latency for latency, _ in outcomes],
+                   sum(error for _, error in outcomes), elapsed, cpu)
+
+
+def allocations(call, calls):
+    """Bytes allocated at peak per call and bytes still held after calls, by tracemalloc."""
+    tracemalloc.start()
+    try:
+        call()
+        held = tracemalloc.get_traced_memory()[0]
+        peaks = []
+        for _ in range(calls):
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            call()
+            peaks.append(tracemalloc.get_traced_memory()[1] - before)
+        retained = tracemalloc.get_traced_memory()[0] - held
+    finally:
+        tracemalloc.stop()
+    return {'alloc_peak_bytes_per_call': int(statistics.mean(peaks)),
+            'alloc_retained_bytes_per_call': int(retained / calls)}
+
+
+def compare(results, baseline, threshold):
+    """
+    Print change of each case against a baseline run.
+
+    :return: Number of cases more than threshold slower.
+
+    """
+    before = dict(((item['case'], item['mode']), item) for item in baseline['results'])
+    regressions = 0
+    for item in results:
+        old = before.get((item['case'], item['mode']))
+        if old is None or not old['calls_per_sec'] or not item['calls_per_sec']:
+            continue
+        change = item['calls_per_sec'] / old['calls_per_sec'] - 1
+        cpu_change = item['client_cpu_us_per_call'] / old['client_cpu_us_per_call'] - 1
+        flag = ''
+        if change < -threshold:
+            flag = '  REGRESSION'
+            regressions += 1
+        print('%-45s %-10s %+7.1f%% calls/sec %+7.1f%% cpu/call%s' % (item['case'], item['mode'], change * 100,
+                                                                      cpu_change * 100, flag))
+    return regressions
+
+
+def main():
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description='Client overhead benchmark of k5lib against k5lib.standin.')
+    parser.add_argument('--calls', type=int, default=200, help='Calls per case and mode.')
+    parser.add_argument('--workers', type=int, default=16, help='Threads or coroutines at a time.')
+    parser.add_argument('--alloc-calls', type=int, default=20, help='Calls measured with tracemalloc, 0 skips.')
+    parser.add_argument('--modes', default=','.join(MODES), help='Comma separated modes.')
+    parser.add_argument('--cases', default='', help='Only cases containing one of these comma separated words.')
+    parser.add_argument('--networks', type=int, default=5)
+    parser.add_argument('--ports', type=int, default=20, help='Ports per network.')
+    parser.add_argument('--servers', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds stand-in adds to every response.')
+    parser.add_argument('--output', help='Write JSON results to file instead of stdout.')
+    parser.add_argument('--compare', help='JSON results of an earlier run to compare to.')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='Fraction of calls/sec lost counted as regression. Defaults 0.10.')
+    options = parser.parse_args()
+    modes = [mode for mode in options.modes.split(',') if mode]
+    if 'asyncio' in modes and aio.aiohttp is None:
+        print('aiohttp is not installed, skipping asyncio mode', file=sys.stderr)
+        modes.remove('asyncio')
+
+    connection, child_connection = multiprocessing.Pipe()
+    server = multiprocessing.Process(target=serve, args=(child_connection, vars(options)), daemon=True)
+    server.start()
+    try:
+        k5lib.configure_url(connection.recv())
+        # Every call must reach the stand-in, or the benchmark measures caches instead of the client
+        k5lib.configure_rate_limit(enabled=False)
+        k5lib.configure_name_cache(enabled=False)
+        k5lib.configure_single_flight(enabled=False)
+        values = context()
+        calls, skipped = cases(values)
+        words = [word for word in options.cases.split(',') if word]
+        results = []
+        for name, call in sorted(calls.items()):
+            if words and not any(word in name for word in words):
+                continue
+            call()
+            for mode in modes:
+                if mode == 'sequential':
+                    result = run_sequential(name, call, options.calls)
+                    if options.alloc_calls:
+                        result.update(allocations(call, options.alloc_calls))
+                elif mode == 'threaded':
+                    result = run_threaded(name, call, options.calls, options.workers)
+                elif mode == 'asyncio':
+                    function = getattr(aio, name, None)
+                    if function is None:
+                        continue
+                    result = run_asyncio(name, function, arguments(name, function, values), options.calls,
+                                         options.workers)
+                else:
+                    parser.error('unknown mode ' + mode)
+                results.append(result)
+                print('%-45s %-10s %9.1f calls/s  p50 %8.3f ms  p99 %8.3f ms  %8.1f us cpu/call'
+                      % (name, mode, result['calls_per_sec'], result['p50_ms'], result['p99_ms'],
+                         result['client_cpu_us_per_call']), file=sys.stderr)
+    finally:
+        connection.send('stop')
+        server.join(10)
+
+    report = {'benchmark': 'client_overhead', 'created': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+              'python': platform.python_version(), 'platform': platform.platform(),
+              'parameters': dict((key, value) for key, value in vars(options).items()
+                                 if key not in ('output', 'compare')),
+              'skipped': skipped, 'results': results}
+    if options.output:
+        with open(options.output, 'w') as output:
+            json.dump(report, output, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    if options.compare:
+        with open(options.compare) as baseline:
+            if compare(results, json.load(baseline), options.threshold):
+                sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
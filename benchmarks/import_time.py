@@ -0,0 +1,104 @@
+"""Import time benchmark.
+
+Measures cold start of k5lib: every scenario runs in a fresh interpreter, many times, and the
+time of the import statement itself is taken. Modules loaded by the statement are checked too,
+so a submodule or HTTP library creeping back into import k5lib is caught on any machine.
+
+Exits with 1 if a scenario exceeds its budget or loads a module it should not.
+
+Usage:
+  python benchmarks/import_time.py
+  python benchmarks/import_time.py --runs 50 --budget get_project_token=30 --output import.json
+
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Name, statement, default budget in milliseconds and modules the statement must not load
+SCENARIOS = (
+    ('import_k5lib', 'import k5lib', 20.0, ('k5lib.api', 'k5lib.network', 'requests', 'urllib3')),
+    ('get_project_token', 'from k5lib import get_project_token', 60.0, ('k5lib.network', 'requests', 'urllib3')),
+    ('list_ports', 'from k5lib import list_ports', 80.0, ('k5lib.compute', 'k5lib.vpn', 'requests')),
+    ('everything', 'from k5lib import *', None, ()),
+)
+
+PROBE = '''
+import json, sys, time
+before = set(sys.modules)
+start = time.perf_counter()
+%s
+elapsed = time.perf_counter() - start
+print(json.dumps({'seconds': elapsed, 'modules': sorted(set(sys.modules) - before)}))
+'''
+
+
+def measure(statement, runs):
+    """Run statement in fresh interpreters, return list of seconds and modules it loaded."""
+    times = []
+    modules = []
+    environment = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    for _ in range(runs):
+        output = subprocess.check_output([sys.executable, '-c', PROBE % statement], env=environment, cwd=ROOT)
+        result = json.loads(output.decode('utf-8').strip().splitlines()[-1])
+        times.append(result['seconds'])
+        modules = result['modules']
+    return times, modules
+
+
+def main():
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description='Import time benchmark of k5lib.')
+    parser.add_argument('--runs', type=int, default=20, help='Fresh interpreters per scenario.')
+    parser.add_argument('--budget', action='append', default=[],
+                        help='Median budget as NAME=MILLISECONDS, overrides default of a scenario.')
+    parser.add_argument('--output', help='Write JSON results to file instead of stdout.')
+    options = parser.parse_args()
+    budgets = dict((name, budget) for name, _, budget, _ in SCENARIOS)
+    for item in options.budget:
+        name, _, value = item.partition('=')
+        if name not in budgets:
+            parser.error('unknown scenario ' + name)
+        budgets[name] = float(value)
+
+    results = []
+    failures = []
+    for name, statement, _, forbidden in SCENARIOS:
+        times, modules = measure(statement, options.runs)
+        median = statistics.median(times) * 1000
+        loaded = [module for module in forbidden if module in modules]
+        result = {'scenario': name, 'statement': statement, 'runs': len(times),
+                  'min_ms': round(min(times) * 1000, 3), 'median_ms': round(median, 3),
+                  'max_ms': round(max(times) * 1000, 3), 'budget_ms': budgets[name],
+                  'modules_loaded': len(modules), 'k5lib_modules': [module for module in modules
+                                                                    if module.startswith('k5lib')],
+                  'forbidden_loaded': loaded}
+        results.append(result)
+        if budgets[name] is not None and median > budgets[name]:
+            failures.append(name + ': median %.1f ms over budget %.1f ms' % (median, budgets[name]))
+        if loaded:
+            failures.append(name + ': loaded ' + ', '.join(loaded))
+        print('%-20s median %7.2f ms  min %7.2f ms  %4d modules' % (name, median, result['min_ms'], len(modules)),
+              file=sys.stderr)
+
+    report = {'benchmark': 'import_time', 'python': sys.version.split()[0], 'results': results,
+              'failures': failures}
+    if options.output:
+        with open(options.output, 'w') as output:
+            json.dump(report, output, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    for failure in failures:
+        print('FAIL ' + failure, file=sys.stderr)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -28,8 +28,11 @@ securityGroupId = '91630e71-2555-4dcb-a720-0dd3c643f478'
 networkId ='6809bf51-a224-4f16-a77e-754c3033b1b6'
 
 
-projectToken = k5lib.get_project_token(username, password, domain, projectName, region)
-projectId = k5lib.get_project_id(username, password, domain, projectName, region)
+project = k5lib.authenticate_project(username, password, domain, projectName, region)
+if isinstance(project, str):
+    sys.exit(project)
+projectToken = project.token
+projectId = project.project_id
 
 #
 # Disconnect ports
@@ -43,34 +46,28 @@ projectId = k5lib.get_project_id(username, password, domain, projectName, region
 
 #
 # 1. List endpoints & ports
-connector_endpoints = k5lib.list_network_connector_endpoints(projectToken, region)
-print((json.dumps(connector_endpoints, indent=2)))
-
-ports = k5lib.list_ports(projectToken, region)
-print(json.dumps(ports, indent=2))
+snapshot = k5lib.snapshot_project(projectToken, region, projectId)
+print((json.dumps(snapshot.network_connector_endpoints, indent=2)))
+print(json.dumps(snapshot.ports, indent=2))
 
 #
 # 2. Select one endpoint (needs to match criteria)
 
 
 # loop trough connectors and find ones with 'mhaNe' on name, then delete it
-outputDict_a = connector_endpoints['network_connector_endpoints']
-outputDict_b = ports['ports']
-
 counter_a = 0
 counter_b = 0
 
-for i in outputDict_a:
+for i in snapshot.network_connector_endpoints:
     if 'mhaNet' in str(i['name']):
         print('Connector endpoint ID: ', str(i['network_connector_id']) )
         connectorId = str(i['network_connector_id'])
         #
         # 3. Find ALL ports related to endpoint
-        for j in outputDict_b:
-            if connectorId in str(j['device_id']):
-                print('Disconnected port:', str(j['id']))
-                # k5lib.disconnect_network_connector_endpoint(projectToken, region, str(j['network_connector_id']), str(j['id']))
-                counter_b +=1
+        for j in snapshot.ports_by_device.get(connectorId, []):
+            print('Disconnected port:', str(j['id']))
+            # k5lib.disconnect_network_connector_endpoint(projectToken, region, str(j['network_connector_id']), str(j['id']))
+            counter_b +=1
         counter_a += 1
 
 #
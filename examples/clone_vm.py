@@ -12,8 +12,11 @@ domain = env['OS_USER_DOMAIN_NAME']
 projectName = env['OS_PROJECT_NAME']
 region = env['OS_REGION_NAME']
 
-projectToken = k5lib.get_project_token(username, password, domain, projectName, region)
-projectId = k5lib.get_project_id(username, password, domain, projectName, region)
+project = k5lib.authenticate_project(username, password, domain, projectName, region)
+if isinstance(project, str):
+    sys.exit(project)
+projectToken = project.token
+projectId = project.project_id
 
 volumeId = 'REPLACE WITH volumeId'
 imageName = 'mgmt_exported_OS'
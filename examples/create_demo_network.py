@@ -37,8 +37,11 @@ portName = 'mha-port-' + k5lib.gen_passwd(6)
 print(portName)
 
 
-projectToken = k5lib.get_project_token(username, password, domain, projectName, region)
-projectId = k5lib.get_project_id(username, password, domain, projectName, region)
+project = k5lib.authenticate_project(username, password, domain, projectName, region)
+if isinstance(project, str):
+    sys.exit(project)
+projectToken = project.token
+projectId = project.project_id
 
 print('networkconnector')
 # Create new connector
@@ -0,0 +1,37 @@
+"""Demo network built with a plan.
+
+Network, subnet and router in two az
+Both az are built at the same time
+
+"""
+from os import environ as env
+import sys
+sys.path.append('k5lib')
+import k5lib
+
+username = env['OS_USERNAME']
+password = env['OS_PASSWORD']
+domain = env['OS_USER_DOMAIN_NAME']
+region = env['OS_REGION_NAME']
+projectName = env['OS_PROJECT_NAME']
+suffix = k5lib.gen_passwd(6)
+
+# Create a log file
+k5lib.create_logfile('create_demo_network_plan.log')
+
+projectToken = k5lib.get_project_token(username, password, domain, projectName, region)
+
+plan = k5lib.Plan(projectToken, region)
+for az, cidr in (('fi-1a', '192.168.10.0/24'), ('fi-1b', '192.168.20.0/24')):
+    network = plan.add('network-' + az, k5lib.create_network, az=az, network_name='demo-' + az + '-' + suffix)
+    subnet = plan.add('subnet-' + az, k5lib.create_subnet, network_id=network, cidr=cidr,
+                      subnet_name='demo-' + az + '-' + suffix, az=az)
+    router = plan.add('router-' + az, k5lib.create_router, name='demo-' + az + '-' + suffix, az=az)
+    plan.add('interface-' + az, k5lib.add_router_interface, router_id=router, subnet_id=subnet)
+
+print(plan.levels())
+result = plan.apply()
+print(result)
+print(result.results)
+print(result.errors)
+print('Critical path: ', ' -> '.join(result.critical_path))
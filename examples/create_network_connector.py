@@ -14,8 +14,11 @@ region = env['OS_REGION_NAME']
 
 connectorName = 'foobar_nw_connector'
 
-projectToken = k5lib.get_project_token(username, password, domain, projectName, region)
-projectId = k5lib.get_project_id(username, password, domain, projectName, region)
+project = k5lib.authenticate_project(username, password, domain, projectName, region)
+if isinstance(project, str):
+    sys.exit(project)
+projectToken = project.token
+projectId = project.project_id
 
 
 connectorId = k5lib.create_network_connector(projectToken, projectId, connectorName, region)
@@ -31,8 +31,11 @@ domain = env['OS_USER_DOMAIN_NAME']
 projectName = env['OS_PROJECT_NAME']
 region = env['OS_REGION_NAME']
 
-project_token = k5lib.get_project_token(username, password, domain, projectName, region)
-project_id = k5lib.get_project_id(username, password, domain, projectName, region)
+project = k5lib.authenticate_project(username, password, domain, projectName, region)
+if isinstance(project, str):
+    sys.exit(project)
+project_token = project.token
+project_id = project.project_id
 flavor_id = k5lib.get_flavor_id(project_token,region, project_id,flavor_name)
 image_id = k5lib.get_image_id(project_token,region, image_name)
 network_id = k5lib.get_network_id(project_token, region, network_name)
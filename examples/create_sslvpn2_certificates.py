@@ -49,8 +49,11 @@ server_key_file = args.server_key
 dh = args.dh
 
 
-projectToken = k5lib.get_project_token(username, password, domain, projectName, region)
-projectId = k5lib.get_project_id(username, password, domain, projectName, region)
+project = k5lib.authenticate_project(username, password, domain, projectName, region)
+if isinstance(project, str):
+    sys.exit(project)
+projectToken = project.token
+projectId = project.project_id
 
 
 ca_ref = cert_from_file(ca_file, 'ca')
@@ -32,6 +32,8 @@ Region
 def main():
     # Create a log file
     k5lib.create_logfile('fillrc.log')
+    # Reuse still valid tokens from earlier runs
+    k5lib.enable_token_cache()
     logging.info('Started')
 
     userName = input("Username: ")
@@ -15,8 +15,11 @@ region = env['OS_REGION_NAME']
 
 exportId = 'REPLACE with export job ID'
 
-projectToken = k5lib.get_project_token(username, password, domain, projectName, region)
-projectId = k5lib.get_project_id(username, password, domain, projectName, region)
+project = k5lib.authenticate_project(username, password, domain, projectName, region)
+if isinstance(project, str):
+    sys.exit(project)
+projectToken = project.token
+projectId = project.project_id
 
 exportStatus = k5lib.get_export_status(projectToken, region, exportId)
 logging.info(json.dumps(exportStatus, indent=4))
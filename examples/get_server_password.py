@@ -10,6 +10,8 @@ import os
 
 # Create a log file
 k5lib.create_logfile('get_server_password.log')
+# Reuse still valid tokens from earlier runs
+k5lib.enable_token_cache()
 
 # Setup command line parser
 parser = argparse.ArgumentParser(description="Get a password of server(s) ")
@@ -27,8 +29,11 @@ region = env['OS_REGION_NAME']
 
 # Init variables
 keyfilename = args.keyfile
-project_token = k5lib.get_project_token(username, password, domain, projectName, region)
-project_id = k5lib.get_project_id(username, password, domain, projectName, region)
+project = k5lib.authenticate_project(username, password, domain, projectName, region)
+if isinstance(project, str):
+    sys.exit(project)
+project_token = project.token
+project_id = project.project_id
 serverList = k5lib.list_servers(project_token, region, project_id)
 
 logging.info(json.dumps(serverList, indent=2))
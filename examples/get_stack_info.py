@@ -24,8 +24,11 @@ args = parser.parse_args()
 
 stackName = args.stackname
 
-projectToken = k5lib.get_project_token(username, password, domain, projectName, region)
-projectId = k5lib.get_project_id(username, password, domain, projectName, region)
+project = k5lib.authenticate_project(username, password, domain, projectName, region)
+if isinstance(project, str):
+    sys.exit(project)
+projectToken = project.token
+projectId = project.project_id
 stack_id = k5lib.get_stack_id(projectToken, region, projectId, stackName)
 
 stackInfo = k5lib.get_stack_info(projectToken, projectId, region, stackName, stack_id)
@@ -14,8 +14,11 @@ domain = env['OS_USER_DOMAIN_NAME']
 projectName = env['OS_PROJECT_NAME']
 region = env['OS_REGION_NAME']
 
-project_token = k5lib.get_project_token(username, password, domain, projectName, region)
-project_id = k5lib.get_project_id(username, password, domain, projectName, region)
+project = k5lib.authenticate_project(username, password, domain, projectName, region)
+if isinstance(project, str):
+    sys.exit(project)
+project_token = project.token
+project_id = project.project_id
 
 flavors = k5lib.list_flavors(project_token, region, project_id)
 print(json.dumps(flavors, indent=2))
@@ -2,131 +2,95 @@
 
 k5lib is a collection of functions and utilities to communicate with Fujits K5 cloud REST API.
 
+Names are loaded on first use: import k5lib imports no submodule, and k5lib.get_project_token
+imports only the modules it needs. HTTP libraries are imported when the first request is sent.
+
 """
-from .authenticate import get_global_token
-from .authenticate import get_region_token
-from .authenticate import get_project_token
-from .authenticate import get_domain_id
-from .authenticate import get_defaultproject_id
-from .authenticate import get_project_id
-from .authenticate import get_project_info
-from .contract import list_regions
-from .contract import get_region_info
-from .contract import activate_region
-from .contract import create_project
-from .contract import list_projects
-from .orchestration import create_stack
-from .orchestration import delete_stack
-from .orchestration import get_stack_info
-from .orchestration import list_stacks
-from .orchestration import get_stack_id
-from .image import clone_vm
-from .image import get_volume_info
-from .image import list_images
-from .image import get_image_id
-from .image import get_image_info
-from .image import export_image
-from .image import share_image
-from .image import accept_image_share
-from .image import get_export_status
-from .image import get_image_import_queue_status
-from .compute import get_vnc_console_url
-from .compute import create_keypair
-from .compute import list_keypairs
-from .compute import create_server
-from .compute import create_server_with_ip
-from .compute import create_server_from_volume
-from .compute import delete_server
-from .compute import list_servers
-from .compute import get_server_password
-from .compute import get_server_name
-from .compute import get_server_id
-from .compute import get_server_info
-from .compute import add_server_interface
-from .compute import list_server_interfaces
-from .compute import get_server_interface_info
-from .compute import detach_server_interface
-from .compute import list_flavors
-from .compute import get_flavor_id
-from .network import create_network_connector
-from .network import list_network_connectors
-from .network import get_network_connector_id
-from .network import delete_network_connector
-from .network import create_network_connector_endpoint
-from .network import list_network_connector_endpoints
-from .network import list_network_connector_endpoint_interfaces
-from .network import get_network_connector_endpoint_id
-from .network import get_network_connector_endpoint_info
-from .network import connect_network_connector_endpoint
-from .network import disconnect_network_connector_endpoint
-from .network import delete_network_connector_endpoint
-from .network import create_port_on_network
-from .network import create_inter_project_connection
-from .network import delete_inter_project_connection
-from .network import update_inter_project_connection
-from .network import create_network
-from .network import delete_network
-from .network import list_networks
-from .network import get_network_id
-from .network import create_subnet
-from .network import delete_subnet
-from .network import list_subnets
-from .network import get_subnet_id
-from .network import find_first_free_ip
-from .network import list_ports
-from .network import get_port_id
-from .network import attach_floating_ip_to_port
-from .network import delete_port
-from .network import create_security_group
-from .network import _rest_delete_security_group
-from .network import list_security_groups
-from .network import get_security_group_id
-from .network import create_security_group_rule
-from .network import create_router
-from .network import delete_router
-from .network import list_routers
-from .network import get_router_id
-from .network import update_router
-from .network import add_router_interface
-from .network import remove_router_interface
-from .network import list_floating_ips
-from .fw import list_firewall_rules
-from .fw import create_firewall_rule
-from .fw import create_firewall_policy
-from .fw import create_firewall
-from .lb import create_lb
-from .utils import create_logfile
-from .utils import gen_passwd
-from .vpn import create_ipsec_vpn_service
-from .vpn import list_ipsec_vpn_services
-from .vpn import get_ipsec_vpn_service_info
-from .vpn import get_ipsec_vpn_service_id
-from .vpn import update_ipsec_vpn_service
-from .vpn import delete_ipsec_vpn_service
-from .vpn import create_ipsec_policy
-from .vpn import list_ipsec_policies
-from .vpn import get_ipsec_policy_info
-from .vpn import get_ipsec_policy_id
-from .vpn import update_ipsec_policy
-from .vpn import delete_ipsec_policy
-from .vpn import create_ike_policy
-from .vpn import list_ike_policies
-from .vpn import get_ike_policy_info
-from .vpn import get_ike_policy_id
-from .vpn import update_ike_policy
-from .vpn import delete_ike_policy
-from .vpn import create_ipsec_vpn_connection
-from .vpn import list_ipsec_vpn_connections
-from .vpn import get_ipsec_vpn_connection_info
-from .vpn import get_ipsec_vpn_connection_id
-from .vpn import update_ipsec_vpn_connection
-from .vpn import delete_ipsec_vpn_connection
-from .vpn import create_ssl_vpn_service
-from .vpn import create_ssl_vpn_connection
-from .vpn import list_ssl_vpn_connections
-from .vpn import get_ssl_vpn_connection_id
-from .vpn import delete_ssl_vpn_connection
-from .key import create_key
-from .key import create_key_container
-from .key import list_keys
-from .key import list_key_containers
\ No newline at end of file
+import importlib
+
+# Public names by submodule defining them
+_EXPORTS = {
+    'authenticate': ('Authentication', 'authenticate_global', 'authenticate_region', 'authenticate_project',
+                     'clear_authentication_cache', 'TokenManager', 'get_token_manager', 'TokenFileCache',
+                     'enable_token_cache', 'disable_token_cache', 'get_global_token', 'get_region_token',
+                     'get_project_token', 'get_domain_id', 'get_defaultproject_id', 'get_project_id',
+                     'get_project_info'),
+    'contract': ('list_regions', 'get_region_info', 'activate_region', 'create_project', 'list_projects'),
+    'orchestration': ('create_stack', 'delete_stack', 'get_stack_info', 'list_stacks', 'iter_stacks', 'get_stack_id'),
+    'image': ('clone_vm', 'get_volume_info', 'list_images', 'iter_images', 'get_image_id', 'get_image_info',
+              'export_image', 'share_image', 'accept_image_share', 'get_export_status',
+              'get_image_import_queue_status'),
+    'compute': ('get_vnc_console_url', 'create_keypair', 'list_keypairs', 'create_server', 'create_server_with_ip',
+                'create_server_from_volume', 'delete_server', 'list_servers', 'iter_servers', 'iter_servers_detail',
+                'get_server_password', 'get_server_name', 'get_server_id', 'get_server_info', 'add_server_interface',
+                'list_server_interfaces', 'get_server_interface_info', 'detach_server_interface', 'list_flavors',
+                'iter_flavors', 'get_flavor_id'),
+    'network': ('create_network_connector', 'list_network_connectors', 'iter_network_connectors',
+                'get_network_connector_id', 'delete_network_connector', 'create_network_connector_endpoint',
+                'list_network_connector_endpoints', 'iter_network_connector_endpoints',
+                'list_network_connector_endpoint_interfaces', 'get_network_connector_endpoint_id',
+                'get_network_connector_endpoint_info', 'connect_network_connector_endpoint',
+                'disconnect_network_connector_endpoint', 'delete_network_connector_endpoint',
+                'create_port_on_network', 'create_inter_project_connection', 'delete_inter_project_connection',
+                'update_inter_project_connection', 'create_network', 'delete_network', 'list_networks',
+                'iter_networks', 'get_network_id', 'create_subnet', 'delete_subnet', 'list_subnets', 'iter_subnets',
+                'get_subnet_id', 'get_subnet_info', 'get_ip_allocator', 'find_first_free_ip', 'reserve_free_ips',
+                'list_ports', 'iter_ports', 'get_port_id', 'attach_floating_ip_to_port', 'delete_port',
+                'create_security_group', 'delete_security_group', '_rest_delete_security_group',
+                'list_security_groups', 'iter_security_groups', 'get_security_group_id', 'create_security_group_rule',
+                'create_router', 'delete_router', 'list_routers', 'iter_routers', 'get_router_id', 'update_router',
+                'add_router_interface', 'remove_router_interface', 'list_floating_ips', 'delete_floating_ip',
+                'iter_floating_ips'),
+    'fw': ('list_firewall_rules', 'iter_firewall_rules', 'create_firewall_rule', 'create_firewall_policy',
+           'create_firewall'),
+    'lb': ('create_lb',),
+    'ipam': ('IPAllocator',),
+    'models': ('Network', 'Subnet', 'Port', 'Router', 'FloatingIP', 'SecurityGroup', 'SecurityGroupRule', 'Server'),
+    'inventory': ('Snapshot', 'snapshot_project'),
+    'fleet': ('ServerWatch', 'watch_servers', 'wait_for_servers', 'create_servers'),
+    'plan': ('Plan', 'Ref'),
+    'teardown': ('plan_teardown', 'delete_resources'),
+    'session': ('get_session', 'configure_session', 'close_session', 'get_pool_stats'),
+    'ratelimit': ('configure_rate_limit', 'get_rate', 'get_rates'),
+    'api': ('configure_url',),
+    'instrument': ('Hook', 'Aggregator', 'add_hook', 'remove_hook'),
+    'namecache': ('configure_name_cache', 'clear_name_cache', 'get_name_cache_stats'),
+    'singleflight': ('configure_single_flight', 'get_single_flight_stats'),
+    'utils': ('create_logfile', 'gen_passwd'),
+    'vpn': ('create_ipsec_vpn_service', 'list_ipsec_vpn_services', 'iter_ipsec_vpn_services',
+            'get_ipsec_vpn_service_info', 'get_ipsec_vpn_service_id', 'update_ipsec_vpn_service',
+            'delete_ipsec_vpn_service', 'create_ipsec_policy', 'list_ipsec_policies', 'iter_ipsec_policies',
+            'get_ipsec_policy_info', 'get_ipsec_policy_id', 'update_ipsec_policy', 'delete_ipsec_policy',
+            'create_ike_policy', 'list_ike_policies', 'iter_ike_policies', 'get_ike_policy_info', 'get_ike_policy_id',
+            'update_ike_policy', 'delete_ike_policy', 'create_ipsec_vpn_connection', 'list_ipsec_vpn_connections',
+            'iter_ipsec_vpn_connections', 'get_ipsec_vpn_connection_info', 'get_ipsec_vpn_connection_id',
+            'update_ipsec_vpn_connection', 'delete_ipsec_vpn_connection', 'create_ssl_vpn_service',
+            'create_ssl_vpn_connection', 'list_ssl_vpn_connections', 'iter_ssl_vpn_connections',
+            'get_ssl_vpn_connection_id', 'delete_ssl_vpn_connection'),
+    'key': ('create_key', 'create_key_container', 'list_keys', 'iter_keys', 'iter_key_containers',
+            'list_key_containers'),
+}
+
+_MODULES = dict((name, module) for module, names in _EXPORTS.items() for name in names)
+
+__all__ = [name for name in _MODULES if not name.startswith('_')]
+
+
+def __getattr__(name):
+    """Import a public name or submodule on first use."""
+    module = _MODULES.get(name)
+    if module is None:
+        try:
+            return importlib.import_module('.' + name, __name__)
+        except ModuleNotFoundError as e:
+            if e.name != __name__ + '.' + name:
+                raise
+            raise AttributeError('module ' + repr(__name__) + ' has no attribute ' + repr(name)) from None
+    value = getattr(importlib.import_module('.' + module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """List public names, loaded or not."""
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,810 @@
+"""
+aio module.
+
+ Asyncio variants of k5lib public functions. Functions take the same parameters and return
+ the same results as their blocking counterparts, but they are coroutines and all of them
+ share one aiohttp connection pool per event loop.
+
+ Coverage is partial. Networking and VPN functions calling a single endpoint are all here,
+ other services only in part. iter_* generators, helpers making several calls such as
+ find_first_free_ip, and models=True results have no counterpart. Endpoints without a ready
+ made function here can be called with call(), for example
+ call(compute.ENDPOINTS['list_servers_detail'], token, region, project_id=project_id), and
+ list endpoints can be paged with iterate().
+
+ Requires aiohttp library, ImportError is raised when the first request is sent without it.
+
+ Example::
+
+    import asyncio
+    from k5lib import aio
+
+    async def main():
+        results = await aio.gather([aio.list_ports(token, region) for region in regions], limit=50)
+        await aio.close()
+
+    asyncio.run(main())
+
+"""
+import asyncio
+import json
+import logging
+import weakref
+
+from . import api
+from . import authenticate
+from . import compute
+from . import image
+from . import instrument
+from . import network
+from . import orchestration
+from . import ratelimit
+from . import singleflight
+from . import vpn
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+log = logging.getLogger(__name__)
+
+# Total number of simultaneous connections per event loop.
+DEFAULT_LIMIT = 100
+# Simultaneous connections per regional service host. 0 means no per host limit.
+DEFAULT_LIMIT_PER_HOST = 0
+
+_settings = {'limit': DEFAULT_LIMIT,
+             'limit_per_host': DEFAULT_LIMIT_PER_HOST,
+             'timeout': None}
+
+_sessions = weakref.WeakKeyDictionary()
+
+
+class Reply(object):
+    """
+    Response of an asyncio call.
+
+    Returned by functions whose blocking counterpart returns a requests.Response object.
+    Body has been read already, so reply can be used after connection is released.
+
+    """
+
+    def __init__(self, status_code, reason, headers, url, content):
+        """Create a reply."""
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.url = url
+        self.content = content
+
+    @property
+    def text(self):
+        """Body as text."""
+        return self.content.decode('utf-8')
+
+    def json(self):
+        """Body decoded as JSON."""
+        return json.loads(self.content.decode('utf-8'))
+
+    def __repr__(self):
+        """Mimic requests.Response representation."""
+        return '<Response [' + str(self.status_code) + ']>'
+
+
+def configure(limit=None, limit_per_host=None, timeout=None):
+    """
+    Configure connection pool of asyncio calls.
+
+    Settings are applied to sessions created after the call. Use close() to drop existing session.
+
+    :param limit: (optional) Maximum number of simultaneous connections. Defaults 100.
+    :param limit_per_host: (optional) Maximum number of simultaneous connections per host. Defaults no limit.
+    :param timeout: (optional) Total timeout of one request in seconds. Defaults no timeout.
+    :return: none
+
+    """
+    options = {'limit': limit,
+               'limit_per_host': limit_per_host,
+               'timeout': timeout}
+    for key, value in options.items():
+        if value is not None:
+            _settings[key] = value
+    return
+
+
+def get_session():
+    """
+    Get aiohttp session of the running event loop.
+
+    :return: aiohttp.ClientSession object.
+
+    """
+    if aiohttp is None:
+        raise ImportError('k5lib.aio requires aiohttp library')
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(limit=_settings['limit'], limit_per_host=_settings['limit_per_host'])
+        session = aiohttp.ClientSession(connector=connector,
+                                        timeout=aiohttp.ClientTimeout(total=_settings['timeout']))
+        _sessions[loop] = session
+    return session
+
+
+async def close():
+    """
+    Close aiohttp session of the running event loop.
+
+    :return: none
+
+    """
+    session = _sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None:
+        await session.close()
+    return
+
+
+async def gather(aws, limit=None):
+    """
+    Run awaitables concurrently, at most limit of them at once.
+
+    :param aws: Iterable of awaitables, for example coroutines from this module.
+    :param limit: (optional) Maximum number of awaitables running at once. Defaults no limit.
+    :return: List of results in the same order as aws.
+
+    """
+    if limit is None:
+        return await asyncio.gather(*aws)
+
+    semaphore = asyncio.Semaphore(limit)
+
+    async def bounded(aw):
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(*[bounded(aw) for aw in aws])
+
+
+async def request(endpoint, token, region, args=None, params=None):
+    """
+    Send request of an endpoint. Asyncio counterpart of k5lib.api.request.
+
+    :param endpoint: k5lib.api.Endpoint object.
+    :param token: K5 token or None for identity requests.
+    :param region: K5 region name.
+    :param args: (optional) Dictionary of call arguments used in path and body.
+    :param params: (optional) URL query parameters. Defaults parameters built by endpoint.
+    :return: Reply object if succesfull. Otherwise error in the same format as requests library.
+
+    """
+    if args is None:
+        args = {}
+    if params is None and endpoint.query is not None:
+        params = endpoint.query(args)
+    config_data = endpoint.body(args) if endpoint.body is not None else None
+    address = api.url(endpoint, region, args)
+
+    def send():
+        return _send(endpoint, token, region, address, params, config_data)
+
+    # Identical GETs in flight share one reply, see k5lib.singleflight
+    return await singleflight.do_async(singleflight.key(token, endpoint.method, address, params), send)
+
+
+async def _send(endpoint, token, region, address, params, config_data):
+    # Taken before hooks hear of a request, missing aiohttp is not a failed request
+    session = get_session()
+    host = endpoint.region or region
+    attempt = 0
+    while True:
+        delay = ratelimit.reserve(host, endpoint.service)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        traced = instrument.start(endpoint, host, attempt)
+        try:
+            async with session.request(endpoint.method, address, params=params, json=config_data,
+                                       headers=api.headers(token)) as response:
+                content = await response.read()
+                reply = Reply(response.status, response.reason, response.headers, str(response.url), content)
+        except BaseException as e:
+            # Hooks always hear of the end of a request they heard start, cancellation included
+            instrument.finish(traced, error=e)
+            raise
+        if traced is not None:
+            instrument.finish(traced, reply.status_code, len(json.dumps(config_data)) if config_data is not None else 0,
+                              len(content))
+        ratelimit.record(host, endpoint.service, reply.status_code, reply.headers)
+        delay = ratelimit.retry_delay(endpoint.method, reply.status_code, reply.headers, attempt)
+        if delay is None:
+            break
+        api.log_retry(endpoint, reply.status_code, delay)
+        await asyncio.sleep(delay)
+        attempt += 1
+
+    if reply.status_code >= 400:
+        # Same format as requests.exceptions.HTTPError
+        if reply.status_code < 500:
+            kind = 'Client Error'
+        else:
+            kind = 'Server Error'
+        error = str(reply.status_code) + ' ' + kind + ': ' + str(reply.reason) + ' for url: ' + reply.url
+        api.log_error(endpoint, error, config_data)
+        return 'Error: ' + error
+    return reply
+
+
+async def call(endpoint, token, region, **args):
+    """
+    Call an endpoint. Asyncio counterpart of k5lib.api.call.
+
+    :param endpoint: k5lib.api.Endpoint object.
+    :param token: K5 token or None for identity requests.
+    :param region: K5 region name.
+    :param args: Call arguments used in path, body and extractor.
+    :return: Extracted result if succesfull. Otherwise error in the same format as requests library.
+
+    """
+    if endpoint.cache is not None:
+        cached = endpoint.cache.cached(endpoint, token, region, args)
+        if cached is not None:
+            return cached
+    response = await request(endpoint, token, region, args)
+    if endpoint.query is not None and str(response).startswith('Error: 400'):
+        # Service does not support the filter, get the whole list
+        response = await request(endpoint, token, region, args, params=[])
+    if 'Error' in str(response):
+        return str(response)
+    return api.finish(endpoint, token, region, args, response)
+
+
+async def iterate(endpoint, token, region, collection, page_size=api.DEFAULT_PAGE_SIZE, paging='marker',
+                  filters=None, **args):
+    """
+    Iterate items of a list endpoint page by page. Asyncio counterpart of k5lib.api.iterate.
+
+    :param endpoint: k5lib.api.Endpoint object.
+    :param token: K5 token.
+    :param region: K5 region name.
+    :param collection: Name of the list in response, for example 'ports'.
+    :param page_size: (optional) Items per request, None for one request. Defaults 100.
+    :param paging: (optional) 'marker' or 'offset'. Defaults 'marker'.
+    :param filters: (optional) Dictionary of extra URL query parameters.
+    :param args: Call arguments used in path.
+    :return: Asynchronous generator of item dictionaries. If a request fails, error is yielded as the last item.
+
+    """
+    pager = api.Pager(collection, page_size, paging, filters)
+    while not pager.done:
+        response = await request(endpoint, token, region, args, pager.params())
+        if 'Error' in str(response):
+            yield str(response)
+            return
+        for item in pager.follow(response.json()[collection]):
+            yield item
+
+
+#
+# Authentication
+#
+async def authenticate_project(user, password, contract, project_name, region):
+    """
+    Authenticate on project with one request to identity service.
+
+    :param user: Valid K5 user.
+    :param password: Valid K5 password
+    :param contract: K5 domain name.
+    :param project_name: K5 project name.
+    :param region: K5 region name.
+    :return: Authentication object if succesfull. Otherwise error from requests library.
+
+    """
+    return await call(authenticate.ENDPOINTS['authenticate_project'], None, region, user=user, password=password,
+                      contract=contract, project_name=project_name)
+
+
+async def get_project_token(user, password, contract, project_name, region):
+    """
+    Get token to authenticate on project.
+
+    :param user: Valid K5 user.
+    :param password: Valid K5 password
+    :param contract: K5 domain name.
+    :param project_name: K5 project name.
+    :param region: K5 region name.
+    :return: Token scoped to project if succesfull. Otherwise error from requests library.
+
+    """
+    auth = await authenticate_project(user, password, contract, project_name, region)
+    if 'Error' in str(auth):
+        return str(auth)
+    else:
+        return auth.token
+
+
+#
+# Network
+#
+async def list_networks(project_token, region):
+    """List networks visible for project in region. See k5lib.list_networks."""
+    return await call(network.ENDPOINTS['list_networks'], project_token, region)
+
+
+async def get_network_id(project_token, region, network_name):
+    """Get ID of network. See k5lib.get_network_id."""
+    return await call(network.ENDPOINTS['get_network_id'], project_token, region, network_name=network_name)
+
+
+async def create_network(project_token, region, az, network_name):
+    """Create a network into project. See k5lib.create_network."""
+    return await call(network.ENDPOINTS['create_network'], project_token, region, az=az, network_name=network_name)
+
+
+async def delete_network(project_token, region, network_id):
+    """Delete network. See k5lib.delete_network."""
+    return await call(network.ENDPOINTS['delete_network'], project_token, region, network_id=network_id)
+
+
+async def list_subnets(project_token, region):
+    """List subnets visible for project in region. See k5lib.list_subnets."""
+    return await call(network.ENDPOINTS['list_subnets'], project_token, region)
+
+
+async def get_subnet_id(project_token, region, subnet_name):
+    """Get ID of subnet. See k5lib.get_subnet_id."""
+    return await call(network.ENDPOINTS['get_subnet_id'], project_token, region, subnet_name=subnet_name)
+
+
+async def list_ports(project_token, region):
+    """List ports. See k5lib.list_ports."""
+    return await call(network.ENDPOINTS['list_ports'], project_token, region)
+
+
+async def get_port_id(project_token, region, port_name):
+    """Get ID of the port. See k5lib.get_port_id."""
+    return await call(network.ENDPOINTS['get_port_id'], project_token, region, port_name=port_name)
+
+
+async def create_port_on_network(project_token, region, az, network_id, port_name='Port', securitygroup_id=None,
+                                 subnet_id=None, ip_address=None):
+    """Create a port on network. See k5lib.create_port_on_network."""
+    return await call(network.ENDPOINTS['create_port_on_network'], project_token, region, az=az,
+                      network_id=network_id, port_name=port_name, securitygroup_id=securitygroup_id,
+                      subnet_id=subnet_id, ip_address=ip_address)
+
+
+async def delete_port(project_token, region, port_id):
+    """Delete port. See k5lib.delete_port."""
+    return await call(network.ENDPOINTS['delete_port'], project_token, region, port_id=port_id)
+
+
+async def list_security_groups(project_token, region):
+    """List security groups visible to project. See k5lib.list_security_groups."""
+    return await call(network.ENDPOINTS['list_security_groups'], project_token, region)
+
+
+async def list_routers(project_token, region):
+    """List routers in project. See k5lib.list_routers."""
+    return await call(network.ENDPOINTS['list_routers'], project_token, region)
+
+
+async def get_router_id(project_token, region, router_name):
+    """Get router ID. See k5lib.get_router_id."""
+    return await call(network.ENDPOINTS['get_router_id'], project_token, region, router_name=router_name)
+
+
+async def list_floating_ips(project_token, region):
+    """List floating IPs. See k5lib.list_floating_ips."""
+    return await call(network.ENDPOINTS['list_floating_ips'], project_token, region)
+
+
+async def list_network_connectors(project_token, region):
+    """List network connectors. See k5lib.list_network_connectors."""
+    return await call(network.ENDPOINTS['list_network_connectors'], project_token, region)
+
+
+async def list_network_connector_endpoints(project_token, region):
+    """List network connector endpoints. See k5lib.list_network_connector_endpoints."""
+    return await call(network.ENDPOINTS['list_network_connector_endpoints'], project_token, region)
+
+
+async def create_network_connector(project_token, project_id, region, connector_name):
+    """Create network connector. See k5lib.create_network_connector."""
+    return await call(network.ENDPOINTS['create_network_connector'], project_token, region, project_id=project_id,
+                      connector_name=connector_name)
+
+
+async def create_network_connector_endpoint(project_token, project_id, region, az, endpoint_name, networkconnector_id):
+    """Create network connector endpoint. See k5lib.create_network_connector_endpoint."""
+    return await call(network.ENDPOINTS['create_network_connector_endpoint'], project_token, region,
+                      project_id=project_id, az=az, endpoint_name=endpoint_name,
+                      networkconnector_id=networkconnector_id)
+
+
+async def get_network_connector_endpoint_id(project_token, region, endpoint_name):
+    """Get ID of network connector endpoint. See k5lib.get_network_connector_endpoint_id."""
+    return await call(network.ENDPOINTS['get_network_connector_endpoint_id'], project_token, region,
+                      endpoint_name=endpoint_name)
+
+
+async def get_network_connector_endpoint_info(project_token, region, network_connector_endpoint_id):
+    """Get network connector endpoint info. See k5lib.get_network_connector_endpoint_info."""
+    return await call(network.ENDPOINTS['get_network_connector_endpoint_info'], project_token, region,
+                      network_connector_endpoint_id=network_connector_endpoint_id)
+
+
+async def list_network_connector_endpoint_interfaces(project_token, region, network_connector_endpoint_id):
+    """List network connector endpoint interfaces. See k5lib.list_network_connector_endpoint_interfaces."""
+    return await call(network.ENDPOINTS['list_network_connector_endpoint_interfaces'], project_token, region,
+                      network_connector_endpoint_id=network_connector_endpoint_id)
+
+
+async def create_inter_project_connection(project_token, region, router_id, port_id):
+    """Create inter project connection. See k5lib.create_inter_project_connection."""
+    return await call(network.ENDPOINTS['create_inter_project_connection'], project_token, region, router_id=router_id,
+                      port_id=port_id)
+
+
+async def delete_inter_project_connection(project_token, region, router_id, port_id):
+    """Delete inter project connection. See k5lib.delete_inter_project_connection."""
+    return await call(network.ENDPOINTS['delete_inter_project_connection'], project_token, region, router_id=router_id,
+                      port_id=port_id)
+
+
+async def update_inter_project_connection(project_token, region, router_id, routes):
+    """Update inter project connection. See k5lib.update_inter_project_connection."""
+    return await call(network.ENDPOINTS['update_inter_project_connection'], project_token, region, router_id=router_id,
+                      routes=routes)
+
+
+async def attach_floating_ip_to_port(project_token, region, az, network_id, port_id):
+    """Attach floating IP onto port. See k5lib.attach_floating_ip_to_port."""
+    return await call(network.ENDPOINTS['attach_floating_ip_to_port'], project_token, region, az=az,
+                      network_id=network_id, port_id=port_id)
+
+
+async def get_network_connector_id(project_token, region, connector_name):
+    """Get ID of network connector. See k5lib.get_network_connector_id."""
+    return await call(network.ENDPOINTS['get_network_connector_id'], project_token, region,
+                      connector_name=connector_name)
+
+
+async def delete_network_connector(project_token, region, networkConnector_id):
+    """Delete network connector. See k5lib.delete_network_connector."""
+    return await call(network.ENDPOINTS['delete_network_connector'], project_token, region,
+                      connector_id=networkConnector_id)
+
+
+async def connect_network_connector_endpoint(project_token, region, endpoint_id, port_id):
+    """Connect network connector with endpoint. See k5lib.connect_network_connector_endpoint."""
+    return await call(network.ENDPOINTS['connect_network_connector_endpoint'], project_token, region,
+                      endpoint_id=endpoint_id, port_id=port_id)
+
+
+async def disconnect_network_connector_endpoint(project_token, region, endpoint_id, port_id):
+    """Disconnect network connector from endpoint. See k5lib.disconnect_network_connector_endpoint."""
+    return await call(network.ENDPOINTS['disconnect_network_connector_endpoint'], project_token, region,
+                      endpoint_id=endpoint_id, port_id=port_id)
+
+
+async def delete_network_connector_endpoint(project_token, region, connector_endpoint_id):
+    """Delete network connector endpoint. See k5lib.delete_network_connector_endpoint."""
+    return await call(network.ENDPOINTS['delete_network_connector_endpoint'], project_token, region,
+                      connector_endpoint_id=connector_endpoint_id)
+
+
+async def create_subnet(project_token, region, network_id, cidr, subnet_name='subnet', version='4', az=None,
+                        enable_dhcp=True, allocation_pools=None, dns_nameservers=None, host_routes=None,
+                        gateway_ip=None):
+    """Create subnet. See k5lib.create_subnet."""
+    return await call(network.ENDPOINTS['create_subnet'], project_token, region, network_id=network_id, cidr=cidr,
+                      subnet_name=subnet_name, version=version, az=az, enable_dhcp=enable_dhcp,
+                      allocation_pools=allocation_pools, dns_nameservers=dns_nameservers, host_routes=host_routes,
+                      gateway_ip=gateway_ip)
+
+
+async def delete_subnet(project_token, region, subnet_id):
+    """Delete subnet. See k5lib.delete_subnet."""
+    return await call(network.ENDPOINTS['delete_subnet'], project_token, region, subnet_id=subnet_id)
+
+
+async def get_subnet_info(project_token, region, subnet_id):
+    """Get subnet info. See k5lib.get_subnet_info."""
+    return await call(network.ENDPOINTS['get_subnet_info'], project_token, region, subnet_id=subnet_id)
+
+
+async def create_security_group(project_token, region, name, description):
+    """Create security group. See k5lib.create_security_group."""
+    return await call(network.ENDPOINTS['create_security_group'], project_token, region, name=name,
+                      description=description)
+
+
+async def delete_security_group(project_token, region, security_group_id):
+    """Delete security group. See k5lib.delete_security_group."""
+    return await call(network.ENDPOINTS['delete_security_group'], project_token, region,
+                      security_group_id=security_group_id)
+
+
+async def get_security_group_id(project_token, region, sg_name):
+    """Get ID of security group. See k5lib.get_security_group_id."""
+    return await call(network.ENDPOINTS['get_security_group_id'], project_token, region, sg_name=sg_name)
+
+
+async def create_security_group_rule(project_token, region, security_group_id, direction, ethertype='IPv4',
+                                     protocol=None, port_range_min=None, port_range_max=None, remote_ip_prefix=None,
+                                     remote_group_id=None):
+    """Create security group rule. See k5lib.create_security_group_rule."""
+    return await call(network.ENDPOINTS['create_security_group_rule'], project_token, region,
+                      security_group_id=security_group_id, direction=direction, ethertype=ethertype, protocol=protocol,
+                      port_range_min=port_range_min, port_range_max=port_range_max, remote_ip_prefix=remote_ip_prefix,
+                      remote_group_id=remote_group_id)
+
+
+async def create_router(project_token, region, name=None, az=None, admin_state_up=None):
+    """Create router. See k5lib.create_router."""
+    return await call(network.ENDPOINTS['create_router'], project_token, region, name=name, az=az,
+                      admin_state_up=admin_state_up)
+
+
+async def delete_router(project_token, region, router_id):
+    """Delete router. See k5lib.delete_router."""
+    return await call(network.ENDPOINTS['delete_router'], project_token, region, router_id=router_id)
+
+
+async def update_router(project_token, region, router_id, name=None, az=None, admin_state_up=None, network_id=None,
+                        route_table=None):
+    """Update router. See k5lib.update_router."""
+    return await call(network.ENDPOINTS['update_router'], project_token, region, router_id=router_id, name=name, az=az,
+                      admin_state_up=admin_state_up, network_id=network_id, route_table=route_table)
+
+
+async def add_router_interface(project_token, region, router_id, subnet_id=None, port_id=None):
+    """Add an interface into router. See k5lib.add_router_interface."""
+    return await call(network.ENDPOINTS['add_router_interface'], project_token, region, router_id=router_id,
+                      subnet_id=subnet_id, port_id=port_id)
+
+
+async def remove_router_interface(project_token, region, router_id, subnet_id=None, port_id=None):
+    """Remove an interface from router. See k5lib.remove_router_interface."""
+    return await call(network.ENDPOINTS['remove_router_interface'], project_token, region, router_id=router_id,
+                      subnet_id=subnet_id, port_id=port_id)
+
+
+async def delete_floating_ip(project_token, region, floating_ip_id):
+    """Delete floating IP. See k5lib.delete_floating_ip."""
+    return await call(network.ENDPOINTS['delete_floating_ip'], project_token, region, floating_ip_id=floating_ip_id)
+
+
+#
+# Compute
+#
+async def list_servers(project_token, region, project_id):
+    """Get list of servers in project. See k5lib.list_servers."""
+    return await call(compute.ENDPOINTS['list_servers'], project_token, region, project_id=project_id)
+
+
+async def get_server_info(project_token, region, project_id, server_id):
+    """Get detailed information about server. See k5lib.get_server_info."""
+    return await call(compute.ENDPOINTS['get_server_info'], project_token, region, project_id=project_id,
+                      server_id=server_id)
+
+
+async def create_server(project_token, region, az, project_id, server_name, key_name, sg_name, flavor_id, image_id,
+                        vol_size, network_id=None, ip=None, port_id=None, dedicated=False):
+    """Create server from image. See k5lib.create_server."""
+    return await call(compute.ENDPOINTS['create_server'], project_token, region, az=az, project_id=project_id,
+                      server_name=server_name, key_name=key_name, sg_name=sg_name, flavor_id=flavor_id,
+                      image_id=image_id, vol_size=vol_size, network_id=network_id, ip=ip, port_id=port_id,
+                      dedicated=dedicated)
+
+
+async def delete_server(project_token, region, project_id, server_id):
+    """Delete Server. See k5lib.delete_server."""
+    return await call(compute.ENDPOINTS['delete_server'], project_token, region, project_id=project_id,
+                      server_id=server_id)
+
+
+async def list_flavors(project_token, region, project_id):
+    """List available flavors. See k5lib.list_flavors."""
+    return await call(compute.ENDPOINTS['list_flavors'], project_token, region, project_id=project_id)
+
+
+#
+# Orchestration
+#
+async def list_stacks(project_token, region, project_id):
+    """List stacks in project. See k5lib.list_stacks."""
+    return await call(orchestration.ENDPOINTS['list_stacks'], project_token, region, project_id=project_id)
+
+
+async def get_stack_info(project_token, project_id, region, stack_name, stack_id):
+    """Get detailed stack info. See k5lib.get_stack_info."""
+    return await call(orchestration.ENDPOINTS['get_stack_info'], project_token, region, project_id=project_id,
+                      stack_name=stack_name, stack_id=stack_id)
+
+
+#
+# Image
+#
+async def list_images(project_token, region):
+    """List images. See k5lib.list_images."""
+    return await call(image.ENDPOINTS['list_images'], project_token, region)
+
+
+#
+# VPN
+#
+async def list_ipsec_vpn_services(project_token, region):
+    """List IPsec VPN services. See k5lib.list_ipsec_vpn_services."""
+    return await call(vpn.ENDPOINTS['list_ipsec_vpn_services'], project_token, region)
+
+
+async def get_ipsec_vpn_service_info(project_token, region, service_id):
+    """Get IPsec VPN service detailed info. See k5lib.get_ipsec_vpn_service_info."""
+    return await call(vpn.ENDPOINTS['get_ipsec_vpn_service_info'], project_token, region, service_id=service_id)
+
+
+async def list_ipsec_policies(project_token, region):
+    """List IPsec policies. See k5lib.list_ipsec_policies."""
+    return await call(vpn.ENDPOINTS['list_ipsec_policies'], project_token, region)
+
+
+async def get_ipsec_policy_info(project_token, region, policy_id):
+    """Get IPsec policy info. See k5lib.get_ipsec_policy_info."""
+    return await call(vpn.ENDPOINTS['get_ipsec_policy_info'], project_token, region, policy_id=policy_id)
+
+
+async def list_ike_policies(project_token, region):
+    """List IKE policies. See k5lib.list_ike_policies."""
+    return await call(vpn.ENDPOINTS['list_ike_policies'], project_token, region)
+
+
+async def get_ike_policy_info(project_token, region, policy_id):
+    """Get IKE policy info. See k5lib.get_ike_policy_info."""
+    return await call(vpn.ENDPOINTS['get_ike_policy_info'], project_token, region, policy_id=policy_id)
+
+
+async def list_ipsec_vpn_connections(project_token, region):
+    """List IPsec VPN connections. See k5lib.list_ipsec_vpn_connections."""
+    return await call(vpn.ENDPOINTS['list_ipsec_vpn_connections'], project_token, region)
+
+
+async def get_ipsec_vpn_connection_info(project_token, region, connection_id):
+    """Get IPsec VPN connection info. See k5lib.get_ipsec_vpn_connection_info."""
+    return await call(vpn.ENDPOINTS['get_ipsec_vpn_connection_info'], project_token, region,
+                      connection_id=connection_id)
+
+
+async def list_ssl_vpn_connections(project_token, region):
+    """List SSL VPN connections. See k5lib.list_ssl_vpn_connections."""
+    return await call(vpn.ENDPOINTS['list_ssl_vpn_connections'], project_token, region)
+
+
+async def create_ipsec_vpn_service(project_token, region, az, name, router_id, subnet_id):
+    """Create IPsec VPN service. See k5lib.create_ipsec_vpn_service."""
+    return await call(vpn.ENDPOINTS['create_ipsec_vpn_service'], project_token, region, az=az, name=name,
+                      router_id=router_id, subnet_id=subnet_id)
+
+
+async def get_ipsec_vpn_service_id(project_token, region, service_name):
+    """Get ID of IPsec VPN service. See k5lib.get_ipsec_vpn_service_id."""
+    return await call(vpn.ENDPOINTS['get_ipsec_vpn_service_id'], project_token, region, service_name=service_name)
+
+
+async def delete_ipsec_vpn_service(project_token, region, service_id):
+    """Delete IPsec VPN service. See k5lib.delete_ipsec_vpn_service."""
+    return await call(vpn.ENDPOINTS['delete_ipsec_vpn_service'], project_token, region, service_id=service_id)
+
+
+async def update_ipsec_vpn_service(project_token, region, az, service_id, name=None, router_id=None, subnet_id=None):
+    """Update IPsec VPN service. See k5lib.update_ipsec_vpn_service."""
+    return await call(vpn.ENDPOINTS['update_ipsec_vpn_service'], project_token, region, az=az, service_id=service_id,
+                      name=name, router_id=router_id, subnet_id=subnet_id)
+
+
+async def get_ipsec_policy_id(project_token, region, policy_name):
+    """Get ID of IPsec policy. See k5lib.get_ipsec_policy_id."""
+    return await call(vpn.ENDPOINTS['get_ipsec_policy_id'], project_token, region, policy_name=policy_name)
+
+
+async def delete_ipsec_policy(project_token, region, policy_id):
+    """Delete IPsec policy. See k5lib.delete_ipsec_policy."""
+    return await call(vpn.ENDPOINTS['delete_ipsec_policy'], project_token, region, policy_id=policy_id)
+
+
+async def create_ipsec_policy(project_token, region, az, policy_name, transform_protocol, auth_algorithm,
+                              encapsulation_mode, encryption_algorithm, pfs, lifetime):
+    """Create IPsec policy. See k5lib.create_ipsec_policy."""
+    return await call(vpn.ENDPOINTS['create_ipsec_policy'], project_token, region, az=az, policy_name=policy_name,
+                      transform_protocol=transform_protocol, auth_algorithm=auth_algorithm,
+                      encapsulation_mode=encapsulation_mode, encryption_algorithm=encryption_algorithm, pfs=pfs,
+                      lifetime=lifetime)
+
+
+async def update_ipsec_policy(project_token, region, az, policy_name, transform_protocol, auth_algorithm,
+                              encapsulation_mode, encryption_algorithm, pfs, lifetime):
+    """Update IPsec policy. See k5lib.update_ipsec_policy."""
+    return await call(vpn.ENDPOINTS['update_ipsec_policy'], project_token, region, az=az, policy_name=policy_name,
+                      transform_protocol=transform_protocol, auth_algorithm=auth_algorithm,
+                      encapsulation_mode=encapsulation_mode, encryption_algorithm=encryption_algorithm, pfs=pfs,
+                      lifetime=lifetime)
+
+
+async def get_ike_policy_id(project_token, region, policy_name):
+    """Get ID of IKE policy. See k5lib.get_ike_policy_id."""
+    return await call(vpn.ENDPOINTS['get_ike_policy_id'], project_token, region, policy_name=policy_name)
+
+
+async def delete_ike_policy(project_token, region, policy_id):
+    """Delete IKE policy. See k5lib.delete_ike_policy."""
+    return await call(vpn.ENDPOINTS['delete_ike_policy'], project_token, region, policy_id=policy_id)
+
+
+async def create_ike_policy(project_token, region, az, policy_name, phase1_negotiation_mode, auth_algorithm,
+                            encryption_algorithm, pfs, lifetime, ike_version):
+    """Create IKE policy. See k5lib.create_ike_policy."""
+    return await call(vpn.ENDPOINTS['create_ike_policy'], project_token, region, az=az, policy_name=policy_name,
+                      phase1_negotiation_mode=phase1_negotiation_mode, auth_algorithm=auth_algorithm,
+                      encryption_algorithm=encryption_algorithm, pfs=pfs, lifetime=lifetime, ike_version=ike_version)
+
+
+async def update_ike_policy(project_token, region, az, policy_name, phase1_negotiation_mode, auth_algorithm,
+                            encryption_algorithm, pfs, lifetime, ike_version):
+    """Update IKE policy. See k5lib.update_ike_policy."""
+    return await call(vpn.ENDPOINTS['update_ike_policy'], project_token, region, az=az, policy_name=policy_name,
+                      phase1_negotiation_mode=phase1_negotiation_mode, auth_algorithm=auth_algorithm,
+                      encryption_algorithm=encryption_algorithm, pfs=pfs, lifetime=lifetime, ike_version=ike_version)
+
+
+async def create_ipsec_vpn_connection(project_token, region, az, connection_name, ipsecpolicy_id, ikepolicy_id,
+                                      vpnservice_id, peer_cidrs, peer_address, psk):
+    """Create IPsec VPN connection. See k5lib.create_ipsec_vpn_connection."""
+    return await call(vpn.ENDPOINTS['create_ipsec_vpn_connection'], project_token, region, az=az,
+                      connection_name=connection_name, ipsecpolicy_id=ipsecpolicy_id, ikepolicy_id=ikepolicy_id,
+                      vpnservice_id=vpnservice_id, peer_cidrs=peer_cidrs, peer_address=peer_address, psk=psk)
+
+
+async def get_ipsec_vpn_connection_id(project_token, region, connection_name):
+    """Get ID of IPsec VPN connection. See k5lib.get_ipsec_vpn_connection_id."""
+    return await call(vpn.ENDPOINTS['get_ipsec_vpn_connection_id'], project_token, region,
+                      connection_name=connection_name)
+
+
+async def delete_ipsec_vpn_connection(project_token, region, connection_id):
+    """Delete IPsec VPN connection. See k5lib.delete_ipsec_vpn_connection."""
+    return await call(vpn.ENDPOINTS['delete_ipsec_vpn_connection'], project_token, region, connection_id=connection_id)
+
+
+async def update_ipsec_vpn_connection(project_token, region, az, connection_id, connection_name, ipsecpolicy_id,
+                                      ikepolicy_id, vpnservice_id, peer_cidrs, peer_address, psk):
+    """Update IPsec VPN connection. See k5lib.update_ipsec_vpn_connection."""
+    return await call(vpn.ENDPOINTS['update_ipsec_vpn_connection'], project_token, region, az=az,
+                      connection_id=connection_id, connection_name=connection_name, ipsecpolicy_id=ipsecpolicy_id,
+                      ikepolicy_id=ikepolicy_id, vpnservice_id=vpnservice_id, peer_cidrs=peer_cidrs,
+                      peer_address=peer_address, psk=psk)
+
+
+async def create_ssl_vpn_service(project_token, region, az, subnet_id, router_id, service_name='vpnservice',
+                                 description='ssl vpn service', admin_state=True):
+    """Create SSL VPN service. See k5lib.create_ssl_vpn_service."""
+    return await call(vpn.ENDPOINTS['create_ssl_vpn_service'], project_token, region, az=az, subnet_id=subnet_id,
+                      router_id=router_id, service_name=service_name, description=description, admin_state=admin_state)
+
+
+async def create_ssl_vpn_connection(project_token, region, az, vpn_service_id, container_id,
+                                    connection_name='ssl vpn connection', pool_cidr=['10.0.0.0/24'], admin_state=True):
+    """Create SSL VPN connection. See k5lib.create_ssl_vpn_connection."""
+    return await call(vpn.ENDPOINTS['create_ssl_vpn_connection'], project_token, region, az=az,
+                      vpn_service_id=vpn_service_id, container_id=container_id, connection_name=connection_name,
+                      pool_cidr=pool_cidr, admin_state=admin_state)
+
+
+async def get_ssl_vpn_connection_id(project_token, region, connection_name):
+    """Get ID of SSL VPN connection. See k5lib.get_ssl_vpn_connection_id."""
+    return await call(vpn.ENDPOINTS['get_ssl_vpn_connection_id'], project_token, region,
+                      connection_name=connection_name)
+
+
+async def delete_ssl_vpn_connection(project_token, region, connection_id):
+    """Delete SSL VPN connection. See k5lib.delete_ssl_vpn_connection."""
+    return await call(vpn.ENDPOINTS['delete_ssl_vpn_connection'], project_token, region, connection_id=connection_id)
@@ -0,0 +1,457 @@
+"""
+API module.
+
+ Generic request dispatcher of k5lib.
+
+ Every REST call k5lib makes is described by an Endpoint: service host, HTTP method, path
+ template, request body builder and response extractor. Service modules keep their endpoints
+ in an ENDPOINTS table and public functions run them with call(). Headers, URLs, connection
+ pooling and error handling are done here once for all of them.
+
+ Example::
+
+    from k5lib import api, network
+
+    ports = api.call(network.ENDPOINTS['list_ports'], project_token, region)
+
+"""
+import json
+import logging
+import os
+import time
+
+from . import instrument
+from . import namecache
+from . import ratelimit
+from . import singleflight
+from .session import get_session
+from .stream import iter_items
+
+log = logging.getLogger(__name__)
+
+# Every K5 service of every region has its own host.
+DEFAULT_URL_TEMPLATE = 'https://{service}.{region}.cloud.global.fujitsu.com'
+# Environment variable K5LIB_URL_TEMPLATE points calls elsewhere, for example to k5lib.standin.
+URL_TEMPLATE = os.environ.get('K5LIB_URL_TEMPLATE') or DEFAULT_URL_TEMPLATE
+# Items fetched per request by iterators.
+DEFAULT_PAGE_SIZE = 100
+
+
+def json_body(response, args):
+    """Extract response body as JSON. Default extractor."""
+    return response.json()
+
+
+def raw(response, args):
+    """Extract response object itself."""
+    return response
+
+
+def status_code(response, args):
+    """Extract HTTP status code."""
+    return response.status_code
+
+
+def text(response, args):
+    """Extract response as string, for example '<Response [204]>'."""
+    return str(response)
+
+
+def field(*keys):
+    """
+    Make an extractor returning a field of JSON response.
+
+    :param keys: Path to the field, for example field('port', 'id').
+    :return: Extractor function.
+
+    """
+    def extract(response, args):
+        value = response.json()
+        for key in keys:
+            value = value[key]
+        return value
+    return extract
+
+
+def find(collection, name_arg, key='name', value='id', partial=False, last=False, missing='Error: Not found'):
+    """
+    Make an extractor looking up an item from JSON list response.
+
+    :param collection: Name of the list in response, for example 'ports'.
+    :param name_arg: Name of the call argument holding value to look for.
+    :param key: (optional) Item attribute compared. Defaults 'name'.
+    :param value: (optional) Item attribute returned. Defaults 'id'.
+    :param partial: (optional) If True, item matches when looked up value is part of attribute. Defaults False.
+    :param last: (optional) If True, last matching item is returned instead of the first. Defaults False.
+    :param missing: (optional) Returned when no item matches. Defaults 'Error: Not found'.
+    :return: Extractor function returning attribute of the first, or last, matching item as string.
+
+    """
+    def extract(response, args):
+        wanted = args[name_arg]
+        items = response.json()[collection]
+        for item in reversed(items) if last else items:
+            if (partial and wanted in str(item[key])) or str(item[key]) == wanted:
+                return str(item[value])
+        return missing
+    extract.missing = missing
+    return extract
+
+
+def name_filter(name_arg, key='name', fields=('id', 'name'), convert=None):
+    """
+    Make a query builder filtering a list on server side.
+
+    Used with find() extractor, so results stay correct if the service ignores the filter.
+
+    :param name_arg: Name of the call argument holding value to look for.
+    :param key: (optional) Query parameter of the filter. Defaults 'name'.
+    :param fields: (optional) Attributes returned by the service. Defaults ('id', 'name').
+    :param convert: (optional) Function converting value before it is sent, for example re.escape.
+    :return: Query builder function returning list of URL query parameters.
+
+    """
+    def query(args):
+        value = args[name_arg]
+        if convert is not None:
+            value = convert(value)
+        return [(key, value)] + [('fields', attribute) for attribute in fields]
+    return query
+
+
+def without_none(data):
+    """
+    Remove keys with None value. This prevents 400 errors from api.
+
+    :param data: Dictionary.
+    :return: Copy of dictionary without None values.
+
+    """
+    return dict((key, value) for key, value in data.items() if value is not None)
+
+
+class Endpoint(object):
+    """
+    Description of one REST API call.
+
+    :param name: Name of the operation, usually name of the public function using it.
+    :param service: Service host prefix, for example 'networking' or 'compute'.
+    :param method: HTTP method.
+    :param path: Path template formatted with call arguments, for example '/v2.0/ports/{port_id}'.
+    :param body: (optional) Function building request JSON from dictionary of call arguments.
+    :param query: (optional) Function building URL query parameters from dictionary of call arguments.
+                  If the service rejects them with 400, request is sent again without them.
+    :param extract: (optional) Function building result from response and dictionary of call arguments.
+                    Defaults response JSON.
+    :param region: (optional) Fixed region of global services, for example 'gls'.
+    :param secret: (optional) If True, request body is never logged. Defaults False.
+    :param cache: (optional) Name cache rule, see k5lib.namecache.
+
+    """
+
+    __slots__ = ('name', 'service', 'method', 'path', 'body', 'query', 'extract', 'region', 'secret', 'cache')
+
+    def __init__(self, name, service, method, path, body=None, query=None, extract=json_body, region=None,
+                 secret=False, cache=None):
+        """Create an endpoint."""
+        self.name = name
+        self.service = service
+        self.method = method
+        self.path = path
+        self.body = body
+        self.query = query
+        self.extract = extract
+        self.region = region
+        self.secret = secret
+        self.cache = cache
+
+    def __repr__(self):
+        """Show method and path."""
+        return '<Endpoint ' + self.name + ' ' + self.method + ' ' + self.service + self.path + '>'
+
+
+def table(*endpoints):
+    """
+    Build endpoint table of a module.
+
+    :param endpoints: Endpoint objects.
+    :return: Dictionary of endpoints by name.
+
+    """
+    return dict((endpoint.name, endpoint) for endpoint in endpoints)
+
+
+def url(endpoint, region, args):
+    """
+    Build URL of an endpoint.
+
+    :param endpoint: Endpoint object.
+    :param region: K5 region name.
+    :param args: Dictionary of call arguments.
+    :return: URL string.
+
+    """
+    return URL_TEMPLATE.format(service=endpoint.service, region=endpoint.region or region) \
+        + endpoint.path.format(**args)
+
+
+def configure_url(url_template=None):
+    """
+    Set where K5 API calls are sent.
+
+    :param url_template: (optional) URL with {service} and {region} fields, for example
+                         'http://127.0.0.1:8080/{service}/{region}'. Defaults K5 hosts.
+    :return: none
+
+    """
+    global URL_TEMPLATE
+    URL_TEMPLATE = url_template or DEFAULT_URL_TEMPLATE
+    return
+
+
+def headers(token):
+    """
+    Build request headers.
+
+    :param token: K5 token or None.
+    :return: Dictionary of headers.
+
+    """
+    request_headers = {'Content-Type': 'application/json',
+                       'Accept': 'application/json'}
+    if token is not None:
+        request_headers['X-Auth-Token'] = token
+    return request_headers
+
+
+def log_error(endpoint, error, config_data):
+    """
+    Log failed request.
+
+    :param endpoint: Endpoint object.
+    :param error: Error string.
+    :param config_data: Request JSON or None.
+    :return: none
+
+    """
+    log.error(endpoint.name + ': ' + error)
+    if config_data is not None and not endpoint.secret:
+        log.error(json.dumps(config_data, indent=4))
+
+
+def log_retry(endpoint, status_code, delay):
+    """
+    Log retry of throttled request.
+
+    :param endpoint: Endpoint object.
+    :param status_code: HTTP status code of throttled response.
+    :param delay: Seconds to wait before retry.
+    :return: none
+
+    """
+    log.info(endpoint.name + ': throttled (' + str(status_code) + '), retry in ' + '%.2f' % delay + ' seconds')
+
+
+def request(endpoint, token, region, args=None, params=None, stream=False):
+    """
+    Send request of an endpoint.
+
+    Requests are rate limited per region and service, and throttled requests are retried,
+    see k5lib.ratelimit.
+
+    :param endpoint: Endpoint object.
+    :param token: K5 token or None for identity requests.
+    :param region: K5 region name.
+    :param args: (optional) Dictionary of call arguments used in path and body.
+    :param params: (optional) URL query parameters. Defaults parameters built by endpoint.
+    :param stream: (optional) If True, body is left unread for incremental reading. Defaults False.
+    :return: requests.Response object if succesfull. Otherwise error from requests library.
+
+    """
+    if args is None:
+        args = {}
+    if params is None and endpoint.query is not None:
+        params = endpoint.query(args)
+    config_data = endpoint.body(args) if endpoint.body is not None else None
+    address = url(endpoint, region, args)
+
+    def send():
+        return _send(endpoint, token, region, address, params, config_data, stream)
+
+    if stream:
+        return send()
+    # Identical GETs in flight share one response, see k5lib.singleflight
+    return singleflight.do(singleflight.key(token, endpoint.method, address, params), send)
+
+
+def _send(endpoint, token, region, address, params, config_data, stream):
+    # Imported on first request, so scripts answered from token cache never load it
+    import requests
+
+    host = endpoint.region or region
+    attempt = 0
+    while True:
+        ratelimit.wait(host, endpoint.service)
+        traced = instrument.start(endpoint, host, attempt)
+        try:
+            response = get_session().request(endpoint.method, address, params=params,
+                                             json=config_data, headers=headers(token), stream=stream)
+        except BaseException as e:
+            # Hooks always hear of the end of a request they heard start
+            instrument.finish(traced, error=e)
+            raise
+        if traced is not None:
+            instrument.finish(traced, response.status_code, len(response.request.body or b''),
+                              int(response.headers.get('Content-Length') or 0) if stream else len(response.content))
+        ratelimit.record(host, endpoint.service, response.status_code, response.headers)
+        delay = ratelimit.retry_delay(endpoint.method, response.status_code, response.headers, attempt)
+        if delay is None:
+            break
+        log_retry(endpoint, response.status_code, delay)
+        response.close()
+        time.sleep(delay)
+        attempt += 1
+
+    try:
+        response.raise_for_status()
+    except requests.exceptions.HTTPError as e:
+        # Whoops it wasn't a 200
+        log_error(endpoint, str(e), config_data)
+        response.close()
+        return 'Error: ' + str(e)
+    else:
+        return response
+
+
+class Pager(object):
+    """
+    Paging state of a list endpoint.
+
+    :param collection: Name of the list in response, for example 'ports'.
+    :param page_size: Items per request, or None to get everything with one request.
+    :param paging: 'marker' for OpenStack style limit and marker, 'offset' for limit and offset.
+    :param filters: Dictionary of extra URL query parameters, or None.
+
+    """
+
+    def __init__(self, collection, page_size, paging, filters):
+        """Create a pager at the first page."""
+        self.collection = collection
+        self.page_size = page_size
+        self.paging = paging
+        self.filters = filters or {}
+        self.marker = None
+        self.offset = 0
+        self.done = False
+
+    def params(self):
+        """URL query parameters of the next page."""
+        params = list(self.filters.items())
+        if self.page_size is None:
+            return params
+        params.append(('limit', self.page_size))
+        if self.paging == 'offset':
+            params.append(('offset', self.offset))
+        elif self.marker is not None:
+            params.append(('marker', self.marker))
+        return params
+
+    def follow(self, items):
+        """
+        Go through a page and move past it.
+
+        :param items: Iterable of items of the page.
+        :return: Generator of items of the page.
+
+        """
+        count = 0
+        last = None
+        for item in items:
+            count += 1
+            last = item
+            yield item
+
+        # Short page is the last one. Services ignoring limit or marker would repeat pages forever.
+        if self.page_size is None or count != self.page_size \
+                or (self.paging == 'marker' and last.get('id') in (None, self.marker)):
+            self.done = True
+        elif self.paging == 'offset':
+            self.offset += count
+        else:
+            self.marker = last['id']
+
+
+def iterate(endpoint, token, region, collection, page_size=DEFAULT_PAGE_SIZE, paging='marker', filters=None,
+            stream=False, **args):
+    """
+    Iterate items of a list endpoint page by page.
+
+    Only one page is kept in memory, and no more pages are fetched when iteration stops. With
+    stream, items are decoded while the page is read, so not even a whole page is kept.
+
+    :param endpoint: Endpoint object.
+    :param token: K5 token.
+    :param region: K5 region name.
+    :param collection: Name of the list in response, for example 'ports'.
+    :param page_size: (optional) Items per request, None for one request. Defaults 100.
+    :param paging: (optional) 'marker' or 'offset'. Defaults 'marker'.
+    :param filters: (optional) Dictionary of extra URL query parameters.
+    :param stream: (optional) If True, response is decoded incrementally, see k5lib.stream. Defaults False.
+    :param args: Call arguments used in path.
+    :return: Generator of item dictionaries. If a request fails, error is yielded as the last item.
+
+    """
+    pager = Pager(collection, page_size, paging, filters)
+    while not pager.done:
+        response = request(endpoint, token, region, args, pager.params(), stream=stream)
+        if 'Error' in str(response):
+            yield str(response)
+            return
+        if stream:
+            items = iter_items(response, collection)
+        else:
+            items = response.json()[collection]
+        for item in pager.follow(items):
+            yield item
+
+
+def call(endpoint, token, region, **args):
+    """
+    Call an endpoint.
+
+    :param endpoint: Endpoint object.
+    :param token: K5 token or None for identity requests.
+    :param region: K5 region name.
+    :param args: Call arguments used in path, body and extractor.
+    :return: Extracted result if succesfull. Otherwise error from requests library.
+
+    """
+    if endpoint.cache is not None:
+        cached = endpoint.cache.cached(endpoint, token, region, args)
+        if cached is not None:
+            return cached
+    response = request(endpoint, token, region, args)
+    if endpoint.query is not None and str(response).startswith('Error: 400'):
+        # Service does not support the filter, get the whole list
+        response = request(endpoint, token, region, args, params=[])
+    if 'Error' in str(response):
+        return str(response)
+    return finish(endpoint, token, region, args, response)
+
+
+def finish(endpoint, token, region, args, response):
+    """
+    Extract result of a succesfull call and update name cache.
+
+    :param endpoint: Endpoint object.
+    :param token: K5 token or None for identity requests.
+    :param region: K5 region name.
+    :param args: Dictionary of call arguments.
+    :param response: Response object.
+    :return: Extracted result.
+
+    """
+    result = endpoint.extract(response, args)
+    if endpoint.cache is not None:
+        endpoint.cache.update(endpoint, token, region, args, result)
+    return result
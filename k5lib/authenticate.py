@@ -4,18 +4,106 @@ Authentication module.
  Authentication module provide functions to authentication service of Fujitsu K5 cloud REST API
 
 """
-import requests
 import json
 import logging
+import os
+import hashlib
+import heapq
+import contextlib
+import threading
+import datetime
+import time
+from . import api
+from . import namecache
+
+try:
+    import fcntl
+except ImportError:
+    # No file locking on Windows, cache file is still replaced atomically.
+    fcntl = None
 
 log = logging.getLogger(__name__)
 
+# Cached authentications are renewed when they are this close to expiry.
+EXPIRY_MARGIN = datetime.timedelta(minutes=5)
 
-def _rest_global_authenticate(user, password, contract):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json'}
+_auth_cache = {}
+_auth_cache_lock = threading.Lock()
 
-    configData = {'auth': {
+
+class Authentication(object):
+    """
+    Result of one password authentication against K5 identity service.
+
+    :ivar token: Value of X-Subject-Token header.
+    :ivar expires_at: Token expiry time as timezone aware datetime (UTC).
+    :ivar project_id: ID of the project token is scoped to.
+    :ivar project_name: Name of the project token is scoped to.
+    :ivar domain_id: ID of the domain (contract).
+    :ivar user_id: ID of the authenticated user.
+    :ivar catalog: Service catalog list returned by identity service.
+    :ivar body: Full JSON response body.
+
+    """
+
+    def __init__(self, token, body):
+        """Create authentication from X-Subject-Token and response JSON."""
+        info = body['token']
+        project = info.get('project') or {}
+        self.token = token
+        self.expires_at = _parse_expiry(info.get('expires_at'))
+        self.project_id = project.get('id')
+        self.project_name = project.get('name')
+        self.domain_id = info['user']['domain']['id']
+        self.user_id = info['user'].get('id')
+        self.catalog = info.get('catalog', [])
+        self.body = body
+        namecache.register_token(token, self.project_id)
+
+    def expires_in(self):
+        """
+        Get time left before token expires.
+
+        :return: datetime.timedelta. Negative if token has already expired.
+
+        """
+        if self.expires_at is None:
+            return datetime.timedelta.max
+        return self.expires_at - datetime.datetime.now(datetime.timezone.utc)
+
+    def is_valid(self, margin=EXPIRY_MARGIN):
+        """
+        Check if token is usable for at least margin.
+
+        :param margin: (optional) datetime.timedelta. Defaults EXPIRY_MARGIN.
+        :return: True if token is valid longer than margin.
+
+        """
+        return self.expires_in() > margin
+
+    def get_endpoint(self, service_type, region=None, interface='public'):
+        """
+        Get endpoint URL of a service from service catalog.
+
+        :param service_type: Service type eg 'network' or 'compute'.
+        :param region: (optional) K5 region name. If omitted first matching endpoint is returned.
+        :param interface: (optional) Endpoint interface. Defaults 'public'.
+        :return: URL if found. Otherwise None.
+
+        """
+        for service in self.catalog:
+            if service.get('type') != service_type:
+                continue
+            for endpoint in service.get('endpoints', []):
+                if endpoint.get('interface') != interface:
+                    continue
+                if region is None or endpoint.get('region') == region:
+                    return endpoint.get('url')
+        return None
+
+
+def _auth_config(args):
+    config_data = {'auth': {
         'identity': {
             'methods': [
                 'password'
@@ -23,27 +111,280 @@ def _rest_global_authenticate(user, password, contract):
             'password': {
                 'user': {
                     'domain': {
-                        'name': contract
+                        'name': args['contract']
                     },
-                    'name': user,
-                    'password': password
+                    'name': args['user'],
+                    'password': args['password']
                 }
             }
         },
     },
     }
+    if 'project_name' in args:
+        config_data['auth']['scope'] = {
+            'project': {
+                'name': args['project_name'],
+                'domain': {
+                    'name': args['contract']
+                },
+            },
+        }
+    return config_data
 
-    url = 'https://identity.gls.cloud.global.fujitsu.com/v3/auth/tokens'
 
+def _authentication(response, args):
+    return Authentication(response.headers['X-Subject-Token'], response.json())
+
+
+# Request bodies hold passwords, so they are never logged.
+ENDPOINTS = api.table(
+    api.Endpoint('authenticate_global', 'identity', 'POST', '/v3/auth/tokens', body=_auth_config,
+                 extract=_authentication, region='gls', secret=True),
+    api.Endpoint('authenticate_region', 'identity', 'POST', '/v3/auth/tokens', body=_auth_config,
+                 extract=_authentication, secret=True),
+    api.Endpoint('authenticate_project', 'identity', 'POST', '/v3/auth/tokens', body=_auth_config,
+                 extract=_authentication, secret=True),
+)
+
+
+def _parse_expiry(expires_at):
+    if not expires_at:
+        return None
+    # K5 identity returns for example '2017-05-11T10:59:54.123456Z'
+    value = expires_at.replace('Z', '+00:00')
     try:
-        request = requests.post(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
+        return datetime.datetime.fromisoformat(value)
+    except ValueError:
+        return datetime.datetime.strptime(expires_at[:19], '%Y-%m-%dT%H:%M:%S').replace(tzinfo=datetime.timezone.utc)
+
+
+def _cache_key(scope, user, password, contract, *args):
+    digest = hashlib.sha256(password.encode('utf-8')).hexdigest()
+    return (scope, user, contract, digest) + args
+
+
+def _cached_authenticate(key, authenticate):
+    with _auth_cache_lock:
+        auth = _auth_cache.get(key)
+    if auth is not None and auth.is_valid():
+        return auth
+
+    file_cache = get_token_cache()
+    if file_cache is not None:
+        auth = file_cache.get(key)
+        if auth is not None:
+            with _auth_cache_lock:
+                _auth_cache[key] = auth
+            return auth
+
+    auth = authenticate()
+    if isinstance(auth, Authentication):
+        with _auth_cache_lock:
+            _auth_cache[key] = auth
+        if file_cache is not None:
+            file_cache.put(key, auth)
+    return auth
+
+
+def clear_authentication_cache():
+    """
+    Forget all cached authentications.
+
+    :return: none
+
+    """
+    with _auth_cache_lock:
+        _auth_cache.clear()
+    return
+
+
+class TokenFileCache(object):
+    """
+    Token cache stored on disk and shared by concurrent processes.
+
+    Cache file is readable by owner only and it is locked while read or written, so
+    short lived scripts can reuse a token which is still valid instead of authenticating
+    on every run. Entries are stored under a hash of user, contract, scope and password
+    salted with a random salt of the file, so a changed password never matches an old token.
+
+    :param path: (optional) Cache file path. Defaults $XDG_CACHE_HOME/k5lib/tokens.json
+                 or ~/.cache/k5lib/tokens.json.
+
+    """
+
+    def __init__(self, path=None):
+        """Create a token cache using file at path."""
+        if path is None:
+            cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+            path = os.path.join(cache_home, 'k5lib', 'tokens.json')
+        self.path = path
+        self._lock_path = path + '.lock'
+        self._keys = {}
+
+    def get(self, key):
+        """
+        Get a still valid authentication stored under key.
+
+        :param key: Cache key tuple.
+        :return: Authentication object or None.
+
+        """
+        with self._locked(fcntl.LOCK_SH if fcntl else None):
+            data = self._read()
+        if 'salt' not in data:
+            return None
+        entry = data['tokens'].get(self._digest(data['salt'], key))
+        if entry is None:
+            return None
+        auth = Authentication(entry['token'], entry['body'])
+        if auth.is_valid():
+            return auth
+        return None
+
+    def put(self, key, auth):
+        """
+        Store authentication under key. Expired entries are removed at the same time.
+
+        :param key: Cache key tuple.
+        :param auth: Authentication object.
+        :return: none
+
+        """
+        with self._locked(fcntl.LOCK_EX if fcntl else None):
+            data = self._read()
+            if 'salt' not in data:
+                data = {'salt': os.urandom(16).hex(), 'tokens': {}}
+            tokens = data['tokens']
+            now = datetime.datetime.now(datetime.timezone.utc)
+            for digest, entry in list(tokens.items()):
+                expires_at = _parse_expiry(entry['body']['token'].get('expires_at'))
+                if expires_at is not None and expires_at < now:
+                    del tokens[digest]
+            tokens[self._digest(data['salt'], key)] = {'token': auth.token, 'body': auth.body}
+            self._write(data)
+        return
+
+    def clear(self):
+        """
+        Remove all cached tokens.
+
+        :return: none
+
+        """
+        with self._locked(fcntl.LOCK_EX if fcntl else None):
+            self._write({})
+        return
+
+    def _digest(self, salt, key):
+        # PBKDF2 is slow on purpose, digest is computed once per salt of the file and key
+        digest = self._keys.get((salt, key))
+        if digest is None:
+            material = '\0'.join(str(i) for i in key).encode('utf-8')
+            digest = hashlib.pbkdf2_hmac('sha256', material, bytes.fromhex(salt), 10000).hex()
+            self._keys[(salt, key)] = digest
+        return digest
+
+    @contextlib.contextmanager
+    def _locked(self, mode):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        fd = os.open(self._lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if mode is not None:
+                fcntl.flock(fd, mode)
+            yield
+        finally:
+            os.close(fd)
+
+    def _read(self):
+        try:
+            with open(self.path, 'r') as cache_file:
+                data = json.load(cache_file)
+        except (OSError, ValueError):
+            return {}
+        # Files without a salt are from older versions, they are replaced on next write
+        if not isinstance(data, dict) or not isinstance(data.get('salt'), str) or 'tokens' not in data:
+            return {}
+        return data
+
+    def _write(self, data):
+        # Write a temporary file and rename it over the cache, readers never see a partial file.
+        tmp_path = self.path + '.' + str(os.getpid()) + '.tmp'
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as cache_file:
+            json.dump(data, cache_file)
+        os.replace(tmp_path, self.path)
+
+
+_token_cache = None
+_token_cache_checked = False
+
+
+def enable_token_cache(path=None):
+    """
+    Enable on-disk token cache.
+
+    When enabled get_project_token, get_region_token, get_global_token and other
+    authentication helpers reuse a still valid token from cache file instead of
+    authenticating. Cache can also be enabled with environment variable K5LIB_TOKEN_CACHE,
+    value is either cache file path or 1 for default path.
+
+    :param path: (optional) Cache file path. Defaults ~/.cache/k5lib/tokens.json
+    :return: TokenFileCache object.
+
+    """
+    global _token_cache, _token_cache_checked
+    _token_cache = TokenFileCache(path)
+    _token_cache_checked = True
+    return _token_cache
+
+
+def disable_token_cache():
+    """
+    Disable on-disk token cache. Cache file is left in place.
+
+    :return: none
+
+    """
+    global _token_cache, _token_cache_checked
+    _token_cache = None
+    _token_cache_checked = True
+    return
+
+
+def get_token_cache():
+    """
+    Get on-disk token cache if it is enabled.
+
+    :return: TokenFileCache object or None.
+
+    """
+    global _token_cache, _token_cache_checked
+    if not _token_cache_checked:
+        value = os.environ.get('K5LIB_TOKEN_CACHE')
+        if value and value.lower() not in ('0', 'false', 'no'):
+            _token_cache = TokenFileCache(None if value.lower() in ('1', 'true', 'yes') else value)
+        _token_cache_checked = True
+    return _token_cache
+
+
+def authenticate_global(user, password, contract):
+    """
+    Authenticate on global services.
+
+    Result is cached until token is about to expire, so global helpers share one authentication.
+
+    :param user: Valid K5 user.
+    :param password: Valid K5 password
+    :param contract: K5 domain name.
+    :return: Authentication object if succesfull otherwise error from requests library.
+
+    """
+    def authenticate():
+        return api.call(ENDPOINTS['authenticate_global'], None, None, user=user, password=password, contract=contract)
+
+    return _cached_authenticate(_cache_key('global', user, password, contract), authenticate)
 
 
 def get_global_token(user, password, contract):
@@ -57,11 +398,11 @@ def get_global_token(user, password, contract):
     :return: Global token if succesfull otherwise error from requests library.
 
     """
-    request = _rest_global_authenticate(user, password, contract)
-    if 'Error' in str(request):
-        return str(request)
+    auth = authenticate_global(user, password, contract)
+    if 'Error' in str(auth):
+        return str(auth)
     else:
-        return request.headers['X-Subject-Token']
+        return auth.token
 
 
 def get_domain_id(user, password, contract):
@@ -75,12 +416,11 @@ def get_domain_id(user, password, contract):
     :return: Domain ID if succesfull otherwise error from requests library.
 
     """
-    request = _rest_global_authenticate(user, password, contract)
-    if 'Error' in str(request):
-        return str(request)
+    auth = authenticate_global(user, password, contract)
+    if 'Error' in str(auth):
+        return str(auth)
     else:
-        r = request.json()
-        return r['token']['user']['domain']['id']
+        return auth.domain_id
 
 
 def get_defaultproject_id(user, password, contract):
@@ -93,47 +433,34 @@ def get_defaultproject_id(user, password, contract):
     :return: Domain default project ID if succesfull otherwise error from requests library.
 
     """
-    request = _rest_global_authenticate(user, password, contract)
-    if 'Error' in str(request):
-        return str(request)
+    auth = authenticate_global(user, password, contract)
+    if 'Error' in str(auth):
+        return str(auth)
     else:
-        r = request.json()
-        return r['token']['project']['id']
+        return auth.project_id
 
 
-def _rest_region_authenticate(user, password, contract, region):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json'}
+def authenticate_region(user, password, contract, region):
+    """
+    Authenticate on region level services.
 
-    configData = {'auth': {
-        'identity': {
-            'methods': [
-                'password'
-            ],
-            'password': {
-                'user': {
-                    'domain': {
-                        'name': contract
-                    },
-                    'name': user,
-                    'password': password
-                }
-            }
-        },
-    },
-    }
+    Result is cached until token is about to expire.
 
-    url = 'https://identity.' + region + '.cloud.global.fujitsu.com/v3/auth/tokens'
+    :param user: Valid K5 user.
+    :param password: Valid K5 password
+    :param contract: K5 domain name.
+    :param region: K5 region name.
+    :return: Authentication object if succesfull. Otherwise error from requests library.
+
+    """
+    def authenticate():
+        return _authenticate_region(user, password, contract, region)
+
+    return _cached_authenticate(_cache_key('region', user, password, contract, region), authenticate)
 
-    try:
-        request = requests.post(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
+
+def _authenticate_region(user, password, contract, region):
+    return api.call(ENDPOINTS['authenticate_region'], None, region, user=user, password=password, contract=contract)
 
 
 def get_region_token(user, password, contract, region):
@@ -148,57 +475,42 @@ def get_region_token(user, password, contract, region):
     :return: Token scoped to region if succesfully. Otherwise error from requests library.
 
     """
-    request = _rest_region_authenticate(user, password, contract, region)
-    if 'Error' in str(request):
-        return str(request)
+    auth = authenticate_region(user, password, contract, region)
+    if 'Error' in str(auth):
+        return str(auth)
     else:
-        return request.headers['X-Subject-Token']
-
-
-
-def _rest_project_authenticate(user, password, contract, project_name, region):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json'}
-
-    configData = {
-        'auth': {
-            'identity': {
-                'methods': [
-                    'password'
-                ],
-                'password': {
-                    'user': {
-                        'domain': {
-                            'name': contract
-                        },
-                        'name': user,
-                        'password': password
-                    }
-                }
-            },
-            'scope': {
-                'project': {
-                    'name': project_name,
-                    'domain': {
-                        'name': contract
-                    },
-                },
-            },
-        },
-    }
-#    print(json.dumps(configData, indent=4))
+        return auth.token
 
-    url = 'https://identity.' + region + '.cloud.global.fujitsu.com/v3/auth/tokens'
 
-    try:
-        request = requests.post(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
+def authenticate_project(user, password, contract, project_name, region):
+    """
+    Authenticate on project with one request to identity service.
+
+    Result is cached until token is about to expire, so get_project_token, get_project_id and get_project_info
+    share one authentication.
+
+    :param user: Valid K5 user.
+    :param password: Valid K5 password
+    :param contract: K5 domain name.
+    :param project_name: K5 project name.
+    :param region: K5 region name.
+    :return: Authentication object holding token, project ID, domain ID, expiry and service catalog if succesfull.
+             Otherwise error from requests library.
+
+    .. note::
+
+       If on-disk token cache is enabled a still valid token is taken from cache.
+
+    """
+    def authenticate():
+        return _authenticate_project(user, password, contract, project_name, region)
+
+    return _cached_authenticate(_cache_key('project', user, password, contract, project_name, region), authenticate)
+
+
+def _authenticate_project(user, password, contract, project_name, region):
+    return api.call(ENDPOINTS['authenticate_project'], None, region, user=user, password=password, contract=contract,
+                    project_name=project_name)
 
 
 def get_project_token(user, password, contract, project_name, region):
@@ -213,11 +525,11 @@ def get_project_token(user, password, contract, project_name, region):
     :return: Token scoped to project if succesfull. Otherwise error from requests library.
 
     """
-    request = _rest_project_authenticate(user, password, contract, project_name, region)
-    if 'Error' in str(request):
-        return str(request)
+    auth = authenticate_project(user, password, contract, project_name, region)
+    if 'Error' in str(auth):
+        return str(auth)
     else:
-        return request.headers['X-Subject-Token']
+        return auth.token
 
 
 def get_project_id(user, password, contract, project_name, region):
@@ -232,12 +544,11 @@ def get_project_id(user, password, contract, project_name, region):
     :return: ID if succesfull. Otherwise error from requests library.
 
     """
-    request = _rest_project_authenticate(user, password, contract, project_name, region)
-    if 'Error' in str(request):
-        return str(request)
+    auth = authenticate_project(user, password, contract, project_name, region)
+    if 'Error' in str(auth):
+        return str(auth)
     else:
-        r = request.json()
-        return r['token']['project']['id']
+        return auth.project_id
 
 
 def get_project_info(user, password, contract, project_name, region):
@@ -253,8 +564,231 @@ def get_project_info(user, password, contract, project_name, region):
     :return: JSON if succesfull. Otherwise error from requests library.
 
     """
-    request = _rest_project_authenticate(user, password, contract, project_name, region)
-    if 'Error' in str(request):
-        return str(request)
+    auth = authenticate_project(user, password, contract, project_name, region)
+    if 'Error' in str(auth):
+        return str(auth)
     else:
-        return request.json()
+        return auth.body
+
+
+class _TokenEntry(object):
+
+    def __init__(self, password):
+        self.password = password
+        self.auth = None
+        self.lock = threading.Lock()
+        self.last_used = time.monotonic()
+
+
+class TokenManager(object):
+    """
+    Expiry aware token cache with background refresh.
+
+    Tokens are kept per (user, contract, project name, region). A cached token is handed out
+    as long as it is valid, and a background thread authenticates again shortly before the
+    token expires, so callers never wait for identity service on the hot path. When several
+    threads need the same token at once only one of them authenticates, the rest wait for its
+    result.
+
+    Example::
+
+        manager = k5lib.TokenManager()
+        token = manager.get_project_token(user, password, contract, project_name, region)
+
+    :param refresh_margin: (optional) datetime.timedelta. Tokens are refreshed on background this long
+                           before they expire. Defaults 10 minutes.
+    :param min_validity: (optional) datetime.timedelta. Tokens closer to expiry than this are never
+                         handed out, caller authenticates instead. Defaults 1 minute.
+    :param idle_timeout: (optional) Seconds. Tokens that nobody asked for in this time are not refreshed
+                         anymore. Defaults 3600.
+    :param background: (optional) If False, no refresh thread is started and tokens are refreshed on
+                       demand only. Defaults True.
+
+    """
+
+    def __init__(self, refresh_margin=datetime.timedelta(minutes=10), min_validity=datetime.timedelta(minutes=1),
+                 idle_timeout=3600, background=True):
+        """Create a token manager."""
+        self.refresh_margin = refresh_margin
+        self.min_validity = min_validity
+        self.idle_timeout = idle_timeout
+        self.background = background
+        self.stats = {'hits': 0, 'misses': 0, 'refreshes': 0, 'refresh_errors': 0}
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._schedule = []
+        self._wakeup = threading.Condition(self._lock)
+        self._thread = None
+        self._closed = False
+
+    def get(self, user, password, contract, region, project_name=None):
+        """
+        Get authentication from cache or from identity service.
+
+        :param user: Valid K5 user.
+        :param password: Valid K5 password
+        :param contract: K5 domain name.
+        :param region: K5 region name.
+        :param project_name: (optional) K5 project name. If omitted token is scoped to region.
+        :return: Authentication object if succesfull. Otherwise error from requests library.
+
+        """
+        key = (user, contract, project_name, region)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.password != password:
+                entry = _TokenEntry(password)
+                self._entries[key] = entry
+        entry.last_used = time.monotonic()
+
+        auth = entry.auth
+        if auth is not None and auth.is_valid(self.min_validity):
+            self.stats['hits'] += 1
+            return auth
+
+        with entry.lock:
+            # Somebody else may have authenticated while we waited for the lock.
+            auth = entry.auth
+            if auth is not None and auth.is_valid(self.min_validity):
+                self.stats['hits'] += 1
+                return auth
+            self.stats['misses'] += 1
+            return self._authenticate(key, entry)
+
+    def get_project_token(self, user, password, contract, project_name, region):
+        """
+        Get token scoped to project.
+
+        :param user: Valid K5 user.
+        :param password: Valid K5 password
+        :param contract: K5 domain name.
+        :param project_name: K5 project name.
+        :param region: K5 region name.
+        :return: Token scoped to project if succesfull. Otherwise error from requests library.
+
+        """
+        auth = self.get(user, password, contract, region, project_name)
+        if 'Error' in str(auth):
+            return str(auth)
+        else:
+            return auth.token
+
+    def get_region_token(self, user, password, contract, region):
+        """
+        Get token scoped to region.
+
+        :param user: Valid K5 user.
+        :param password: Valid K5 password
+        :param contract: K5 domain name.
+        :param region: K5 region name.
+        :return: Token scoped to region if succesfull. Otherwise error from requests library.
+
+        """
+        auth = self.get(user, password, contract, region)
+        if 'Error' in str(auth):
+            return str(auth)
+        else:
+            return auth.token
+
+    def invalidate(self, user, contract, region, project_name=None):
+        """
+        Drop cached token, for example after API has rejected it.
+
+        :param user: K5 user.
+        :param contract: K5 domain name.
+        :param region: K5 region name.
+        :param project_name: (optional) K5 project name.
+        :return: none
+
+        """
+        with self._lock:
+            self._entries.pop((user, contract, project_name, region), None)
+        return
+
+    def close(self):
+        """
+        Stop background refresh and forget all tokens.
+
+        :return: none
+
+        """
+        with self._lock:
+            self._closed = True
+            self._entries.clear()
+            self._schedule = []
+            self._wakeup.notify_all()
+        return
+
+    def _authenticate(self, key, entry):
+        # Caller holds entry.lock
+        user, contract, project_name, region = key
+        if project_name is None:
+            auth = _authenticate_region(user, entry.password, contract, region)
+        else:
+            auth = _authenticate_project(user, entry.password, contract, project_name, region)
+
+        if isinstance(auth, Authentication):
+            entry.auth = auth
+            if self.background and auth.expires_at is not None:
+                self._schedule_refresh(key, auth.expires_in() - self.refresh_margin)
+        return auth
+
+    def _schedule_refresh(self, key, delay):
+        due = time.monotonic() + max(delay.total_seconds(), 0)
+        with self._lock:
+            if self._closed:
+                return
+            heapq.heappush(self._schedule, (due, key))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._refresh_loop, name='k5lib-token-refresh', daemon=True)
+                self._thread.start()
+            self._wakeup.notify()
+
+    def _refresh_loop(self):
+        while True:
+            with self._lock:
+                while not self._closed and (not self._schedule or self._schedule[0][0] > time.monotonic()):
+                    timeout = self._schedule[0][0] - time.monotonic() if self._schedule else None
+                    self._wakeup.wait(timeout)
+                if self._closed:
+                    self._thread = None
+                    return
+                due, key = heapq.heappop(self._schedule)
+                entry = self._entries.get(key)
+
+            if entry is None or time.monotonic() - entry.last_used > self.idle_timeout:
+                continue
+            self._refresh(key, entry)
+
+    def _refresh(self, key, entry):
+        with entry.lock:
+            if entry.auth is not None and entry.auth.expires_in() > self.refresh_margin:
+                # Already refreshed on demand.
+                return
+            auth = self._authenticate(key, entry)
+        if isinstance(auth, Authentication):
+            self.stats['refreshes'] += 1
+            log.info('Refreshed token for ' + str(key))
+        else:
+            self.stats['refresh_errors'] += 1
+            log.error('Token refresh failed for ' + str(key) + ': ' + str(auth))
+            # Try again later while current token is still valid.
+            if entry.auth is not None and entry.auth.is_valid(self.min_validity):
+                self._schedule_refresh(key, datetime.timedelta(seconds=30))
+
+
+_token_manager = None
+
+
+def get_token_manager():
+    """
+    Get the default token manager shared by the whole process.
+
+    :return: TokenManager object.
+
+    """
+    global _token_manager
+    with _auth_cache_lock:
+        if _token_manager is None:
+            _token_manager = TokenManager()
+        return _token_manager
@@ -4,35 +4,154 @@ Compute module.
  Compute module provide functions to compute service of Fujitsu K5 cloud REST API
 
 """
-import requests
-import json
 import logging
 import base64
+import re
+from . import api
+from . import namecache
+from .models import Server, load_list
 
 log = logging.getLogger(__name__)
 
 
-def _rest_get_vnc_console_url(project_token, project_id, region, server_id):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
+def _keypair_config(args):
+    return {"keypair": {
+        "name": args['keypair_name'],
+        "availability_zone": args['az']}
+    }
+
+
+def _server_interface_config(args):
+    if args['ip_address']:
+        return {"interfaceAttachment": {
+            "net_id": args['net_id']},
+            "fixed_ips": [{
+                "ip_address": args['ip_address']}]
+        }
+    return {"interfaceAttachment": {
+        "net_id": args['net_id']}
+    }
+
+
+def _server_password(response, args):
+    return base64.b64decode(response.json()['password'])
+
+
+# https://k5-doc.jp-east-1.paas.cloud.global.fujitsu.com/doc/en/iaas/document/k5-iaas-api-reference-foundation-service.pdf
+# 1.2.6.23 Create server with scheduler hints
+def _server_config(args):
+    network_id = args.get('network_id')
+    ip = args.get('ip')
+    port_id = args.get('port_id')
+    if port_id:
+        network_id = None
+        ip = None
+
+    config_data = {"server": {
+        "name": args['server_name'],
+        "availability_zone": args['az'],
+        "imageRef": args['image_id'],
+        "flavorRef": args['flavor_id'],
+        "key_name": args['key_name'],
+        "block_device_mapping_v2": [{
+            "boot_index": "0",
+            "uuid": args['image_id'],
+            "volume_size": args['vol_size'],
+            "device_name": "/dev/vda",
+            "source_type": "image",
+            "destination_type": "volume",
+            "delete_on_termination": "True"
+        }],
+        "networks": [{
+            "uuid": network_id,
+            "fixed_ip": ip,
+            "port": port_id
+        }],
+        "security_groups": [{
+            "name": args['sg_name']
+        }]
+        },
+        "os:scheduler_hints": {
+            "fcx.dedicated": args.get('dedicated', False)
+        }
+    }
+    return config_data
 
-    configData = {'os-getVNCConsole': {
-        'type': 'novnc'
+
+def _server_with_ip_config(args):
+    config_data = _server_config(args)
+    config_data['server']['networks'] = [{
+        "uuid": args['network_id'],
+        "fixed_ip": args['ip'],
+    }]
+    return config_data
+
+
+def _server_from_volume_config(args):
+    return {"server": {
+        "name": args['server_name'],
+        "availability_zone": args['az'],
+        "flavorRef": args['flavor_id'],
+        "key_name": args['key_name'],
+        "block_device_mapping_v2": [{
+            "boot_index": "0",
+            "uuid": args['volume_id'],
+            "volume_size": args['vol_size'],
+            "device_name": "/dev/vda",
+            "source_type": "volume",
+            "destination_type": "volume",
+            "delete_on_termination": "True"
+        }],
+        "networks": [{
+            "uuid": args['network_id'],
+        }],
+        "security_groups": [{
+            "name": args['sg_name']
+        }]
+        },
+        "os:scheduler_hints": {
+            "fcx.dedicated": args['dedicated']
         }
     }
 
-    url = 'https://compute.' + region + '.cloud.global.fujitsu.com/v2/' + project_id + '/servers/' + server_id + '/action'
 
-    try:
-        request = requests.post(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
+ENDPOINTS = api.table(
+    api.Endpoint('get_vnc_console_url', 'compute', 'POST', '/v2/{project_id}/servers/{server_id}/action',
+                 body=lambda args: {'os-getVNCConsole': {'type': 'novnc'}}),
+    api.Endpoint('create_keypair', 'compute', 'POST', '/v2/{project_id}/os-keypairs', body=_keypair_config),
+    api.Endpoint('list_keypairs', 'compute', 'GET', '/v2/{project_id}/os-keypairs'),
+    api.Endpoint('get_server_password', 'compute', 'GET', '/v2/{project_id}/servers/{server_id}/os-server-password',
+                 extract=_server_password),
+    api.Endpoint('list_servers', 'compute', 'GET', '/v2/{project_id}/servers'),
+    api.Endpoint('list_servers_detail', 'compute', 'GET', '/v2/{project_id}/servers/detail'),
+    # Compute service matches name filter as regular expression, same as the partial match here.
+    api.Endpoint('get_server_id', 'compute', 'GET', '/v2/{project_id}/servers',
+                 query=api.name_filter('server_name', fields=(), convert=re.escape),
+                 extract=api.find('servers', 'server_name', partial=True),
+                 cache=namecache.lookup('server', 'server_name')),
+    api.Endpoint('get_server_name', 'compute', 'GET', '/v2/{project_id}/servers',
+                 extract=api.find('servers', 'server_id', key='id', value='name', partial=True)),
+    api.Endpoint('get_server_info', 'compute', 'GET', '/v2/{project_id}/servers/{server_id}'),
+    api.Endpoint('add_server_interface', 'compute', 'POST', '/v2/{project_id}/servers/{server_id}/os-interface',
+                 body=_server_interface_config),
+    api.Endpoint('list_server_interfaces', 'compute', 'GET', '/v2/{project_id}/servers/{server_id}/os-interface'),
+    api.Endpoint('get_server_interface_info', 'compute', 'GET',
+                 '/v2/{project_id}/servers/{server_id}/os-interface/{port_id}'),
+    api.Endpoint('detach_server_interface', 'compute', 'DELETE',
+                 '/v2/{project_id}/servers/{server_id}/os-interface/{port_id}', extract=api.raw),
+    api.Endpoint('create_server', 'compute', 'POST', '/v2/{project_id}/servers', body=_server_config,
+                 cache=namecache.create('server', 'server_name', key='server')),
+    api.Endpoint('create_server_with_ip', 'compute', 'POST', '/v2/{project_id}/servers', body=_server_with_ip_config,
+                 cache=namecache.create('server', 'server_name', key='server')),
+    api.Endpoint('create_server_from_volume', 'compute', 'POST', '/v2/{project_id}/servers',
+                 body=_server_from_volume_config, cache=namecache.create('server', 'server_name', key='server')),
+    api.Endpoint('delete_server', 'compute', 'DELETE', '/v2/{project_id}/servers/{server_id}', extract=api.raw,
+                 cache=namecache.delete('server', 'server_id')),
+    api.Endpoint('list_flavors', 'compute', 'GET', '/v2/{project_id}/flavors'),
+    # Compute service has no name filter for flavors, whole list is scanned.
+    api.Endpoint('get_flavor_id', 'compute', 'GET', '/v2/{project_id}/flavors',
+                 extract=api.find('flavors', 'flavor_name'), cache=namecache.lookup('flavor', 'flavor_name')),
+)
 
 
 def get_vnc_console_url(project_token, project_id, region, server_id):
@@ -46,34 +165,7 @@ def get_vnc_console_url(project_token, project_id, region, server_id):
     :return: JSON if succesfull. Otherwise error from requests library.
 
     """
-    request = _rest_get_vnc_console_url(project_token, project_id, region, server_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
-
-
-def _rest_create_keypair(project_token, project_id, region, az, keypair_name='default'):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    configData = {"keypair": {
-                  "name": keypair_name,
-                  "availability_zone": az}
-                  }
-
-    url = 'https://compute.' + region + '.cloud.global.fujitsu.com/v2/' + project_id + '/os-keypairs'
-
-    try:
-        request = requests.post(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['get_vnc_console_url'], project_token, region, project_id=project_id, server_id=server_id)
 
 
 def create_keypair(project_token, project_id, region, az, keypair_name):
@@ -88,29 +180,8 @@ def create_keypair(project_token, project_id, region, az, keypair_name):
     :return: JSON if succesfull. Otherwise error from requests library.
 
     """
-    request = _rest_create_keypair(project_token, project_id, region, az, keypair_name)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        request = request.json()
-        return request
-
-def _rest_list_keypairs(project_token, region, project_id):
-    headers = {'Content-Type': 'application/json',
-              'Accept': 'application/json',
-              'X-Auth-Token': project_token}
-
-    url = 'https://compute.' + region + '.cloud.global.fujitsu.com/v2/' + project_id + '/os-keypairs'
-
-    try:
-        request = requests.get(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-         # Whoops it wasn't a 200
-         log.error(str(e))
-         return 'Error: ' + str(e)
-    else:
-         return request
+    return api.call(ENDPOINTS['create_keypair'], project_token, region, project_id=project_id, az=az,
+                    keypair_name=keypair_name)
 
 
 def list_keypairs(project_token, region, project_id):
@@ -124,37 +195,7 @@ def list_keypairs(project_token, region, project_id):
     :return: JSON that contains keypairs if successful. Otherwise error from requests library.
 
     """
-    request = _rest_list_keypairs(project_token, region, project_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
-
-
-def _rest_get_server_password(project_token, region, project_id, server_id):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-
-    url = 'https://compute.' + region + '.cloud.global.fujitsu.com/v2/' + project_id + '/servers/' + server_id + '/os-server-password'
-
-    try:
-        request = requests.get(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(headers)
-        log.error(url)
-        log.error(request.json())
-        log.error(str(e))
-        return 'Error: ' + str(e)
-    else:
-        log.info(request)
-        log.info(headers)
-        log.info(url)
-        log.info(request.json())
-        return request
+    return api.call(ENDPOINTS['list_keypairs'], project_token, region, project_id=project_id)
 
 
 def get_server_password(project_token, region, project_id, server_id):
@@ -168,45 +209,57 @@ def get_server_password(project_token, region, project_id, server_id):
 
     :return: Password hash as a binary object if succesfull. Otherwise error from requests library.
     """
-    request = _rest_get_server_password(project_token, region, project_id, server_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return base64.b64decode(request.json()['password'])
-
-
-def _rest_list_servers(project_token, region, project_id):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    url = 'https://compute.' + region + '.cloud.global.fujitsu.com/v2/' + project_id + '/servers'
+    return api.call(ENDPOINTS['get_server_password'], project_token, region, project_id=project_id, server_id=server_id)
 
-    try:
-        request = requests.get(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        return 'Error: ' + str(e)
-    else:
-        return request
 
-
-def list_servers(project_token, region, project_id):
+def list_servers(project_token, region, project_id, models=False):
     """
     Get list of servers in project.
 
     :param project_token: Valid K5 project token.
     :param region: K5 region name.
     :param project_id: K5 project ID
+    :param models: (optional) If True, list of k5lib.models.Server objects is returned. Default False.
     :return: JSON with list of servers if succesfull. Otherwise error from requests library.
     """
+    servers = api.call(ENDPOINTS['list_servers'], project_token, region, project_id=project_id)
+    if models:
+        return load_list(Server, servers)
+    return servers
+
+
+def iter_servers(project_token, region, project_id, page_size=api.DEFAULT_PAGE_SIZE, filters=None, stream=False):
+    """
+    Iterate servers page by page.
 
-    request = _rest_list_servers(project_token, region, project_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
+    :param project_token: A valid K5 project token.
+    :param region: K5 region name.
+    :param project_id: A valid project ID.
+    :param page_size: (optional) Items per request, None for one request. Defaults 100.
+    :param filters: (optional) Dictionary of extra URL query parameters supported by the service.
+    :param stream: (optional) If True, responses are decoded incrementally. Defaults False.
+    :return: Generator of server dictionaries. If a request fails, error is yielded as the last item.
+
+    """
+    return api.iterate(ENDPOINTS['list_servers'], project_token, region, 'servers',
+                       page_size=page_size, filters=filters, stream=stream, project_id=project_id)
+
+
+def iter_servers_detail(project_token, region, project_id, page_size=api.DEFAULT_PAGE_SIZE, filters=None, stream=False):
+    """
+    Iterate servers with details, for example status, page by page.
+
+    :param project_token: A valid K5 project token.
+    :param region: K5 region name.
+    :param project_id: A valid project ID.
+    :param page_size: (optional) Items per request, None for one request. Defaults 100.
+    :param filters: (optional) Dictionary of extra URL query parameters, for example {'changes-since': time}.
+    :param stream: (optional) If True, responses are decoded incrementally. Defaults False.
+    :return: Generator of server dictionaries. If a request fails, error is yielded as the last item.
+
+    """
+    return api.iterate(ENDPOINTS['list_servers_detail'], project_token, region, 'servers',
+                       page_size=page_size, filters=filters, stream=stream, project_id=project_id)
 
 
 def get_server_id(project_token, region, project_id, server_name):
@@ -219,23 +272,7 @@ def get_server_id(project_token, region, project_id, server_name):
     :param server_name: Name of the server
     :return: ID of the server if succesfull. Otherwise error from requests library.
     """
-
-    request = _rest_list_servers(project_token, region, project_id)
-
-    if 'Error' in str(request):
-        log.error(str(request))
-        return str(request)
-    else:
-        # loop trough servers and return first that match
-
-        outputList = []
-        outputDict = request['servers']
-
-        for i in outputDict:
-            if server_name in str(i['name']):
-                outputList.append(str(i['id']))
-
-        return outputList[0]
+    return api.call(ENDPOINTS['get_server_id'], project_token, region, project_id=project_id, server_name=server_name)
 
 
 def get_server_name(project_token, region, project_id, server_id):
@@ -248,41 +285,7 @@ def get_server_name(project_token, region, project_id, server_id):
     :param server_id: ID of the server
     :return: Name of the server if succesfull. Otherwise error from requests library.
     """
-
-    request = _rest_list_servers(project_token, region, project_id)
-
-    if 'Error' in str(request):
-        log.error(str(request))
-        return str(request)
-    else:
-        # loop trough servers and return first that match
-
-        outputList = []
-        outputDict = request['servers']
-
-        for i in outputDict:
-            if server_id in str(i['id']):
-                outputList.append(str(i['name']))
-
-        return outputList[0]
-
-
-def _rest_get_server_info(project_token, region, project_id, server_id):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-
-    url = 'https://compute.' + region + '.cloud.global.fujitsu.com/v2/' + project_id + '/servers/' + server_id
-
-    try:
-        request = requests.get(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['get_server_name'], project_token, region, project_id=project_id, server_id=server_id)
 
 
 def get_server_info(project_token, region, project_id, server_id):
@@ -296,46 +299,7 @@ def get_server_info(project_token, region, project_id, server_id):
 
     :return: JSON if succesfull. Otherwise error from requests library.
     """
-
-    request = _rest_get_server_info(project_token, region, project_id, server_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
-
-
-def _rest_add_server_interface(project_token, region, project_id, server_id, net_id, ip_address):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    configData = {"interfaceAttachment":{
-        "net_id": net_id
-        }
-    }
-
-    if ip_address:
-        configData = {"interfaceAttachment":{
-        "net_id": net_id,
-        },
-        "fixed_ips": [
-            {
-                "ip_address": ip_address,
-            }]
-        }
-
-    url = 'https://compute.' + region + '.cloud.global.fujitsu.com/v2/' + \
-           project_id + '/servers/' + server_id + '/os-interface'
-
-    try:
-        request = requests.post(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['get_server_info'], project_token, region, project_id=project_id, server_id=server_id)
 
 
 def add_server_interface(project_token, region, project_id, server_id, net_id, ip_address=None):
@@ -351,29 +315,8 @@ def add_server_interface(project_token, region, project_id, server_id, net_id, i
     :return: JSON if succesful. otherwise error from request library.
 
     """
-    request = _rest_add_server_interface(project_token, region, project_id, server_id, net_id, ip_address)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
-
-
-def _rest_list_server_interfaces(project_token, region, project_id, server_id):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    url = 'https://compute.' + region + '.cloud.global.fujitsu.com/v2/' + \
-           project_id + '/servers/' + server_id + '/os-interface'
-
-    try:
-        request = requests.get(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['add_server_interface'], project_token, region, project_id=project_id,
+                    server_id=server_id, net_id=net_id, ip_address=ip_address)
 
 
 def list_server_interfaces(project_token, region, project_id, server_id):
@@ -386,29 +329,8 @@ def list_server_interfaces(project_token, region, project_id, server_id):
 
     :return: JSON containing list of interfaces if succesful. otherwise error from request library.
     """
-    request = _rest_list_server_interfaces(project_token, region, project_id, server_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
-
-
-def _rest_get_server_interface_info(project_token, region, project_id, server_id, port_id):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    url = 'https://compute.' + region + '.cloud.global.fujitsu.com/v2/' + \
-           project_id + '/servers/' + server_id + '/os-interface/' +  port_id
-
-    try:
-        request = requests.get(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['list_server_interfaces'], project_token, region, project_id=project_id,
+                    server_id=server_id)
 
 
 def get_server_interface_info(project_token, region, project_id, server_id, port_id):
@@ -422,29 +344,8 @@ def get_server_interface_info(project_token, region, project_id, server_id, port
 
     :return:  JSON containing info of interface if succesful. otherwise error from request library.
     """
-    request = _rest_get_server_interface_info(project_token, region, project_id, server_id, port_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
-
-
-def _rest_detach_server_interface(project_token, region, project_id, server_id, port_id):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    url = 'https://compute.' + region + '.cloud.global.fujitsu.com/v2/' + \
-           project_id + '/servers/' + server_id + '/os-interface/' +  port_id
-
-    try:
-        request = requests.delete(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['get_server_interface_info'], project_token, region, project_id=project_id,
+                    server_id=server_id, port_id=port_id)
 
 
 def detach_server_interface(project_token, region, project_id, server_id, port_id):
@@ -459,38 +360,8 @@ def detach_server_interface(project_token, region, project_id, server_id, port_i
     :return:  http 202 response if succesful. Otherwise error from request library.
 
     """
-    request = _rest_detach_server_interface(project_token, region, project_id, server_id, port_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
-
-
-# https://k5-doc.jp-east-1.paas.cloud.global.fujitsu.com/doc/en/iaas/document/k5-iaas-api-reference-foundation-service.pdf
-# 1.2.6.23 Create server with scheduler hints
-def _rest_create_server(project_token, region, az, project_id, config_data):
-    #server_name, key_name, sg_name, flavor_id, image_id,
-    #¤                    vol_size, network_id):
-
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    url = 'https://compute.' + region + '.cloud.global.fujitsu.com/v2/' + project_id + '/servers'
-
-    try:
-        request = requests.post(url, json=config_data, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error('calling JSON:')
-        log.error(json.dumps(config_data, indent=4))
-        log.error('Return JSON:')
-        log.error(json.dumps(request.json(), indent=4))
-        return 'Error: ' + str(e)
-    else:
-        log.info(json.dumps(config_data, indent=4))
-        return request
+    return api.call(ENDPOINTS['detach_server_interface'], project_token, region, project_id=project_id,
+                    server_id=server_id, port_id=port_id)
 
 
 def create_server(project_token, region, az, project_id, server_name, key_name, sg_name, flavor_id, image_id,
@@ -530,49 +401,10 @@ def create_server(project_token, region, az, project_id, server_name, key_name,
 
        You need to provide both network_id and ip parameters if you want to use fixed IP on your server.
     """
-    if port_id:
-        network_id = None
-        ip= None
-
-    config_data = {"server": {
-        "name": server_name,
-        "availability_zone": az,
-        "imageRef": image_id,
-        "flavorRef": flavor_id,
-        "key_name": key_name,
-        "block_device_mapping_v2": [{
-            "boot_index": "0",
-            "uuid": image_id,
-            "volume_size": vol_size,
-            "device_name": "/dev/vda",
-            "source_type": "image",
-            "destination_type": "volume",
-            "delete_on_termination": "True"
-        }],
-        "networks": [{
-            "uuid": network_id,
-            "fixed_ip": ip,
-            "port": port_id
-        }],
-        "security_groups": [{
-            "name": sg_name
-        }]
-        },
-        "os:scheduler_hints": {
-            "fcx.dedicated": dedicated
-        }
-    }
-
-
-    request = _rest_create_server(project_token, region, az, project_id, config_data)
-
-    #server_name, key_name, sg_name, flavor_id, image_id,
-    #                    vol_size, network_id)
-
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
+    return api.call(ENDPOINTS['create_server'], project_token, region, az=az, project_id=project_id,
+                    server_name=server_name, key_name=key_name, sg_name=sg_name, flavor_id=flavor_id,
+                    image_id=image_id, vol_size=vol_size, network_id=network_id, ip=ip, port_id=port_id,
+                    dedicated=dedicated)
 
 
 def create_server_with_ip(project_token, region, az, project_id, server_name, key_name, sg_name, flavor_id, image_id,
@@ -597,43 +429,9 @@ def create_server_with_ip(project_token, region, az, project_id, server_name, ke
     :return: JSON if succesfull. Otherwise error from request library.
 
     """
-    config_data = {"server": {
-        "name": server_name,
-        "availability_zone": az,
-        "imageRef": image_id,
-        "flavorRef": flavor_id,
-        "key_name": key_name,
-        "block_device_mapping_v2": [{
-            "boot_index": "0",
-            "uuid": image_id,
-            "volume_size": vol_size,
-            "device_name": "/dev/vda",
-            "source_type": "image",
-            "destination_type": "volume",
-            "delete_on_termination": "True"
-        }],
-        "networks": [{
-            "uuid": network_id,
-            "fixed_ip":ip,
-        }],
-        "security_groups": [{
-            "name": sg_name
-        }]
-    },
-        "os:scheduler_hints": {
-            "fcx.dedicated": dedicated
-        }
-    }
-
-    request = _rest_create_server(project_token, region, az, project_id, config_data)
-
-    # server_name, key_name, sg_name, flavor_id, image_id,
-    #                    vol_size, network_id)
-
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
+    return api.call(ENDPOINTS['create_server_with_ip'], project_token, region, az=az, project_id=project_id,
+                    server_name=server_name, key_name=key_name, sg_name=sg_name, flavor_id=flavor_id,
+                    image_id=image_id, vol_size=vol_size, network_id=network_id, ip=ip, dedicated=dedicated)
 
 
 def create_server_from_volume(project_token, region, az, project_id, server_name, key_name, sg_name, flavor_id, volume_id,
@@ -656,58 +454,10 @@ def create_server_from_volume(project_token, region, az, project_id, server_name
 
     :return: JSON if succesfull. Otherwise error from request library.
     """
-    config_data = {"server": {
-        "name": server_name,
-        "availability_zone": az,
-        "flavorRef": flavor_id,
-        "key_name": key_name,
-        "block_device_mapping_v2": [{
-            "boot_index": "0",
-            "uuid": volume_id,
-            "volume_size": vol_size,
-            "device_name": "/dev/vda",
-            "source_type": "volume",
-            "destination_type": "volume",
-            "delete_on_termination": "True"
-        }],
-        "networks": [{
-            "uuid": network_id,
-        }],
-        "security_groups": [{
-            "name": sg_name
-        }]
-    },
-        "os:scheduler_hints": {
-            "fcx.dedicated": dedicated
-        }
-    }
-
-    request = _rest_create_server(project_token, region, az, project_id, config_data)
-
-    # server_name, key_name, sg_name, flavor_id, image_id,
-    #                    vol_size, network_id)
-
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
-
-
-def _delete_server(project_token, region, project_id, server_id):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
+    return api.call(ENDPOINTS['create_server_from_volume'], project_token, region, az=az, project_id=project_id,
+                    server_name=server_name, key_name=key_name, sg_name=sg_name, flavor_id=flavor_id,
+                    volume_id=volume_id, vol_size=vol_size, network_id=network_id, dedicated=dedicated)
 
-    url = 'https://compute.' + region + '.cloud.global.fujitsu.com/v2/' + project_id + '/servers/' + server_id
-
-    try:
-        request = requests.delete(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        return 'Error: ' + str(e)
-    else:
-        return request
 
 def delete_server(project_token, region, project_id, server_id):
     """Delete Server
@@ -719,29 +469,7 @@ def delete_server(project_token, region, project_id, server_id):
 
     :return: http 204 if succesfull otherwise http error code.
     """
-
-    request = _delete_server(project_token, region, project_id, server_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request
-
-
-def _rest_list_flavors(project_token, region, project_id):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    url = 'https://compute.' + region + '.cloud.global.fujitsu.com/v2/' + project_id + '/flavors'
-
-    try:
-        request = requests.get(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['delete_server'], project_token, region, project_id=project_id, server_id=server_id)
 
 
 def list_flavors(project_token, region, project_id):
@@ -753,11 +481,24 @@ def list_flavors(project_token, region, project_id):
 
     :return: JSON containing list of available flavors if succesful, otherwise error from requests library.
     """
-    request = _rest_list_flavors(project_token, region, project_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
+    return api.call(ENDPOINTS['list_flavors'], project_token, region, project_id=project_id)
+
+
+def iter_flavors(project_token, region, project_id, page_size=api.DEFAULT_PAGE_SIZE, filters=None, stream=False):
+    """
+    Iterate flavors page by page.
+
+    :param project_token: A valid K5 project token.
+    :param region: K5 region name.
+    :param project_id: A valid project ID.
+    :param page_size: (optional) Items per request, None for one request. Defaults 100.
+    :param filters: (optional) Dictionary of extra URL query parameters supported by the service.
+    :param stream: (optional) If True, responses are decoded incrementally. Defaults False.
+    :return: Generator of flavor dictionaries. If a request fails, error is yielded as the last item.
+
+    """
+    return api.iterate(ENDPOINTS['list_flavors'], project_token, region, 'flavors',
+                       page_size=page_size, filters=filters, stream=stream, project_id=project_id)
 
 
 def get_flavor_id(project_token, region, project_id, flavor_name):
@@ -770,25 +511,4 @@ def get_flavor_id(project_token, region, project_id, flavor_name):
 
     :return: ID of flavor if succesful, otherwise error from requests library.
     """
-    request = _rest_list_flavors(project_token, region, project_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        request = request.json()
-
-        # Get ID of our connector from info
-        outputList = []
-        outputDict = request['flavors']
-
-        counter = 0
-        for i in outputDict:
-            if str(i['name']) == flavor_name:
-                outputList.append(str(i['id']))
-                counter += 1
-        if counter > 0:
-            return outputList[0]
-        else:
-            return 'Error: Not found'
-
-
-
+    return api.call(ENDPOINTS['get_flavor_id'], project_token, region, project_id=project_id, flavor_name=flavor_name)
@@ -8,25 +8,48 @@ contract module.
 import requests
 import json
 import logging
+from . import api
+from .session import get_session
 
 log = logging.getLogger(__name__)
 
 
-def _rest_list_regions(global_token):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': global_token}
+def _regions(response, args):
+    regionsList = []
+    for i in response.json()['regions']:
+        if str(i['parent_region_id']) == 'None':
+            regionsList.append(str(i['id']))
+    return regionsList
 
-    url = 'https://identity.gls.cloud.global.fujitsu.com/v3/regions'
 
-    try:
-        request = requests.get(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        return 'Error: ' + str(e)
-    else:
-        return request
+def _activate_region_config(args):
+    return {'contract': {
+        'regions': [
+            {
+                'id': args['region_id']
+            }
+        ]}
+    }
+
+
+def _project_config(args):
+    return {"project": {
+        "description": "Programatically created project",
+        "domain_id": args['domain_id'],
+        "enabled": True,
+        "is_domain": False,
+        "name": args['project_name']}
+    }
+
+
+ENDPOINTS = api.table(
+    api.Endpoint('list_regions', 'identity', 'GET', '/v3/regions', extract=_regions, region='gls'),
+    api.Endpoint('get_region_info', 'identity', 'GET', '/v3/regions/{region_id}', region='gls'),
+    api.Endpoint('activate_region', 'contract', 'POST', '/v1/contracts/{domain_id}?action=startRegion',
+                 body=_activate_region_config, region='gls'),
+    api.Endpoint('create_project', 'identity', 'POST', '/v3/projects?domain_id={domain_id}', body=_project_config),
+    api.Endpoint('list_projects', 'identity', 'GET', '/v3/projects?domain_id={domain_id}'),
+)
 
 
 def list_regions(domain_token):
@@ -37,42 +60,7 @@ def list_regions(domain_token):
     :return: JSON if succesfull. Otherwise error from requests library.
 
     """
-    request = _rest_list_regions(domain_token)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        r = request.json()
-        regionsList = []
-        regionsDict = r['regions']
-
-        counter = 0
-        for i in regionsDict:
-            if str(i['parent_region_id']) == 'None':
-                regionsList.append(str(i['id']))
-                counter += 1
-
-        return regionsList
-
-
-def _rest_get_region_info(domain_token, region_id):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': domain_token}
-
-    url = 'https://identity.gls.cloud.global.fujitsu.com/v3/regions/' + region_id
-
-    try:
-        request = requests.get(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error('headers:')
-        log.error(headers)
-        log.error('url:')
-        log.error(url)
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['list_regions'], domain_token, None)
 
 
 def get_region_info(domain_token, region_id):
@@ -85,37 +73,7 @@ def get_region_info(domain_token, region_id):
     :return: JSON if succesfull. Otherwise error from requests library.
 
     """
-    request = _rest_get_region_info(domain_token, region_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
-
-
-def _rest_activate_region(domain_token, domain_id, region_id):
-    headers = {'Content-Type': 'application/json',
-               'X-Auth-Token': domain_token}
-
-    configData = {'contract': {
-                     'regions': [
-                          {
-                              'id': region_id
-                          }
-                     ]
-                 }
-    }
-
-    url = 'https://contract.gls.cloud.global.fujitsu.com/v1/contracts/' + domain_id + '?action=startRegion'
-
-    try:
-        request = requests.post(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['get_region_info'], domain_token, None, region_id=region_id)
 
 
 def activate_region(domain_token, domain_id, region_id):
@@ -129,37 +87,7 @@ def activate_region(domain_token, domain_id, region_id):
     :return: JSON if succesfull. Otherwise error from requests library.
 
     """
-    request = _rest_activate_region(domain_token, domain_id, region_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
-
-
-def _rest_create_project(region_token, domain_id, region, project_name):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': region_token}
-
-    configData = {"project": {
-                     "description": "Programatically created project",
-                     "domain_id": domain_id,
-                     "enabled": True,
-                     "is_domain": False,
-                     "name": project_name}
-                  }
-
-    url = 'https://identity.' + region + '.cloud.global.fujitsu.com/v3/projects?domain_id=' + domain_id
-
-    try:
-        request = requests.post(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['activate_region'], domain_token, None, domain_id=domain_id, region_id=region_id)
 
 
 def create_project(region_token, domain_id, region, project_name):
@@ -173,29 +101,7 @@ def create_project(region_token, domain_id, region, project_name):
     :return: JSON if succesfull. Otherwise error from requests library.
 
     """
-    request = _rest_create_project(region_token, domain_id, region, project_name)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        request = request.json()
-        return request
-
-
-def _rest_list_projects(region_token, domain_id, region):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-                'X-Auth-Token': region_token}
-
-    url = 'https://identity.' + region + '.cloud.global.fujitsu.com/v3/projects?domain_id=' + domain_id
-
-    try:
-        request = requests.get(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-         # Whoops it wasn't a 200
-         return 'Error: ' + str(e)
-    else:
-         return request
+    return api.call(ENDPOINTS['create_project'], region_token, region, domain_id=domain_id, project_name=project_name)
 
 
 def list_projects(region_token, domain_id, region):
@@ -209,12 +115,7 @@ def list_projects(region_token, domain_id, region):
      :return: JSON if succesfull. Otherwise error from requests library.
 
      """
-     request = _rest_list_projects(region_token, domain_id, region)
-     if 'Error' in str(request):
-          return str(request)
-     else:
-          request = request.json()
-          return request
+     return api.call(ENDPOINTS['list_projects'], region_token, region, domain_id=domain_id)
 
 
 # TODO: user details, object or simple list of variables?
@@ -236,7 +137,7 @@ def _rest_create_user(global_token):
     url = 'https://k5-apiportal.paas.cloud.global.fujitsu.com/API/v1/api/users'
 
     try:
-        request = requests.post(url, json=configData, headers=headers)
+        request = get_session().post(url, json=configData, headers=headers)
         request.raise_for_status()
     except requests.exceptions.HTTPError as e:
         # Whoops it wasn't a 200
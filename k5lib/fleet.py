@@ -0,0 +1,287 @@
+"""
+Fleet module.
+
+ Functions for many servers at a time.
+
+ watch_servers() follows state of any number of servers with one servers/detail listing per
+ poll, instead of one get_server_info() loop per server. After the first full listing only
+ servers changed since the previous poll are asked for with changes-since. Poll interval grows
+ while nothing changes and drops back when something does.
+
+ Every server has its own concurrent.futures.Future which is resolved as soon as the server
+ reaches the wanted status. Result of a future is the server dictionary, or an error string if
+ the server went to ERROR state, disappeared or did not make it in time. A server missing from
+ a full listing is asked for by ID before it is taken as gone.
+
+ create_servers() launches many servers concurrently over the shared session and can wait
+ until all of them are up.
+
+ Example::
+
+    from k5lib import fleet
+
+    watch = fleet.watch_servers(project_token, region, project_id, server_ids, timeout=900)
+    for future in watch.as_completed():
+        print(future.result())
+
+    results = fleet.wait_for_servers(project_token, region, project_id, server_ids)
+
+    specs = [dict(az='fi-1a', server_name='node-' + str(i), key_name='key', sg_name='default',
+                  flavor_id=flavor_id, image_id=image_id, vol_size=30, network_id=network_id) for i in range(300)]
+    servers = fleet.create_servers(project_token, region, project_id, specs, wait=True)
+
+"""
+import concurrent.futures
+import datetime
+import logging
+import threading
+import time
+
+from . import compute
+from . import session
+
+log = logging.getLogger(__name__)
+
+# Seconds between polls, interval grows by BACKOFF_FACTOR while nothing changes.
+DEFAULT_MIN_INTERVAL = 2.0
+DEFAULT_MAX_INTERVAL = 30.0
+BACKOFF_FACTOR = 1.5
+# Seconds changes-since is moved back to cover clock difference to the API.
+CLOCK_SKEW = 60
+# Launches sent at the same time, same as connections kept open per host.
+DEFAULT_MAX_IN_FLIGHT = session.DEFAULT_POOL_MAXSIZE
+
+
+def _timestamp(seconds):
+    return datetime.datetime.fromtimestamp(seconds, datetime.timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+class ServerWatch(object):
+    """
+    Background poller of server states.
+
+    Created by watch_servers(). Polling stops when all futures are resolved, on timeout or with stop().
+
+    :ivar futures: Dictionary of concurrent.futures.Future objects by server ID.
+
+    """
+
+    def __init__(self, project_token, region, project_id, server_ids, status='ACTIVE', timeout=600,
+                 min_interval=DEFAULT_MIN_INTERVAL, max_interval=DEFAULT_MAX_INTERVAL, changes_since=True):
+        """Create a watch and start polling in a daemon thread."""
+        self.project_token = project_token
+        self.region = region
+        self.project_id = project_id
+        self.status = status.upper()
+        self.timeout = timeout
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.changes_since = changes_since
+        self.futures = dict((server_id, concurrent.futures.Future()) for server_id in server_ids)
+        self.polls = 0
+        self._since = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='k5lib-fleet-watch', daemon=True)
+        self._thread.start()
+
+    def _pending(self):
+        return dict((server_id, future) for server_id, future in self.futures.items() if not future.done())
+
+    def _resolve(self, server_id, result):
+        future = self.futures[server_id]
+        if not future.done():
+            future.set_result(result)
+            if isinstance(result, str):
+                log.warning('Server ' + server_id + ': ' + result)
+        return
+
+    def _gone(self, server_id):
+        # Listings can lag behind, a server is gone only when it is not found by ID either
+        info = compute.get_server_info(self.project_token, self.region, self.project_id, server_id)
+        return isinstance(info, str) and info.startswith('Error: 404')
+
+    def _poll(self):
+        # One listing of changed servers, returns number of resolved futures
+        pending = self._pending()
+        started = time.time()
+        filters = None
+        if self._since is not None:
+            filters = {'changes-since': _timestamp(self._since - CLOCK_SKEW)}
+        # Paged, a single request would stop at the largest page the API returns
+        servers = list(compute.iter_servers_detail(self.project_token, self.region, self.project_id,
+                                                   filters=filters))
+        self.polls += 1
+        if servers and isinstance(servers[-1], str):
+            log.warning('Server poll failed: ' + servers[-1])
+            return 0
+        if self.changes_since:
+            self._since = started
+
+        resolved = 0
+        seen = set()
+        for server in servers:
+            server_id = server.get('id')
+            seen.add(server_id)
+            if server_id not in pending:
+                continue
+            status = str(server.get('status')).upper()
+            if status == self.status:
+                self._resolve(server_id, server)
+            elif status == 'ERROR':
+                self._resolve(server_id, 'Error: server is in ERROR state, ' + str(server.get('fault')))
+            elif status == 'DELETED':
+                self._resolve(server_id, 'Error: server was deleted')
+            else:
+                continue
+            resolved += 1
+
+        if filters is None:
+            # Full listing, servers not in it are gone
+            for server_id in pending:
+                if server_id in seen or not self._gone(server_id):
+                    continue
+                if self.status == 'DELETED':
+                    self._resolve(server_id, {'id': server_id, 'status': 'DELETED'})
+                else:
+                    self._resolve(server_id, 'Error: server not found')
+                resolved += 1
+        return resolved
+
+    def _run(self):
+        deadline = time.monotonic() + self.timeout
+        interval = self.min_interval
+        try:
+            while self._pending() and not self._stop.is_set():
+                if self._poll():
+                    interval = self.min_interval
+                else:
+                    interval = min(self.max_interval, interval * BACKOFF_FACTOR)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._pending():
+                    break
+                self._stop.wait(min(interval, remaining))
+        except Exception as e:
+            for server_id in self._pending():
+                self._resolve(server_id, 'Error: ' + str(e))
+        for server_id in self._pending():
+            self._resolve(server_id, 'Error: timeout waiting for status ' + self.status)
+        return
+
+    def as_completed(self):
+        """
+        Iterate futures in order they are resolved.
+
+        :return: Iterator of concurrent.futures.Future objects.
+
+        """
+        return concurrent.futures.as_completed(self.futures.values())
+
+    def results(self):
+        """
+        Wait until all servers are resolved.
+
+        :return: Dictionary of server dictionaries or error strings by server ID.
+
+        """
+        return dict((server_id, future.result()) for server_id, future in self.futures.items())
+
+    def stop(self):
+        """
+        Stop polling. Servers not resolved yet get a timeout error.
+
+        :return: none
+
+        """
+        self._stop.set()
+        self._thread.join()
+        return
+
+    def __repr__(self):
+        """Show progress."""
+        return '<ServerWatch ' + str(len(self.futures) - len(self._pending())) + '/' + str(len(self.futures)) + ' ' \
+            + self.status + '>'
+
+
+def watch_servers(project_token, region, project_id, server_ids, status='ACTIVE', timeout=600,
+                  min_interval=DEFAULT_MIN_INTERVAL, max_interval=DEFAULT_MAX_INTERVAL, changes_since=True):
+    """
+    Start following servers until they reach a status.
+
+    :param project_token: A valid K5 project token.
+    :param region: K5 region name.
+    :param project_id: A valid project ID.
+    :param server_ids: Iterable of server IDs.
+    :param status: (optional) Wanted status, 'DELETED' waits for servers to disappear. Defaults 'ACTIVE'.
+    :param timeout: (optional) Seconds to wait. Defaults 600.
+    :param min_interval: (optional) Seconds between polls when servers change. Defaults 2.
+    :param max_interval: (optional) Longest seconds between polls. Defaults 30.
+    :param changes_since: (optional) If False, every poll lists all servers. Defaults True.
+    :return: ServerWatch object.
+
+    """
+    return ServerWatch(project_token, region, project_id, server_ids, status=status, timeout=timeout,
+                       min_interval=min_interval, max_interval=max_interval, changes_since=changes_since)
+
+
+def wait_for_servers(project_token, region, project_id, server_ids, status='ACTIVE', timeout=600,
+                     min_interval=DEFAULT_MIN_INTERVAL, max_interval=DEFAULT_MAX_INTERVAL, changes_since=True):
+    """
+    Wait until servers reach a status.
+
+    :param project_token: A valid K5 project token.
+    :param region: K5 region name.
+    :param project_id: A valid project ID.
+    :param server_ids: Iterable of server IDs.
+    :param status: (optional) Wanted status, 'DELETED' waits for servers to disappear. Defaults 'ACTIVE'.
+    :param timeout: (optional) Seconds to wait. Defaults 600.
+    :param min_interval: (optional) Seconds between polls when servers change. Defaults 2.
+    :param max_interval: (optional) Longest seconds between polls. Defaults 30.
+    :param changes_since: (optional) If False, every poll lists all servers. Defaults True.
+    :return: Dictionary of server dictionaries by server ID. Servers in ERROR state, missing or
+             timed out have an error string instead.
+
+    """
+    return watch_servers(project_token, region, project_id, server_ids, status=status, timeout=timeout,
+                         min_interval=min_interval, max_interval=max_interval, changes_since=changes_since).results()
+
+
+def _create_server(project_token, region, project_id, spec):
+    try:
+        if 'volume_id' in spec:
+            return compute.create_server_from_volume(project_token, region, project_id=project_id, **spec)
+        return compute.create_server(project_token, region, project_id=project_id, **spec)
+    except Exception as e:
+        return 'Error: ' + str(e)
+
+
+def create_servers(project_token, region, project_id, specs, max_in_flight=DEFAULT_MAX_IN_FLIGHT, wait=False,
+                   status='ACTIVE', timeout=600):
+    """
+    Create many servers concurrently.
+
+    Every spec is launched even if others fail. Requests go through the shared session and the
+    rate limiter of compute service, so throttling by K5 slows the batch down instead of failing it.
+
+    :param project_token: A valid K5 project token.
+    :param region: K5 region name.
+    :param project_id: A valid project ID.
+    :param specs: Iterable of dictionaries of create_server() arguments, for example az, server_name,
+                  key_name, sg_name, flavor_id, image_id, vol_size and network_id. Specs with volume_id
+                  instead of image_id are created with create_server_from_volume().
+    :param max_in_flight: (optional) Launch requests sent at the same time. Defaults 16.
+    :param wait: (optional) If True, return when servers reach status, see wait_for_servers(). Defaults False.
+    :param status: (optional) Status to wait for. Defaults 'ACTIVE'.
+    :param timeout: (optional) Seconds to wait for status. Defaults 600.
+    :return: List of results in order of specs. A result is JSON of the create call, or server
+             dictionary with wait, or an error string.
+
+    """
+    specs = list(specs)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(max_in_flight, len(specs)))) as executor:
+        results = list(executor.map(lambda spec: _create_server(project_token, region, project_id, spec), specs))
+
+    if not wait:
+        return results
+    server_ids = [result['server']['id'] for result in results if not isinstance(result, str)]
+    servers = wait_for_servers(project_token, region, project_id, server_ids, status=status, timeout=timeout)
+    return [result if isinstance(result, str) else servers[result['server']['id']] for result in results]
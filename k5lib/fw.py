@@ -3,31 +3,56 @@
 FW module provide functions to firewall service of Fujitsu K5 cloud REST API
 
 """
-import requests
-import json
 import logging
-import base64
-import uuid
+from . import api
 
 
 log = logging.getLogger(__name__)
 
 
-def _rest_list_firewall_rules(project_token, region):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
+def _firewall_rule_config(args):
+    return {"firewall_rule": {
+        "action": args['rule_action'],
+        "description": args['rule_description'],
+        "destination_ip_address": args['destination_ip'],
+        "destination_port": args['destination_port'],
+        "enabled": args['enabled'],
+        "ip_version": 4,
+        "name": args['rule_name'],
+        "protocol": args['protocol'],
+        "source_ip_address": args['source_ip'],
+        "source_port": args['source_port'],
+        "availability_zone": args['az']}
+    }
+
+
+def _firewall_policy_config(args):
+    return {"firewall_policy": {
+        "firewall_rules": args['firewall_rules'],
+        "name": args['policy_name'],
+        "description": args['policy_description'],
+        "availability_zone": args['az']}
+    }
+
+
+def _firewall_config(args):
+    return {"firewall": {
+        "name": args['firewall_name'],
+        "description": args['firewall_description'],
+        "admin_state_up": args['admin_state'],
+        "firewall_policy_id": args['firewall_policy_id'],
+        "router_id": args['router_id'],
+        "availability_zone": args['az']}
+    }
 
-    url = 'https://network.' + region + '.cloud.global.fujitsu.com/v2.0/fw/firewall_rules'
 
-    try:
-        request = requests.get(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        return 'Error: ' + str(e)
-    else:
-        return request
+ENDPOINTS = api.table(
+    api.Endpoint('list_firewall_rules', 'network', 'GET', '/v2.0/fw/firewall_rules'),
+    api.Endpoint('create_firewall_rule', 'network', 'POST', '/v2.0/fw/firewall_rules', body=_firewall_rule_config),
+    api.Endpoint('create_firewall_policy', 'network', 'POST', '/v2.0/fw/firewall_policies',
+                 body=_firewall_policy_config),
+    api.Endpoint('create_firewall', 'network', 'POST', '/v2.0/fw/firewalls', body=_firewall_config),
+)
 
 
 def list_firewall_rules(project_token, region):
@@ -39,46 +64,23 @@ def list_firewall_rules(project_token, region):
 
     :return: JSON if succesfull, otherwise error from requests library.
     """
-    request = _rest_list_firewall_rules(project_token, region)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
-
-
-def _rest_create_firewall_rule(project_token, region, az, rule_name,  rule_description,  destination_ip,
-                               destination_port, protocol, source_ip, source_port,  rule_action, enabled):
-
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    configData = { "firewall_rule": {
-        "action": rule_action,
-        "description": rule_description,
-        "destination_ip_address": destination_ip,
-        "destination_port": destination_port,
-        "enabled": enabled,
-        "ip_version": 4,
-        "name": rule_name,
-        "protocol": protocol,
-        "source_ip_address": source_ip,
-        "source_port": source_port,
-        "availability_zone": az
-     }
-    }
+    return api.call(ENDPOINTS['list_firewall_rules'], project_token, region)
 
-    url = 'https://network.' + region + '.cloud.global.fujitsu.com/v2.0/fw/firewall_rules'
 
-    try:
-        request = requests.post(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
+def iter_firewall_rules(project_token, region, page_size=api.DEFAULT_PAGE_SIZE, filters=None, stream=False):
+    """
+    Iterate firewall rules page by page.
+
+    :param project_token: A valid K5 project token.
+    :param region: K5 region name.
+    :param page_size: (optional) Items per request, None for one request. Defaults 100.
+    :param filters: (optional) Dictionary of extra URL query parameters supported by the service.
+    :param stream: (optional) If True, responses are decoded incrementally. Defaults False.
+    :return: Generator of firewall rule dictionaries. If a request fails, error is yielded as the last item.
+
+    """
+    return api.iterate(ENDPOINTS['list_firewall_rules'], project_token, region, 'firewall_rules',
+                       page_size=page_size, filters=filters, stream=stream)
 
 
 def create_firewall_rule(project_token, region, az, rule_name,  rule_description,  destination_ip,
@@ -105,39 +107,10 @@ def create_firewall_rule(project_token, region, az, rule_name,  rule_description
                            Facilitates selectively turning off rules without having to disassociate the rule from the firewall policy.
     :return: JSON if succesful. Otherwise error from requests library.
     """
-    request = _rest_create_firewall_rule(project_token, region, az, rule_name,  rule_description,  destination_ip,
-                                         destination_port, protocol, source_ip, source_port,  rule_action, enabled)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
-
-
-def _rest_create_firewall_policy(project_token, region, az, policy_name, policy_description, firewall_rules):
-
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    configData = {"firewall_policy": {
-        "firewall_rules": firewall_rules,
-        "name": policy_name,
-        "description": policy_description,
-        "availability_zone": az
-     }
-    }
-
-    url = 'https://network.' + region + '.cloud.global.fujitsu.com/v2.0/fw/firewall_policies'
-
-    try:
-        request = requests.post(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['create_firewall_rule'], project_token, region, az=az, rule_name=rule_name,
+                    rule_description=rule_description, destination_ip=destination_ip,
+                    destination_port=destination_port, protocol=protocol, source_ip=source_ip,
+                    source_port=source_port, rule_action=rule_action, enabled=enabled)
 
 
 def create_firewall_policy(project_token, region, az, policy_name, policy_description, firewall_rules):
@@ -153,42 +126,8 @@ def create_firewall_policy(project_token, region, az, policy_name, policy_descri
 
     :return: JSON if succesfull. Otherwise error from requests library.
     """
-
-    request = _rest_create_firewall_policy(project_token, region, az, policy_name, policy_description, firewall_rules)
-
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
-
-
-def _rest_create_firewall(project_token, region, az, router_id, firewall_policy_id, firewall_name, firewall_description,
-                          admin_state):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    configData = {"firewall": {
-        "name": firewall_name,
-        "description": firewall_description,
-        "admin_state_up": admin_state,
-        "firewall_policy_id": firewall_policy_id,
-        "router_id": router_id,
-        "availability_zone": az
-    }
-}
-
-    url = 'https://network.' + region + '.cloud.global.fujitsu.com/v2.0/fw/firewalls'
-
-    try:
-        request = requests.post(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['create_firewall_policy'], project_token, region, az=az, policy_name=policy_name,
+                    policy_description=policy_description, firewall_rules=firewall_rules)
 
 
 def create_firewall(project_token, region, az, router_id, firewall_policy_id, firewall_name='FW_',
@@ -208,11 +147,6 @@ def create_firewall(project_token, region, az, router_id, firewall_policy_id, fi
 
     :return: JSON if succesfull. Otherwise error from requests library.
     """
-
-    request = _rest_create_firewall(project_token, region, az, router_id, firewall_policy_id, firewall_name,
-                                    firewall_description, admin_state)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
-
+    return api.call(ENDPOINTS['create_firewall'], project_token, region, az=az, router_id=router_id,
+                    firewall_policy_id=firewall_policy_id, firewall_name=firewall_name,
+                    firewall_description=firewall_description, admin_state=admin_state)
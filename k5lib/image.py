@@ -8,35 +8,49 @@ import json
 import logging
 import base64
 import uuid
+from . import api
+from .session import get_session
 
 
 log = logging.getLogger(__name__)
 
 
-def _rest_image_export(regionToken, region, projectId, image_id, containerName):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': regionToken}
-
+def _image_export_config(args):
     # storage_container format: "/v1/AUTH_<tenantID>/<containerNAME>"
-    storage_container = '/v1/AUTH_' + projectId + '/' + containerName
+    return {'image_id': args['image_id'],
+            'storage_container': '/v1/AUTH_' + args['project_id'] + '/' + args['container_name']
+            }
 
-    configData = {'image_id': image_id,
-                  'storage_container': storage_container
-                  }
 
-    # 'https://import-export.uk-1.cloud.global.fujitsu.com/v1/imageexport'
-    url = 'https://import-export.' + region + '.cloud.global.fujitsu.com/v1/imageexport'
+def _clone_vm_config(args):
+    # $BLOCKSTORAGE/v2/$PROJECT_ID/volumes/$VOLUME_ID/action
+    # {"os-volume_upload_image": {"container_format": "$CONTAINER_FORMAT", "disk_format": "$DISK_FORMAT",
+    #                             "image_name": "$NAME", "force": $FORCE}}
+    return {'os-volume_upload_image': {
+        'image_name': args['image_name'],
+        'container_format': 'bare',
+        'disk_format': 'raw',
+        'force': 'true'}
+    }
 
-    try:
-        request = requests.post(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
+
+ENDPOINTS = api.table(
+    api.Endpoint('export_image', 'import-export', 'POST', '/v1/imageexport', body=_image_export_config),
+    api.Endpoint('get_export_status', 'vmimport', 'GET', '/v1/imageexport/{export_id}/status'),
+    api.Endpoint('share_image', 'image', 'POST', '/v2/images/{image_id}/members',
+                 body=lambda args: {'member': args['project_id']}),
+    api.Endpoint('accept_image_share', 'image', 'PUT', '/v2/images/{image_id}/members/{project_id}',
+                 body=lambda args: {'status': 'accepted'}),
+    api.Endpoint('clone_vm', 'blockstorage', 'POST', '/v2/{project_id}/volumes/{volume_id}/action',
+                 body=_clone_vm_config),
+    api.Endpoint('get_volume_info', 'blockstorage', 'GET', '/v2/{project_id}/volumes/{volume_id}'),
+    api.Endpoint('list_images', 'image', 'GET', '/v2/images'),
+    # Image service filters by name but does not support fields.
+    api.Endpoint('get_image_id', 'image', 'GET', '/v2/images', query=api.name_filter('image_name', fields=()),
+                 extract=api.find('images', 'image_name', missing='Error: Image not found')),
+    api.Endpoint('get_image_info', 'image', 'GET', '/v2/images/{image_id}'),
+    api.Endpoint('get_image_import_queue_status', 'vmimport', 'GET', '/v1/imageimport'),
+)
 
 
 def export_image(regionToken, region, projectId, image_id, containerName):
@@ -52,33 +66,8 @@ def export_image(regionToken, region, projectId, image_id, containerName):
     :return:
 
     """
-    request = _rest_image_export(regionToken, region, projectId, image_id, containerName)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
-
-
-def _rest_get_export_status(projectToken, region, exportId):
-    headers = {'Content-Type': 'application/json',
-               'X-Auth-Token': projectToken
-               }
-
-    # https://vmimport.uk-1.cloud.global.fujitsu.com/v1/imageexport/1b70eaf3-5afb-40f4-9b44-076b376a0bcf/status
-    url = 'https://vmimport.' + region + '.cloud.global.fujitsu.com/v1/imageexport/' + exportId + '/status'
-
-    try:
-        request = requests.get(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error('headers:')
-        log.error(headers)
-        log.error('url')
-        log.error(url)
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['export_image'], regionToken, region, project_id=projectId, image_id=image_id,
+                    container_name=containerName)
 
 
 def get_export_status(projectToken, region, exportId):
@@ -90,31 +79,7 @@ def get_export_status(projectToken, region, exportId):
     :return: json
 
     """
-    request = _rest_get_export_status(projectToken, region, exportId)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
-
-def _rest_share_image(projectToken, region, project_id, image_id ):
-    headers = {'Content-Type': 'application/json',
-               'X-Auth-Token': projectToken
-               }
-
-    configData = {'member': project_id
-                  }
-
-    # 'https://import-export.uk-1.cloud.global.fujitsu.com/v1/imageexport'
-    url = 'https://image.' + region + '.cloud.global.fujitsu.com/v2/images/' + image_id + '/members'
-    try:
-        request = requests.post(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['get_export_status'], projectToken, region, export_id=exportId)
 
 
 def share_image(projectToken, region, project_id, image_id):
@@ -130,32 +95,7 @@ def share_image(projectToken, region, project_id, image_id):
 
     :return: JSON if succesfull. Otherwise error from rquests library.
     """
-
-    request = _rest_share_image(projectToken, region, project_id, image_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
-
-
-def _rest_accept_image_share(projectToken, region, project_id, image_id):
-    headers = {'Content-Type': 'application/json',
-               'X-Auth-Token': projectToken
-               }
-
-    configData = {'status': 'accepted'
-                  }
-
-    url = 'https://image.' + region + '.cloud.global.fujitsu.com/v2/images/' + image_id + '/members/' + project_id
-    try:
-        request = requests.put(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['share_image'], projectToken, region, project_id=project_id, image_id=image_id)
 
 
 def accept_image_share(projectToken, region, project_id, image_id):
@@ -171,63 +111,7 @@ def accept_image_share(projectToken, region, project_id, image_id):
     :return: JSON if succesfull. Otherwise error from requests library
 
     """
-
-    request = _rest_accept_image_share(projectToken, region, project_id, image_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
-
-
-def _rest_clone_vm(projectToken, projectId, region, imageName, volumeId):
-    """_rest_clone_vm.
-
-    $BLOCKSTORAGE / v2 /$PROJECT_ID / volumes /$VOLUME_ID / action - H “X - Auth - Token: $OS_AUTH_TOKEN” -H “Content - Type: application / json” -d ‘{“os - volume_upload_image”: {“container_format”:”‘$CONTAINER_FORMAT
-    '”,”disk_format”:”‘$DISK_FORMAT'”, ”image_name”:”‘$NAME
-    '”,”force”:’$FORCE’}}’
-
-    """
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': projectToken
-               }
-
-    """
-    ‘{
-         “os - volume_upload_image”: {
-              “container_format”:”‘$CONTAINER_FORMAT'”,
-              ”disk_format”:”‘$DISK_FORMAT'”,
-              ”image_name”:”‘$NAME'”,
-              ”force”:’$FORCE’
-          }
-    }’
-
-    """
-    configData = {'os-volume_upload_image': {
-        'image_name': imageName,
-        'container_format': 'bare',
-        'disk_format': 'raw',
-        'force': 'true'
-    }
-    }
-
-    # 'https://blockstorage.uk-1.cloud.global.fujitsu.com/v2/e6d6b965219a4b94b84a173dde0605b8'
-    url = 'https://blockstorage.' + region + '.cloud.global.fujitsu.com/v2/' + projectId + '/volumes/' + volumeId + '/action'
-
-    try:
-        request = requests.post(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error('headers:')
-        log.error(headers)
-        log.error('url')
-        log.error(url)
-        log.error('configData:')
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['accept_image_share'], projectToken, region, project_id=project_id, image_id=image_id)
 
 
 def clone_vm(projectToken, projectId, region, imageName, volumeId):
@@ -242,35 +126,8 @@ def clone_vm(projectToken, projectId, region, imageName, volumeId):
 
     :return: JSON if succesfull. Otherwise error from requests library.
     """
-
-    request = _rest_clone_vm(projectToken, projectId, region, imageName, volumeId)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
-
-
-# curl -X GET -s $BLOCKSTORAGE/v2/$PROJECT_ID/volumes/$VOLUME_ID
-def _rest_get_volume_info(projectToken, projectId, region, volumeId):
-    headers = {'Content-Type': 'application/json',
-               'X-Auth-Token': projectToken
-               }
-
-    # 'https://blockstorage.uk-1.cloud.global.fujitsu.com/v2/e6d6b965219a4b94b84a173dde0605b8'
-    url = 'https://blockstorage.' + region + '.cloud.global.fujitsu.com/v2/' + projectId + '/volumes/' + volumeId
-
-    try:
-        request = requests.get(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error('headers:')
-        log.error(headers)
-        log.error('url')
-        log.error(url)
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['clone_vm'], projectToken, region, project_id=projectId, image_name=imageName,
+                    volume_id=volumeId)
 
 
 def get_volume_info(projectToken, projectId, region, volumeId):
@@ -284,27 +141,7 @@ def get_volume_info(projectToken, projectId, region, volumeId):
     :return:
 
     """
-    request = _rest_get_volume_info(projectToken, projectId, region, volumeId)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
-
-
-def _rest_list_images(projectToken, region):
-    headers = {'Content-Type': 'application/json',
-               'X-Auth-Token': projectToken
-               }
-
-    url = 'https://image.' + region + '.cloud.global.fujitsu.com/v2/images'
-    try:
-        request = requests.get(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['get_volume_info'], projectToken, region, project_id=projectId, volume_id=volumeId)
 
 
 def list_images(projectToken, region):
@@ -316,11 +153,22 @@ def list_images(projectToken, region):
 
     :return: JSON if succesfully othervwise error from requests library.
     """
-    request = _rest_list_images(projectToken, region)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
+    return api.call(ENDPOINTS['list_images'], projectToken, region)
+
+
+def iter_images(projectToken, region, page_size=api.DEFAULT_PAGE_SIZE, filters=None, stream=False):
+    """
+    Iterate images page by page.
+
+    :param projectToken: A valid K5 project token.
+    :param region: K5 region name.
+    :param page_size: (optional) Items per request, None for one request. Defaults 100.
+    :param filters: (optional) Dictionary of extra URL query parameters supported by the service.
+    :param stream: (optional) If True, responses are decoded incrementally. Defaults False.
+    :return: Generator of image dictionaries. If a request fails, error is yielded as the last item.
+
+    """
+    return api.iterate(ENDPOINTS['list_images'], projectToken, region, 'images', page_size=page_size, filters=filters, stream=stream)
 
 
 def get_image_id(projectToken, region, image_name):
@@ -333,42 +181,8 @@ def get_image_id(projectToken, region, image_name):
 
     :return: ID of the image if succesfull. Otherwise error from requests library or image not found
     """
-    request = _rest_list_images(projectToken, region)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        request = request.json()
-        # Get ID of our connector endpoint from info
-        outputList = []
-        outputDict = request['images']
-
-        counter = 0
-        for i in outputDict:
-            if str(i['name']) == image_name:
-                outputList.append(str(i['id']))
-                counter += 1
-        if counter > 0:
-            return outputList[0]
-        else:
-            return 'Error: Image not found'
-
-
-
-def _rest_get_image_info(projectToken, region, image_id):
-    headers = {'Content-Type': 'application/json',
-               'X-Auth-Token': projectToken
-               }
+    return api.call(ENDPOINTS['get_image_id'], projectToken, region, image_name=image_name)
 
-    url = 'https://image.' + region + '.cloud.global.fujitsu.com/v2/images/' + image_id
-    try:
-        request = requests.get(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
 
 def get_image_info(projectToken, region, image_id):
     """
@@ -381,32 +195,7 @@ def get_image_info(projectToken, region, image_id):
     :return: JSON if succesfull otherwise error from requests library.
 
     """
-    request = _rest_get_image_info(projectToken, region, image_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
-
-
-def _rest_get_image_import_queue_status(projectToken, region):
-    headers = {'Content-Type': 'application/json',
-               'X-Auth-Token': projectToken
-               }
-
-    url = 'https://vmimport.' + region + '.cloud.global.fujitsu.com/v1/imageimport'
-
-    try:
-        request = requests.get(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error('headers:')
-        log.error(headers)
-        log.error('url')
-        log.error(url)
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['get_image_info'], projectToken, region, image_id=image_id)
 
 
 def get_image_import_queue_status(projectToken, region):
@@ -418,32 +207,7 @@ def get_image_import_queue_status(projectToken, region):
     :return: JSON if succesfull. Otherwise error from requests library.
 
     """
-    request = _rest_get_image_import_queue_status(projectToken, region)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
-
-
-def _rest_create_image_member(default_project_token, region, project_id):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': default_project_token}
-
-    configData = {'member':  project_id
-                 }
-
-    url = 'https://image.' + region + '.cloud.global.fujitsu.com/v2/images/'
-
-    try:
-        request = requests.post(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['get_image_import_queue_status'], projectToken, region)
 
 
 def _rest_register_image(default_project_token, region, container_name, object_name ):
@@ -470,10 +234,10 @@ def _rest_register_image(default_project_token, region, container_name, object_n
                   'domain': domain_name
                  }
 
-    url = 'https://vmimport.' + region + '.cloud.global.fujitsu.com/v1/imageimport'
+    url = api.URL_TEMPLATE.format(service='vmimport', region=region) + '/v1/imageimport'
 
     try:
-        request = requests.post(url, json=configData, headers=headers)
+        request = get_session().post(url, json=configData, headers=headers)
         request.raise_for_status()
     except requests.exceptions.HTTPError as e:
         # Whoops it wasn't a 200
@@ -0,0 +1,507 @@
+"""
+Instrument module.
+
+ Hooks around every HTTP request k5lib sends.
+
+ A hook is told when a request starts and when it is done, with service, region, HTTP method,
+ path template, endpoint name, status code, bytes sent and received and duration. Every retry of
+ a throttled request is a request of its own. Hooks are called in the thread sending the request,
+ or in the event loop with k5lib.aio, so they should be quick. Without hooks the cost of
+ instrumentation is one check per request.
+
+ Aggregator is a hook keeping latency histograms and error counters per service, region and
+ endpoint in memory. Its report() shows where time goes.
+
+ Example::
+
+    from k5lib import instrument
+
+    aggregator = instrument.Aggregator()
+    instrument.add_hook(aggregator)
+    ...
+    for row in aggregator.report(by=('service',)):
+        print(row['service'], row['calls'], row['errors'], row['total_seconds'], row['p99_seconds'])
+
+    instrument.add_hook(lambda call: print(call.operation, call.status, call.duration))
+
+"""
+import logging
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+# Significant decimal digits kept by histograms, relative error of percentiles is below 10 ** -2.
+DEFAULT_SIGNIFICANT_FIGURES = 2
+# Smallest latency told apart by histograms, in seconds.
+DEFAULT_RESOLUTION = 1e-6
+
+# Tuple of (hook, start, finish), replaced as a whole when hooks change
+_hooks = ()
+_lock = threading.Lock()
+
+
+class Call(object):
+    """
+    One HTTP request seen by hooks.
+
+    :ivar service: Service host prefix, for example 'networking'.
+    :ivar region: K5 region name.
+    :ivar method: HTTP method.
+    :ivar path: Path template of the endpoint, for example '/v2.0/ports/{port_id}'.
+    :ivar operation: Endpoint name, for example 'delete_port'.
+    :ivar attempt: Number of retries done before this request.
+    :ivar status: HTTP status code, or None if no response was received.
+    :ivar bytes_sent: Length of request body.
+    :ivar bytes_received: Length of response body, Content-Length for streamed responses.
+    :ivar duration: Seconds from sending to receiving the whole response, None until done.
+    :ivar error: Exception string if no response was received, otherwise None.
+
+    """
+
+    __slots__ = ('service', 'region', 'method', 'path', 'operation', 'attempt', 'status', 'bytes_sent',
+                 'bytes_received', 'duration', 'error', 'started')
+
+    def __init__(self, service, region, method, path, operation, attempt=0):
+        """Create a call at its start."""
+        self.service = service
+        self.region = region
+        self.method = method
+        self.path = path
+        self.operation = operation
+        self.attempt = attempt
+        self.status = None
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.duration = None
+        self.error = None
+        self.started = time.perf_counter()
+
+    @property
+    def failed(self):
+        """True if no response was received or status is 400 or above."""
+        return self.status is None or self.status >= 400
+
+    def __repr__(self):
+        """Show operation, status and duration."""
+        return '<Call ' + self.method + ' ' + self.service + '.' + str(self.region) + ' ' + self.operation + ' ' \
+            + str(self.status) + (' %.3fs' % self.duration if self.duration is not None else '') + '>'
+
+
+class Hook(object):
+    """
+    Base class of hooks. Override start() or finish() or both.
+
+    Plain functions given to add_hook() are called like finish().
+
+    """
+
+    def start(self, call):
+        """
+        Request is about to be sent.
+
+        :param call: Call object, status and duration are not set yet.
+        :return: none
+
+        """
+        return
+
+    def finish(self, call):
+        """
+        Response was received or sending failed.
+
+        :param call: Call object.
+        :return: none
+
+        """
+        return
+
+
+def add_hook(hook):
+    """
+    Start calling a hook around every request.
+
+    :param hook: Hook object, or function taking a Call when a request is done.
+    :return: The hook given, for remove_hook().
+
+    """
+    global _hooks
+    if isinstance(hook, Hook):
+        entry = (hook, hook.start, hook.finish)
+    else:
+        entry = (hook, None, hook)
+    with _lock:
+        _hooks = _hooks + (entry,)
+    return hook
+
+
+def remove_hook(hook):
+    """
+    Stop calling a hook.
+
+    :param hook: Hook object or function given to add_hook().
+    :return: none
+
+    """
+    global _hooks
+    with _lock:
+        _hooks = tuple(entry for entry in _hooks if entry[0] is not hook)
+    return
+
+
+def clear_hooks():
+    """
+    Remove all hooks.
+
+    :return: none
+
+    """
+    global _hooks
+    with _lock:
+        _hooks = ()
+    return
+
+
+def get_hooks():
+    """
+    Get hooks in order they are called.
+
+    :return: List of hooks.
+
+    """
+    return [entry[0] for entry in _hooks]
+
+
+def _notify(hooks, index, call):
+    for entry in hooks:
+        function = entry[index]
+        if function is None:
+            continue
+        try:
+            function(call)
+        except Exception:
+            log.exception('Instrumentation hook ' + repr(entry[0]) + ' failed')
+
+
+def start(endpoint, region, attempt=0):
+    """
+    Tell hooks a request of an endpoint starts.
+
+    :param endpoint: k5lib.api.Endpoint object.
+    :param region: K5 region name the request goes to.
+    :param attempt: (optional) Number of retries done before this request. Defaults 0.
+    :return: Call object for finish(), or None if there are no hooks.
+
+    """
+    hooks = _hooks
+    if not hooks:
+        return None
+    call = Call(endpoint.service, region, endpoint.method, endpoint.path, endpoint.name, attempt)
+    _notify(hooks, 1, call)
+    return call
+
+
+def finish(call, status=None, bytes_sent=0, bytes_received=0, error=None):
+    """
+    Tell hooks a request is done.
+
+    :param call: Call object from start(), None does nothing.
+    :param status: (optional) HTTP status code, None if no response was received.
+    :param bytes_sent: (optional) Length of request body. Defaults 0.
+    :param bytes_received: (optional) Length of response body. Defaults 0.
+    :param error: (optional) Exception raised instead of a response.
+    :return: none
+
+    """
+    if call is None:
+        return
+    call.duration = time.perf_counter() - call.started
+    call.status = status
+    call.bytes_sent = bytes_sent
+    call.bytes_received = bytes_received
+    if error is not None:
+        call.error = str(error)
+    _notify(_hooks, 2, call)
+    return
+
+
+class Histogram(object):
+    """
+    Latency histogram with HDR style log-linear buckets.
+
+    Values are counted in integer units of resolution. Values below 2 * 10 ** significant_figures
+    units have buckets of their own, above that every power of two is split into the same number
+    of buckets, so memory stays small over any range and percentiles keep their relative precision.
+
+    :param significant_figures: (optional) Decimal digits kept. Defaults 2.
+    :param resolution: (optional) Size of one unit in seconds. Defaults 1e-6.
+
+    """
+
+    def __init__(self, significant_figures=DEFAULT_SIGNIFICANT_FIGURES, resolution=DEFAULT_RESOLUTION):
+        """Create an empty histogram."""
+        self.significant_figures = significant_figures
+        self.resolution = resolution
+        self._sub_bits = (2 * 10 ** significant_figures - 1).bit_length()
+        self._sub_count = 1 << self._sub_bits
+        self._half = self._sub_count >> 1
+        self.counts = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def _index(self, units):
+        if units < self._sub_count:
+            return units
+        shift = units.bit_length() - self._sub_bits
+        return self._sub_count + (shift - 1) * self._half + (units >> shift) - self._half
+
+    def _upper(self, index):
+        # Largest unit value counted in a bucket
+        if index < self._sub_count:
+            return index
+        shift = (index - self._sub_count) // self._half + 1
+        top = (index - self._sub_count) % self._half + self._half
+        return ((top + 1) << shift) - 1
+
+    def record(self, value, count=1):
+        """
+        Count a value.
+
+        :param value: Latency in seconds.
+        :param count: (optional) Times value is counted. Defaults 1.
+        :return: none
+
+        """
+        index = self._index(max(0, int(value / self.resolution)))
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.count += count
+        self.total += value * count
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        return
+
+    def merge(self, other):
+        """
+        Add counts of another histogram with same settings.
+
+        :param other: Histogram object.
+        :return: self
+
+        """
+        for index, count in list(other.counts.items()):
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+        return self
+
+    @property
+    def mean(self):
+        """Average value in seconds, None if empty."""
+        return self.total / self.count if self.count else None
+
+    def percentile(self, percent):
+        """
+        Get a percentile.
+
+        :param percent: Percentile between 0 and 100, for example 99.
+        :return: Seconds at or below which percent of values are, None if empty.
+
+        """
+        if not self.count:
+            return None
+        rank = max(1, percent / 100.0 * self.count)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self.max, (self._upper(index) + 1) * self.resolution)
+        return self.max
+
+    def buckets(self):
+        """
+        Get cumulative counts.
+
+        :return: List of (upper bound in seconds, number of values at or below it) in increasing order.
+
+        """
+        seen = 0
+        result = []
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            result.append(((self._upper(index) + 1) * self.resolution, seen))
+        return result
+
+    def __repr__(self):
+        """Show count and main percentiles."""
+        if not self.count:
+            return '<Histogram empty>'
+        return '<Histogram %d values, p50 %.6fs, p99 %.6fs, max %.6fs>' \
+            % (self.count, self.percentile(50), self.percentile(99), self.max)
+
+
+class Stats(object):
+    """
+    Counters of one service, region and endpoint.
+
+    :ivar calls: Number of requests.
+    :ivar errors: Requests without response or with status 400 or above.
+    :ivar retries: Requests which were retries of throttled requests.
+    :ivar statuses: Dictionary of request counts by status code, None for no response.
+    :ivar bytes_sent: Total length of request bodies.
+    :ivar bytes_received: Total length of response bodies.
+    :ivar histogram: Histogram of durations.
+
+    """
+
+    def __init__(self, method=None, path=None):
+        """Create empty counters."""
+        self.method = method
+        self.path = path
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.statuses = {}
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.histogram = Histogram()
+
+    def record(self, call):
+        """
+        Count a finished call.
+
+        :param call: Call object.
+        :return: none
+
+        """
+        self.calls += 1
+        if call.failed:
+            self.errors += 1
+        if call.attempt:
+            self.retries += 1
+        self.statuses[call.status] = self.statuses.get(call.status, 0) + 1
+        self.bytes_sent += call.bytes_sent or 0
+        self.bytes_received += call.bytes_received or 0
+        self.histogram.record(call.duration)
+        return
+
+    def merge(self, other):
+        """
+        Add counters of another Stats object.
+
+        :param other: Stats object.
+        :return: self
+
+        """
+        self.calls += other.calls
+        self.errors += other.errors
+        self.retries += other.retries
+        for status, count in list(other.statuses.items()):
+            self.statuses[status] = self.statuses.get(status, 0) + count
+        self.bytes_sent += other.bytes_sent
+        self.bytes_received += other.bytes_received
+        self.histogram.merge(other.histogram)
+        return self
+
+
+class Aggregator(Hook):
+    """
+    Hook keeping Stats per service, region and endpoint name.
+
+    Every thread counts into its own set of Stats, so recording takes no lock. Sets are
+    merged when stats() or report() is called.
+
+    """
+
+    def __init__(self):
+        """Create an empty aggregator."""
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._shards = []
+
+    def _shard(self):
+        try:
+            return self._local.stats
+        except AttributeError:
+            stats = {}
+            self._local.stats = stats
+            with self._lock:
+                self._shards.append(stats)
+            return stats
+
+    def finish(self, call):
+        """Count a finished call."""
+        shard = self._shard()
+        key = (call.service, call.region, call.operation)
+        stats = shard.get(key)
+        if stats is None:
+            stats = shard[key] = Stats(call.method, call.path)
+        stats.record(call)
+        return
+
+    def stats(self):
+        """
+        Get counters of all threads.
+
+        :return: Dictionary of Stats objects by (service, region, operation).
+
+        """
+        with self._lock:
+            shards = list(self._shards)
+        merged = {}
+        for shard in shards:
+            for key, stats in list(shard.items()):
+                if key not in merged:
+                    merged[key] = Stats(stats.method, stats.path)
+                merged[key].merge(stats)
+        return merged
+
+    def report(self, by=('service', 'region', 'operation')):
+        """
+        Summarize counters, most time spent first.
+
+        :param by: (optional) Tuple of 'service', 'region' and 'operation' to group by. Defaults all three.
+        :return: List of dictionaries with group keys, calls, errors, bytes_sent, bytes_received,
+                 total_seconds, mean_seconds, p50_seconds, p90_seconds, p99_seconds and max_seconds.
+
+        """
+        fields = ('service', 'region', 'operation')
+        groups = {}
+        for key, stats in self.stats().items():
+            values = dict(zip(fields, key))
+            group = tuple(values[name] for name in by)
+            if group not in groups:
+                groups[group] = Stats()
+            groups[group].merge(stats)
+
+        rows = []
+        for group, stats in groups.items():
+            histogram = stats.histogram
+            row = dict(zip(by, group))
+            row.update({'calls': stats.calls, 'errors': stats.errors, 'bytes_sent': stats.bytes_sent,
+                        'bytes_received': stats.bytes_received, 'total_seconds': histogram.total,
+                        'mean_seconds': histogram.mean, 'p50_seconds': histogram.percentile(50),
+                        'p90_seconds': histogram.percentile(90), 'p99_seconds': histogram.percentile(99),
+                        'max_seconds': histogram.max})
+            rows.append(row)
+        rows.sort(key=lambda row: row['total_seconds'], reverse=True)
+        return rows
+
+    def reset(self):
+        """
+        Forget all counters.
+
+        :return: none
+
+        """
+        with self._lock:
+            self._shards = []
+            self._local = threading.local()
+        return
@@ -0,0 +1,181 @@
+"""
+Inventory module.
+
+ Snapshot of all resources of a project with cross-referenced indexes.
+
+ snapshot_project() lists networks, subnets, ports, routers, floating IPs, security groups,
+ servers and network connectors concurrently, so the whole fetch takes about as long as the
+ slowest list call. The returned Snapshot has hash indexes for common joins, for example
+ ports of a device, so scripts do not need nested loops over two lists.
+
+ Example::
+
+    from k5lib import inventory
+
+    snapshot = inventory.snapshot_project(project_token, region, project_id)
+    for endpoint in snapshot.network_connector_endpoints:
+        for port in snapshot.ports_by_device.get(endpoint['network_connector_id'], []):
+            print(port['id'])
+
+"""
+import concurrent.futures
+import logging
+
+from . import compute
+from . import models as _models
+from . import namecache
+from . import network
+
+log = logging.getLogger(__name__)
+
+
+def _value(item, key):
+    if isinstance(item, dict):
+        return item.get(key)
+    return getattr(item, key, None)
+
+
+def _subnet_ids(port):
+    fixed_ips = _value(port, 'fixed_ips') or ()
+    for fixed_ip in fixed_ips:
+        if isinstance(fixed_ip, dict):
+            yield fixed_ip.get('subnet_id')
+        else:
+            yield fixed_ip[0]
+
+
+def _index(items, key):
+    index = {}
+    for item in items:
+        index.setdefault(_value(item, key), []).append(item)
+    return index
+
+
+class Snapshot(object):
+    """
+    Resources of one project with indexes.
+
+    Resources are lists of dictionaries, or k5lib.models objects if snapshot was taken with
+    models=True. Network connectors and their endpoints are always dictionaries. Index values
+    are lists, use get(key, []) for keys that may be missing.
+
+    :ivar networks: List of networks.
+    :ivar subnets: List of subnets.
+    :ivar ports: List of ports.
+    :ivar routers: List of routers.
+    :ivar floating_ips: List of floating IPs.
+    :ivar security_groups: List of security groups.
+    :ivar servers: List of servers, only ID and name.
+    :ivar network_connectors: List of network connectors.
+    :ivar network_connector_endpoints: List of network connector endpoints.
+    :ivar errors: Dictionary of errors by resource type, for example {'servers': 'Error: ...'}.
+    :ivar by_id: Dictionary of resources by ID, for all resource types.
+    :ivar ports_by_device: Ports by device_id, for example server or router ID.
+    :ivar ports_by_network: Ports by network_id.
+    :ivar ports_by_subnet: Ports by subnet ID of any fixed IP.
+    :ivar servers_by_name: Servers by name.
+    :ivar subnets_by_network: Subnets by network_id.
+    :ivar floating_ips_by_port: Floating IPs by port_id.
+    :ivar endpoints_by_connector: Network connector endpoints by network_connector_id.
+
+    """
+
+    def __init__(self, resources, errors):
+        """Create snapshot and build indexes from dictionary of resource lists."""
+        self.networks = resources.get('networks', [])
+        self.subnets = resources.get('subnets', [])
+        self.ports = resources.get('ports', [])
+        self.routers = resources.get('routers', [])
+        self.floating_ips = resources.get('floating_ips', [])
+        self.security_groups = resources.get('security_groups', [])
+        self.servers = resources.get('servers', [])
+        self.network_connectors = resources.get('network_connectors', [])
+        self.network_connector_endpoints = resources.get('network_connector_endpoints', [])
+        self.errors = errors
+
+        self.by_id = {}
+        for items in resources.values():
+            for item in items:
+                self.by_id[_value(item, 'id')] = item
+
+        self.ports_by_device = _index(self.ports, 'device_id')
+        self.ports_by_network = _index(self.ports, 'network_id')
+        self.ports_by_subnet = {}
+        for port in self.ports:
+            for subnet_id in set(_subnet_ids(port)):
+                self.ports_by_subnet.setdefault(subnet_id, []).append(port)
+        self.servers_by_name = _index(self.servers, 'name')
+        self.subnets_by_network = _index(self.subnets, 'network_id')
+        self.floating_ips_by_port = _index(self.floating_ips, 'port_id')
+        self.endpoints_by_connector = _index(self.network_connector_endpoints, 'network_connector_id')
+
+    def __repr__(self):
+        """Show resource counts."""
+        return '<Snapshot ' + ', '.join(str(len(getattr(self, name))) + ' ' + name for name in
+                                        ('networks', 'subnets', 'ports', 'routers', 'floating_ips',
+                                         'security_groups', 'servers', 'network_connectors',
+                                         'network_connector_endpoints')) + '>'
+
+
+def _fetch(iterator):
+    items = list(iterator)
+    if items and isinstance(items[-1], str):
+        return items[-1]
+    return items
+
+
+def snapshot_project(project_token, region, project_id=None, page_size=None, models=False, max_workers=None):
+    """
+    Take snapshot of resources of a project.
+
+    All resource types are listed concurrently. A failed list is left empty and its error is
+    kept in errors of the snapshot.
+
+    :param project_token: A valid K5 project token.
+    :param region: K5 region name.
+    :param project_id: (optional) Project ID, needed for servers. Defaults project of a token
+                       authenticated by k5lib, servers are skipped if it is not known.
+    :param page_size: (optional) Items per request. Defaults None, everything with one request per type.
+    :param models: (optional) If True, resources are k5lib.models objects. Defaults False.
+    :param max_workers: (optional) Number of threads. Defaults one per resource type.
+    :return: Snapshot object.
+
+    """
+    if project_id is None:
+        project_id = namecache.get_project_id(project_token)
+
+    tasks = {'networks': (network.iter_networks, _models.Network),
+             'subnets': (network.iter_subnets, _models.Subnet),
+             'ports': (network.iter_ports, _models.Port),
+             'routers': (network.iter_routers, _models.Router),
+             'floating_ips': (network.iter_floating_ips, _models.FloatingIP),
+             'security_groups': (network.iter_security_groups, _models.SecurityGroup),
+             'network_connectors': (network.iter_network_connectors, None),
+             'network_connector_endpoints': (network.iter_network_connector_endpoints, None)}
+    resources = {}
+    errors = {}
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers or len(tasks) + 1) as executor:
+        futures = {}
+        for name, (iterate, model) in tasks.items():
+            futures[name] = executor.submit(_fetch, iterate(project_token, region, page_size=page_size))
+        if project_id is not None:
+            futures['servers'] = executor.submit(
+                _fetch, compute.iter_servers(project_token, region, project_id, page_size=page_size))
+        else:
+            errors['servers'] = 'Error: project ID not known, servers skipped'
+
+        for name, future in futures.items():
+            items = future.result()
+            if isinstance(items, str):
+                log.warning('snapshot_project: ' + name + ' left empty')
+                errors[name] = items
+                items = []
+            resources[name] = items
+
+    if models:
+        tasks['servers'] = (None, _models.Server)
+        for name, (iterate, model) in tasks.items():
+            if model is not None:
+                resources[name] = [model(item) for item in resources.get(name, [])]
+    return Snapshot(resources, errors)
@@ -0,0 +1,196 @@
+"""
+IPAM module.
+
+ Free address bookkeeping of a subnet.
+
+ IPAllocator keeps used addresses of one subnet as sorted ranges, so the first free address is
+ found with a binary search instead of comparing every address of the subnet to every port.
+ Memory grows with the number of used ranges, not with subnet size, so IPv6 subnets work too.
+ Use k5lib.network.get_ip_allocator() to build one from a K5 subnet.
+
+ Example::
+
+    from k5lib import ipam
+
+    allocator = ipam.IPAllocator('192.168.0.0/24', used=['192.168.0.1'], exclude=[('192.168.0.2', '192.168.0.9')])
+    address = allocator.first_free(offset=10)
+
+"""
+import bisect
+import ipaddress
+import socket
+
+
+class IPAllocator(object):
+    """
+    Used and free addresses of one subnet.
+
+    Network address and, on IPv4, broadcast address are never free, same as in ipaddress hosts().
+
+    :param cidr: Subnet CIDR, for example '192.168.0.0/24'.
+    :param used: (optional) Iterable of used addresses.
+    :param exclude: (optional) Iterable of addresses or (first, last) ranges which are never given out.
+
+    """
+
+    def __init__(self, cidr, used=(), exclude=()):
+        """Create an allocator."""
+        self.network = ipaddress.ip_network(cidr, strict=False)
+        self._base = int(self.network.network_address)
+        self._family = socket.AF_INET if self.network.version == 4 else socket.AF_INET6
+        self._size = self.network.num_addresses
+        # First and last index of used ranges, sorted, neither overlapping nor adjacent
+        self._starts = []
+        self._ends = []
+
+        ranges = [(0, 0)]
+        if self.network.version == 4 and self._size > 2:
+            ranges.append((self._size - 1, self._size - 1))
+        for address in used:
+            index = self._index(address)
+            if index is not None:
+                ranges.append((index, index))
+        for item in exclude:
+            if isinstance(item, (tuple, list)):
+                item = self._range(item[0], item[1])
+            else:
+                index = self._index(item)
+                item = None if index is None else (index, index)
+            if item is not None:
+                ranges.append(item)
+        # Ranges are merged in one pass instead of inserting them one by one
+        for first, last in sorted(ranges):
+            if self._ends and first <= self._ends[-1] + 1:
+                self._ends[-1] = max(self._ends[-1], last)
+            else:
+                self._starts.append(first)
+                self._ends.append(last)
+
+    def _int(self, address):
+        if isinstance(address, str):
+            # Much faster than ipaddress for the thousands of port addresses of a large subnet
+            try:
+                return int.from_bytes(socket.inet_pton(self._family, address), 'big')
+            except OSError:
+                pass
+        return int(ipaddress.ip_address(address))
+
+    def _index(self, address):
+        index = self._int(address) - self._base
+        if index < 0 or index >= self._size:
+            return None
+        return index
+
+    def _range(self, first, last):
+        start = max(0, self._int(first) - self._base)
+        end = min(self._size - 1, self._int(last) - self._base)
+        if end < start:
+            return None
+        return start, end
+
+    def _find(self, index):
+        # Position of the used range holding index, or None
+        position = bisect.bisect_right(self._starts, index) - 1
+        if position >= 0 and self._ends[position] >= index:
+            return position
+        return None
+
+    def _add(self, start, end):
+        # Ranges overlapping or touching start - end are merged with it
+        first = bisect.bisect_left(self._ends, start - 1)
+        last = bisect.bisect_right(self._starts, end + 1)
+        if first < last:
+            start = min(start, self._starts[first])
+            end = max(end, self._ends[last - 1])
+        self._starts[first:last] = [start]
+        self._ends[first:last] = [end]
+
+    def mark(self, address):
+        """
+        Mark an address used. Addresses outside the subnet are ignored.
+
+        :param address: Address as string or ipaddress object.
+        :return: none
+
+        """
+        index = self._index(address)
+        if index is not None:
+            self._add(index, index)
+        return
+
+    def release(self, address):
+        """
+        Mark an address free.
+
+        :param address: Address as string or ipaddress object.
+        :return: none
+
+        """
+        index = self._index(address)
+        position = None if index is None else self._find(index)
+        if position is not None:
+            start = self._starts[position]
+            end = self._ends[position]
+            parts = [part for part in ((start, index - 1), (index + 1, end)) if part[0] <= part[1]]
+            self._starts[position:position + 1] = [part[0] for part in parts]
+            self._ends[position:position + 1] = [part[1] for part in parts]
+        return
+
+    def exclude(self, first, last):
+        """
+        Mark a range of addresses used, for example an allocation pool.
+
+        :param first: First address of the range.
+        :param last: Last address of the range.
+        :return: none
+
+        """
+        item = self._range(first, last)
+        if item is not None:
+            self._add(*item)
+        return
+
+    def is_free(self, address):
+        """
+        Check if address is free.
+
+        :param address: Address as string or ipaddress object.
+        :return: True if address is inside the subnet and free.
+
+        """
+        index = self._index(address)
+        return index is not None and self._find(index) is None
+
+    def first_free(self, offset=0):
+        """
+        Find the first free address after offset.
+
+        :param offset: (optional) Addresses up to network address + offset are skipped. Defaults 0.
+        :return: ipaddress object or None if subnet is full.
+
+        """
+        index = max(0, (offset or 0) + 1)
+        # Used ranges are not adjacent, so the address after the range holding index is free
+        position = self._find(index)
+        if position is not None:
+            index = self._ends[position] + 1
+        if index >= self._size:
+            return None
+        return ipaddress.ip_address(self._base + index)
+
+    def allocate(self, offset=0):
+        """
+        Take the first free address after offset.
+
+        :param offset: (optional) Addresses up to network address + offset are skipped. Defaults 0.
+        :return: ipaddress object or None if subnet is full.
+
+        """
+        address = self.first_free(offset)
+        if address is not None:
+            self.mark(address)
+        return address
+
+    def __repr__(self):
+        """Show subnet."""
+        return '<IPAllocator ' + str(self.network) + '>'
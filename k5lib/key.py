@@ -34,50 +34,76 @@
         "type": "certificate"
       },
 """
-import requests
-import json
 import logging
-import ipaddress
 import datetime
+from . import api
 
 log = logging.getLogger(__name__)
 
 
-def _rest_create_key_container(project_token, region, project_id, container_type, container_name, key_list):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-    """
-    NOTE for SSL-VPN2
-    The following fixed values must be specified for the key information container used when creating an SSL-VPN V2
-    connection.
-
-        type: It is necessary to specify "generic".
-        name: It is necessary to specify "ca", "server_certificate", "server_key", and "dh".
-
-    """
-
+def _key_container_config(args):
+    # NOTE for SSL-VPN2
+    # The following fixed values must be specified for the key information container used when creating an SSL-VPN V2
+    # connection.
+    #
+    #     type: It is necessary to specify "generic".
+    #     name: It is necessary to specify "ca", "server_certificate", "server_key", and "dh".
+    container_type = args['container_type']
     valid_type = ['generic', 'certificate']
     if container_type not in valid_type:
         container_type = valid_type[0]
 
-    configData ={
-        "name": container_name,
+    return {
+        "name": args['container_name'],
         "type": container_type,
-        "secret_refs": key_list
+        "secret_refs": args['key_list']
     }
 
-    url = 'https://keymanagement.' + region + '.cloud.global.fujitsu.com/v1/' + project_id +'/containers'
 
-    try:
-        request = requests.post(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
+def _key_config(args):
+    #
+    # verify expiration_date
+    # If not valid datetime.datetime object set to null so no expiration date
+    expiration_date = args['expiration_date']
+    if isinstance(expiration_date, datetime.datetime):
+        expiration_date = str(expiration_date.isoformat())
     else:
-        return request
+        expiration_date = None
+
+    configData = {
+        "name": args['key_name'],
+        "expiration": expiration_date,
+        "payload": args['key'],
+        "payload_content_type": "text/plain",
+        "payload_content_encoding": "base64"
+    }
+
+    # verify key_type
+    # Valid values: "text/plain", "text/plain;charset=utf-8", "text/plain; charset=utf-8", "application/octet-stream"
+    key_type = args['key_type']
+    valid_type = ['text/plain', 'text/plain;charset=utf-8', 'text/plain; charset=utf-8', 'application/octet-stream']
+    if key_type not in valid_type:
+        log.info('_key_config: key_type set to text/plain')
+        key_type = valid_type[0]
+
+    # verify key_enconding
+    # This item is required if "application/octet-stream" is specified for payload_content_type
+    if key_type.count('application/octet-stream'):
+        log.info('_key_config: key_encoding set to base64')
+    else:
+        log.info('_key_config: key_encoding removed from configData')
+        del configData['payload_content_encoding']
+
+    return configData
+
+
+ENDPOINTS = api.table(
+    api.Endpoint('create_key_container', 'keymanagement', 'POST', '/v1/{project_id}/containers',
+                 body=_key_container_config),
+    api.Endpoint('create_key', 'keymanagement', 'POST', '/v1/{project_id}/secrets', body=_key_config, secret=True),
+    api.Endpoint('list_keys', 'keymanagement', 'GET', '/v1/{project_id}/secrets'),
+    api.Endpoint('list_key_containers', 'keymanagement', 'GET', '/v1/{project_id}/containers'),
+)
 
 
 def create_key_container(project_token, region, project_id, container_type, container_name, key_list):
@@ -109,62 +135,8 @@ def create_key_container(project_token, region, project_id, container_type, cont
     :return:  URI of the container.
 
     """
-
-    request = _rest_create_key_container(project_token, region, project_id, container_type, container_name, key_list)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
-
-
-def _rest_create_key(project_token, region, project_id, key_name, key, expiration_date, key_type):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    #
-    # verify expiration_date
-    # If not valid datetime.datetime object set to null so no expiration date
-    if not isinstance(expiration_date, datetime.datetime):
-        expiration_date = None
-
-    configData = {
-        "name": key_name,
-        "expiration": str(expiration_date.isoformat()),
-        "payload": key,
-        "payload_content_type": "text/plain",
-        "payload_content_encoding": "base64"
-    }
-
-    # verify key_type
-    # Valid values: "text/plain", "text/plain;charset=utf-8", "text/plain; charset=utf-8", "application/octet-stream"
-    valid_type = ['text/plain', 'text/plain;charset=utf-8', 'text/plain; charset=utf-8', 'application/octet-stream']
-    if key_type not in valid_type:
-        log.info('_rest_create_key: key_type set to text/plain')
-        key_type = valid_type[0]
-
-    # verify key_enconding
-    # This item is required if "application/octet-stream" is specified for payload_content_type
-    if key_type.count('application/octet-stream'):
-        key_encoding = 'base64'
-        log.info('_rest_create_key: key_encoding set to base64')
-    else:
-        log.info('_rest_create_key: key_encoding removed from configData')
-        del configData['payload_content_encoding']
-
-    url = 'https://keymanagement.' + region + '.cloud.global.fujitsu.com/v1/' + project_id +'/secrets'
-
-    try:
-        request = requests.post(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        log.info('_rest_key_create: output')
-        log.info(json.dumps(configData, indent=4))
-        return request
+    return api.call(ENDPOINTS['create_key_container'], project_token, region, project_id=project_id,
+                    container_type=container_type, container_name=container_name, key_list=key_list)
 
 
 def create_key(project_token, region, project_id, key_name, key, expiration_date, key_type):
@@ -183,29 +155,8 @@ def create_key(project_token, region, project_id, key_name, key, expiration_date
 
     :return: URI of the key.
     """
-    request = _rest_create_key(project_token, region, project_id, key_name, key, expiration_date, key_type)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
-
-def _rest_list_keys(project_token, region, project_id):
-    headers = {'Content-Type': 'application/json',
-              'Accept': 'application/json',
-              'X-Auth-Token': project_token}
-
-    url = 'https://keymanagement.' + region + '.cloud.global.fujitsu.com/v1/' + project_id +'/secrets'
-
-
-    try:
-        request = requests.get(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-         # Whoops it wasn't a 200
-         log.error(str(e))
-         return 'Error: ' + str(e)
-    else:
-         return request
+    return api.call(ENDPOINTS['create_key'], project_token, region, project_id=project_id, key_name=key_name, key=key,
+                    expiration_date=expiration_date, key_type=key_type)
 
 
 def list_keys(project_token, region, project_id):
@@ -219,29 +170,24 @@ def list_keys(project_token, region, project_id):
     :return: JSON that contains keys metadata if successful. Otherwise error from requests library.
 
     """
-    request = _rest_list_keys(project_token, region, project_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
+    return api.call(ENDPOINTS['list_keys'], project_token, region, project_id=project_id)
 
-def _rest_list_key_containers(project_token, region, project_id):
-    headers = {'Content-Type': 'application/json',
-              'Accept': 'application/json',
-              'X-Auth-Token': project_token}
 
-    url = 'https://keymanagement.' + region + '.cloud.global.fujitsu.com/v1/' + project_id +'/containers'
+def iter_keys(project_token, region, project_id, page_size=api.DEFAULT_PAGE_SIZE, filters=None, stream=False):
+    """
+    Iterate keys metadata page by page.
 
+    :param project_token: A valid K5 project token.
+    :param region: K5 region name.
+    :param project_id: A valid project ID.
+    :param page_size: (optional) Items per request, None for one request. Defaults 100.
+    :param filters: (optional) Dictionary of extra URL query parameters supported by the service.
+    :param stream: (optional) If True, responses are decoded incrementally. Defaults False.
+    :return: Generator of key metadata dictionaries. If a request fails, error is yielded as the last item.
 
-    try:
-        request = requests.get(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-         # Whoops it wasn't a 200
-         log.error(str(e))
-         return 'Error: ' + str(e)
-    else:
-         return request
+    """
+    return api.iterate(ENDPOINTS['list_keys'], project_token, region, 'secrets',
+                       page_size=page_size, filters=filters, stream=stream, paging='offset', project_id=project_id)
 
 
 def list_key_containers(project_token, region, project_id):
@@ -255,8 +201,21 @@ def list_key_containers(project_token, region, project_id):
     :return: JSON that contains key metadata containers if successful. Otherwise error from requests library.
 
     """
-    request = _rest_list_key_containers(project_token, region, project_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
+    return api.call(ENDPOINTS['list_key_containers'], project_token, region, project_id=project_id)
+
+
+def iter_key_containers(project_token, region, project_id, page_size=api.DEFAULT_PAGE_SIZE, filters=None, stream=False):
+    """
+    Iterate key containers page by page.
+
+    :param project_token: A valid K5 project token.
+    :param region: K5 region name.
+    :param project_id: A valid project ID.
+    :param page_size: (optional) Items per request, None for one request. Defaults 100.
+    :param filters: (optional) Dictionary of extra URL query parameters supported by the service.
+    :param stream: (optional) If True, responses are decoded incrementally. Defaults False.
+    :return: Generator of key container dictionaries. If a request fails, error is yielded as the last item.
+
+    """
+    return api.iterate(ENDPOINTS['list_key_containers'], project_token, region, 'containers',
+                       page_size=page_size, filters=filters, stream=stream, paging='offset', project_id=project_id)
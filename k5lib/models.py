@@ -0,0 +1,273 @@
+"""
+Models module.
+
+ Compact resource objects for large inventories.
+
+ A port dictionary returned by list_ports() takes several hundred bytes plus its own copies of
+ every key and ID string. The classes here keep only commonly used attributes in __slots__,
+ share equal ID and status strings with sys.intern(), and optionally keep the full payload as
+ a compact JSON string that is decoded only when raw is read.
+
+ List functions of networking and compute return these objects with models=True. Any iterable
+ of dictionaries, for example from iter_ports(), can be converted with load().
+
+ Example::
+
+    from k5lib import models, network
+
+    ports = network.list_ports(project_token, region, models=True)
+    ports = list(models.load(models.Port, network.iter_ports(project_token, region, stream=True)))
+
+"""
+import json
+import sys
+
+
+def _intern(value):
+    if isinstance(value, str):
+        return sys.intern(value)
+    return value
+
+
+def _interned_tuple(values):
+    return tuple(_intern(value) for value in values or ())
+
+
+def _fixed_ips(values):
+    return tuple((_intern(value.get('subnet_id')), value.get('ip_address')) for value in values or ())
+
+
+def _reference_id(value):
+    # Compute returns image and flavor as {"id": ..., "links": [...]}
+    if isinstance(value, dict):
+        return _intern(value.get('id'))
+    return _intern(value or None)
+
+
+def _gateway_network(value):
+    if isinstance(value, dict):
+        return _intern(value.get('network_id'))
+    return None
+
+
+def _pools(values):
+    return tuple((value.get('start'), value.get('end')) for value in values or ())
+
+
+class Resource(object):
+    """
+    Base class of resource objects.
+
+    Subclasses list their attributes in _fields as (attribute, key, converter) tuples.
+
+    :param data: Resource dictionary from K5 API.
+    :param keep_raw: (optional) If True, full dictionary is kept as compact JSON for raw. Defaults False.
+
+    """
+
+    __slots__ = ('_raw',)
+    _fields = ()
+    collection = None
+
+    def __init__(self, data, keep_raw=False):
+        """Create a resource object from dictionary."""
+        for attribute, key, convert in self._fields:
+            setattr(self, attribute, convert(data.get(key)))
+        if keep_raw:
+            self._raw = json.dumps(data, separators=(',', ':'))
+        else:
+            self._raw = None
+
+    @property
+    def raw(self):
+        """Full resource dictionary, or dictionary of kept attributes if raw was not kept."""
+        if self._raw is None:
+            return self.to_dict()
+        return json.loads(self._raw)
+
+    def to_dict(self):
+        """
+        Get kept attributes as dictionary.
+
+        :return: Dictionary.
+
+        """
+        return dict((attribute, getattr(self, attribute)) for attribute, key, convert in self._fields)
+
+    def __eq__(self, other):
+        """Compare type and attributes."""
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __ne__(self, other):
+        """Compare type and attributes."""
+        return not self == other
+
+    def __hash__(self):
+        """Hash of ID."""
+        return hash((type(self).__name__, getattr(self, 'id', None)))
+
+    def __repr__(self):
+        """Show type, ID and name."""
+        return '<' + type(self).__name__ + ' ' + str(getattr(self, 'id', None)) + ' ' \
+            + repr(getattr(self, 'name', None)) + '>'
+
+
+class Network(Resource):
+    """Network."""
+
+    __slots__ = ('id', 'name', 'status', 'subnets', 'shared', 'external', 'availability_zone', 'tenant_id')
+    _fields = (('id', 'id', _intern),
+               ('name', 'name', _intern),
+               ('status', 'status', _intern),
+               ('subnets', 'subnets', _interned_tuple),
+               ('shared', 'shared', bool),
+               ('external', 'router:external', bool),
+               ('availability_zone', 'availability_zone', _intern),
+               ('tenant_id', 'tenant_id', _intern))
+    collection = 'networks'
+
+
+class Subnet(Resource):
+    """Subnet. allocation_pools is a tuple of (start, end) tuples."""
+
+    __slots__ = ('id', 'name', 'network_id', 'cidr', 'gateway_ip', 'ip_version', 'allocation_pools',
+                 'availability_zone', 'tenant_id')
+    _fields = (('id', 'id', _intern),
+               ('name', 'name', _intern),
+               ('network_id', 'network_id', _intern),
+               ('cidr', 'cidr', _intern),
+               ('gateway_ip', 'gateway_ip', _intern),
+               ('ip_version', 'ip_version', _intern),
+               ('allocation_pools', 'allocation_pools', _pools),
+               ('availability_zone', 'availability_zone', _intern),
+               ('tenant_id', 'tenant_id', _intern))
+    collection = 'subnets'
+
+
+class Port(Resource):
+    """Port. fixed_ips is a tuple of (subnet_id, ip_address) tuples."""
+
+    __slots__ = ('id', 'name', 'network_id', 'device_id', 'device_owner', 'mac_address', 'status', 'fixed_ips',
+                 'security_groups', 'availability_zone', 'tenant_id')
+    _fields = (('id', 'id', _intern),
+               ('name', 'name', _intern),
+               ('network_id', 'network_id', _intern),
+               ('device_id', 'device_id', _intern),
+               ('device_owner', 'device_owner', _intern),
+               ('mac_address', 'mac_address', _intern),
+               ('status', 'status', _intern),
+               ('fixed_ips', 'fixed_ips', _fixed_ips),
+               ('security_groups', 'security_groups', _interned_tuple),
+               ('availability_zone', 'availability_zone', _intern),
+               ('tenant_id', 'tenant_id', _intern))
+    collection = 'ports'
+
+
+class Router(Resource):
+    """Router. external_network_id is network of external gateway."""
+
+    __slots__ = ('id', 'name', 'status', 'external_network_id', 'availability_zone', 'tenant_id')
+    _fields = (('id', 'id', _intern),
+               ('name', 'name', _intern),
+               ('status', 'status', _intern),
+               ('external_network_id', 'external_gateway_info', _gateway_network),
+               ('availability_zone', 'availability_zone', _intern),
+               ('tenant_id', 'tenant_id', _intern))
+    collection = 'routers'
+
+
+class FloatingIP(Resource):
+    """Floating IP."""
+
+    __slots__ = ('id', 'floating_ip_address', 'floating_network_id', 'fixed_ip_address', 'port_id', 'router_id',
+                 'status', 'availability_zone', 'tenant_id')
+    _fields = (('id', 'id', _intern),
+               ('floating_ip_address', 'floating_ip_address', _intern),
+               ('floating_network_id', 'floating_network_id', _intern),
+               ('fixed_ip_address', 'fixed_ip_address', _intern),
+               ('port_id', 'port_id', _intern),
+               ('router_id', 'router_id', _intern),
+               ('status', 'status', _intern),
+               ('availability_zone', 'availability_zone', _intern),
+               ('tenant_id', 'tenant_id', _intern))
+    collection = 'floatingips'
+
+
+class SecurityGroupRule(Resource):
+    """Security group rule."""
+
+    __slots__ = ('id', 'security_group_id', 'direction', 'ethertype', 'protocol', 'port_range_min',
+                 'port_range_max', 'remote_ip_prefix', 'remote_group_id')
+    _fields = (('id', 'id', _intern),
+               ('security_group_id', 'security_group_id', _intern),
+               ('direction', 'direction', _intern),
+               ('ethertype', 'ethertype', _intern),
+               ('protocol', 'protocol', _intern),
+               ('port_range_min', 'port_range_min', _intern),
+               ('port_range_max', 'port_range_max', _intern),
+               ('remote_ip_prefix', 'remote_ip_prefix', _intern),
+               ('remote_group_id', 'remote_group_id', _intern))
+    collection = 'security_group_rules'
+
+
+def _rules(values):
+    return tuple(SecurityGroupRule(value) for value in values or ())
+
+
+class SecurityGroup(Resource):
+    """Security group. rules is a tuple of SecurityGroupRule objects."""
+
+    __slots__ = ('id', 'name', 'description', 'rules', 'tenant_id')
+    _fields = (('id', 'id', _intern),
+               ('name', 'name', _intern),
+               ('description', 'description', _intern),
+               ('rules', 'security_group_rules', _rules),
+               ('tenant_id', 'tenant_id', _intern))
+    collection = 'security_groups'
+
+
+class Server(Resource):
+    """Server. List of servers has only id and name, other attributes come with server details."""
+
+    __slots__ = ('id', 'name', 'status', 'flavor_id', 'image_id', 'key_name', 'availability_zone', 'tenant_id')
+    _fields = (('id', 'id', _intern),
+               ('name', 'name', _intern),
+               ('status', 'status', _intern),
+               ('flavor_id', 'flavor', _reference_id),
+               ('image_id', 'image', _reference_id),
+               ('key_name', 'key_name', _intern),
+               ('availability_zone', 'OS-EXT-AZ:availability_zone', _intern),
+               ('tenant_id', 'tenant_id', _intern))
+    collection = 'servers'
+
+
+def load(model, items, keep_raw=False):
+    """
+    Convert resource dictionaries to objects.
+
+    :param model: Resource class, for example Port.
+    :param items: Iterable of resource dictionaries. An error string from an iterator is passed on as is.
+    :param keep_raw: (optional) If True, objects keep full dictionaries as compact JSON. Defaults False.
+    :return: Generator of resource objects.
+
+    """
+    for item in items:
+        if isinstance(item, str):
+            yield item
+        else:
+            yield model(item, keep_raw)
+
+
+def load_list(model, response, keep_raw=False):
+    """
+    Convert JSON of a list function to list of objects.
+
+    :param model: Resource class, for example Port.
+    :param response: JSON returned by list function, for example list_ports().
+    :param keep_raw: (optional) If True, objects keep full dictionaries as compact JSON. Defaults False.
+    :return: List of resource objects. Error string of the list function is returned as is.
+
+    """
+    if isinstance(response, str):
+        return response
+    return [model(item, keep_raw) for item in response[model.collection]]
@@ -0,0 +1,323 @@
+"""
+Namecache module.
+
+ In-memory cache of name to ID resolutions shared by all k5lib modules.
+
+ Results of get_*_id functions are cached by (region, project, resource type, name) for a
+ limited time. Successful create_* calls add the created resource unless its name is cached
+ already for another resource, and delete_* calls drop every name pointing to the deleted ID,
+ so provisioning code can resolve the same names again and again without listing resources
+ every time. Least recently used entries are dropped when the cache is full.
+
+ Endpoints opt in with lookup(), create() and delete() in their cache attribute.
+
+ Example::
+
+    from k5lib import configure_name_cache
+
+    configure_name_cache(ttl=60, maxsize=10000)
+
+"""
+import collections
+import threading
+import time
+import logging
+
+log = logging.getLogger(__name__)
+
+# Seconds a resolution is trusted.
+DEFAULT_TTL = 300
+# Maximum number of cached resolutions.
+DEFAULT_MAXSIZE = 4096
+
+_settings = {'enabled': True,
+             'ttl': DEFAULT_TTL,
+             'maxsize': DEFAULT_MAXSIZE}
+
+_entries = collections.OrderedDict()
+# Keys of cached names by (region, resource type, ID), for eviction of deleted resources
+_ids = {}
+_projects = collections.OrderedDict()
+_stats = {'hits': 0, 'misses': 0}
+_lock = threading.Lock()
+
+
+def configure_name_cache(enabled=None, ttl=None, maxsize=None):
+    """
+    Configure name to ID resolution cache.
+
+    Cached resolutions are dropped.
+
+    :param enabled: (optional) If False, names are always resolved by the API. Defaults True.
+    :param ttl: (optional) Seconds a resolution is trusted. Defaults 300.
+    :param maxsize: (optional) Maximum number of cached resolutions. Defaults 4096.
+    :return: none
+
+    """
+    options = {'enabled': enabled,
+               'ttl': ttl,
+               'maxsize': maxsize}
+
+    with _lock:
+        for key, value in options.items():
+            if value is not None:
+                _settings[key] = value
+        log.info('Name cache settings: ' + str(_settings))
+        _entries.clear()
+        _ids.clear()
+    return
+
+
+def clear_name_cache():
+    """
+    Drop all cached resolutions.
+
+    :return: none
+
+    """
+    with _lock:
+        _entries.clear()
+        _ids.clear()
+    return
+
+
+def get_name_cache_stats():
+    """
+    Get counters of the name cache.
+
+    :return: Dictionary with hits and misses of lookups since start, and number of cached entries.
+
+    """
+    with _lock:
+        return {'hits': _stats['hits'], 'misses': _stats['misses'], 'entries': len(_entries)}
+
+
+def register_token(token, project_id):
+    """
+    Remember project of a token.
+
+    Tokens of the same project then share cached resolutions. Called by k5lib.authenticate.
+
+    :param token: K5 project token.
+    :param project_id: ID of the project token is scoped to.
+    :return: none
+
+    """
+    if token is None or project_id is None:
+        return
+    with _lock:
+        _projects[token] = project_id
+        while len(_projects) > _settings['maxsize']:
+            _projects.popitem(last=False)
+    return
+
+
+def get_project_id(token):
+    """
+    Get project of a token authenticated by k5lib.
+
+    :param token: K5 project token.
+    :return: Project ID, or None if token is not known.
+
+    """
+    with _lock:
+        return _projects.get(token)
+
+
+def _project(token, args):
+    # Compute calls carry project ID, other tokens are scoped to exactly one project
+    project_id = args.get('project_id')
+    if project_id is None:
+        project_id = _projects.get(token, token)
+    return project_id
+
+
+def get(region, project, kind, name):
+    """
+    Get cached ID of a resource.
+
+    :param region: K5 region name.
+    :param project: Project ID, or token of the project.
+    :param kind: Resource type, for example 'network'.
+    :param name: Resource name.
+    :return: ID as string or None if not cached.
+
+    """
+    if not _settings['enabled']:
+        return None
+    key = (region, project, kind, name)
+    with _lock:
+        entry = _entries.get(key)
+        if entry is None:
+            _stats['misses'] += 1
+            return None
+        resource_id, expires = entry
+        if expires <= time.monotonic():
+            _drop(key)
+            _stats['misses'] += 1
+            return None
+        _entries.move_to_end(key)
+        _stats['hits'] += 1
+        return resource_id
+
+
+def put(region, project, kind, name, resource_id):
+    """
+    Cache ID of a resource.
+
+    :param region: K5 region name.
+    :param project: Project ID, or token of the project.
+    :param kind: Resource type, for example 'network'.
+    :param name: Resource name.
+    :param resource_id: Resource ID.
+    :return: none
+
+    """
+    if not _settings['enabled'] or name is None:
+        return
+    with _lock:
+        _store((region, project, kind, name), resource_id)
+    return
+
+
+def _store(key, resource_id):
+    if key in _entries:
+        _drop(key)
+    _entries[key] = (resource_id, time.monotonic() + _settings['ttl'])
+    _ids.setdefault((key[0], key[2], resource_id), set()).add(key)
+    while len(_entries) > _settings['maxsize']:
+        _drop(next(iter(_entries)))
+
+
+def _drop(key):
+    resource_id = _entries.pop(key)[0]
+    ids_key = (key[0], key[2], resource_id)
+    keys = _ids[ids_key]
+    keys.discard(key)
+    if not keys:
+        del _ids[ids_key]
+
+
+def add(region, project, kind, name, resource_id):
+    """
+    Cache ID of a created resource.
+
+    Names are not unique in K5. If the name is cached already, it now belongs to two resources
+    and is dropped, so the next lookup asks the API.
+
+    :param region: K5 region name.
+    :param project: Project ID, or token of the project.
+    :param kind: Resource type, for example 'network'.
+    :param name: Resource name.
+    :param resource_id: Resource ID.
+    :return: none
+
+    """
+    if not _settings['enabled'] or name is None:
+        return
+    key = (region, project, kind, name)
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None and entry[0] != resource_id and entry[1] > time.monotonic():
+            _drop(key)
+            log.info('Name ' + name + ' of ' + kind + ' is no longer unique, dropped from name cache')
+        else:
+            _store(key, resource_id)
+    return
+
+
+def evict(region, kind, resource_id):
+    """
+    Drop all cached names of a resource, cached for any project key.
+
+    :param region: K5 region name.
+    :param kind: Resource type, for example 'network'.
+    :param resource_id: Resource ID.
+    :return: none
+
+    """
+    with _lock:
+        # Same resource may be cached under several names and tokens of the project
+        for key in _ids.get((region, kind, resource_id), ()).copy():
+            _drop(key)
+    return
+
+
+class _Lookup(object):
+
+    def __init__(self, kind, name_arg):
+        self.kind = kind
+        self.name_arg = name_arg
+
+    def cached(self, endpoint, token, region, args):
+        return get(region, _project(token, args), self.kind, args[self.name_arg])
+
+    def update(self, endpoint, token, region, args, result):
+        if isinstance(result, str) and result != getattr(endpoint.extract, 'missing', None):
+            put(region, _project(token, args), self.kind, args[self.name_arg], result)
+
+
+class _Create(object):
+
+    def __init__(self, kind, name_arg, key=None):
+        self.kind = kind
+        self.name_arg = name_arg
+        self.key = key
+
+    def cached(self, endpoint, token, region, args):
+        return None
+
+    def update(self, endpoint, token, region, args, result):
+        if self.key is not None:
+            result = result[self.key]['id']
+        add(region, _project(token, args), self.kind, args.get(self.name_arg), result)
+
+
+class _Delete(object):
+
+    def __init__(self, kind, id_arg):
+        self.kind = kind
+        self.id_arg = id_arg
+
+    def cached(self, endpoint, token, region, args):
+        return None
+
+    def update(self, endpoint, token, region, args, result):
+        evict(region, self.kind, args[self.id_arg])
+
+
+def lookup(kind, name_arg):
+    """
+    Make cache rule of a get_*_id endpoint using find() extractor.
+
+    :param kind: Resource type, for example 'network'.
+    :param name_arg: Name of the call argument holding resource name.
+    :return: Cache rule object.
+
+    """
+    return _Lookup(kind, name_arg)
+
+
+def create(kind, name_arg, key=None):
+    """
+    Make cache rule of a create_* endpoint.
+
+    :param kind: Resource type, for example 'network'.
+    :param name_arg: Name of the call argument holding resource name.
+    :param key: (optional) Key of the resource in JSON result. Defaults result is the ID.
+    :return: Cache rule object.
+
+    """
+    return _Create(kind, name_arg, key)
+
+
+def delete(kind, id_arg):
+    """
+    Make cache rule of a delete_* endpoint.
+
+    :param kind: Resource type, for example 'network'.
+    :param id_arg: Name of the call argument holding resource ID.
+    :return: Cache rule object.
+
+    """
+    return _Delete(kind, id_arg)
@@ -4,35 +4,222 @@ network module.
  Functions related networks, routers, network connectors, vpn  etc are here.
 
 """
-import requests
-import json
 import logging
-import ipaddress
+from . import api
+from . import ipam
+from . import namecache
+from .models import FloatingIP, Network, Port, Router, SecurityGroup, Subnet, load_list
 
 log = logging.getLogger(__name__)
 
 
-def _rest_create_network_connector(project_token, project_id, region, connector_name):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
+def _network_connector_config(args):
+    return {'network_connector': {
+        'name': args['connector_name'],
+        'tenant_id': args['project_id']}
+    }
+
 
-    configData = {'network_connector': {
-        'name': connector_name,
-        'tenant_id': project_id}
+def _network_connector_endpoint_config(args):
+    return {"network_connector_endpoint": {
+        "name": args['endpoint_name'],
+        "network_connector_id": args['networkconnector_id'],
+        "endpoint_type": "availability_zone",
+        "location": args['az'],
+        "tenant_id": args['project_id']}
     }
 
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/network_connectors'
 
-    try:
-        request = requests.post(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
+def _port_config(args):
+    if args.get('securitygroup_id') is None:
+        securitygroup_id_list = None
     else:
-        return request
+        securitygroup_id_list = [args['securitygroup_id']]
+
+    if args.get('ip_address') is None:
+        fixed_ips_list = None
+    else:
+        fixed_ips_list = [{"ip_address": args['ip_address'],
+                           "subnet_id": args.get('subnet_id')}]
+
+    # Remove optional variables that are empty. This prevents 400 errors from api.
+    return {"port": api.without_none({
+        "network_id": args['network_id'],
+        "name": args.get('port_name', 'Port'),
+        "admin_state_up": True,
+        "availability_zone": args['az'],
+        "fixed_ips": fixed_ips_list,
+        "security_groups": securitygroup_id_list})
+    }
+
+
+def _floating_ip_config(args):
+    return {"floatingip": {
+        "floating_network_id": args['network_id'],
+        "port_id": args['port_id'],
+        "availability_zone": args['az']}
+    }
+
+
+def _network_config(args):
+    return {"network": {
+        "name": args['network_name'],
+        "admin_state_up": True,
+        "availability_zone": args['az']}
+    }
+
+
+def _subnet_config(args):
+    # Remove optional variables that are empty. This prevents 400 errors from api.
+    return {"subnet": api.without_none({
+        "name": args['subnet_name'],
+        "network_id": args['network_id'],
+        "ip_version": args['version'],
+        "cidr": args['cidr'],
+        "availability_zone": args['az'],
+        "enable_dhcp": args['enable_dhcp'],
+        "allocation_pools": args['allocation_pools'],
+        "dns_nameservers": args['dns_nameservers'],
+        "host_routes": args['host_routes'],
+        "gateway_ip": args['gateway_ip']})
+    }
+
+
+def _security_group_config(args):
+    return {'security_group': {
+        'name': args['name'],
+        'description': args['description']}
+    }
+
+
+def _security_group_rule_config(args):
+    # Remove optional variables that are empty. This prevents 400 errors from api.
+    return {'security_group_rule': api.without_none({
+        'direction': args['direction'],
+        'port_range_min': args['port_range_min'],
+        'ethertype': args['ethertype'],
+        'port_range_max': args['port_range_max'],
+        'protocol': args['protocol'],
+        'remote_group_id': args['remote_group_id'],
+        'security_group_id': args['security_group_id'],
+        'remote_ip_prefix': args['remote_ip_prefix']})
+    }
+
+
+def _router_config(args):
+    # Remove optional variables that are empty. This prevents 400 errors from api.
+    router = api.without_none({
+        'name': args.get('name'),
+        'availability_zone': args.get('az'),
+        'admin_state_up': args.get('admin_state_up'),
+        'routes': args.get('route_table')})
+
+    if args.get('network_id') is not None:
+        router['external_gateway_info'] = {'network_id': args['network_id']}
+
+    return {'router': router}
+
+
+def _router_interface_config(args):
+    # Delete Null values from config data this prevents 400 errosrs from api
+    return api.without_none({
+        'subnet_id': args['subnet_id'],
+        'port_id': args['port_id']
+    })
+
+
+ENDPOINTS = api.table(
+    api.Endpoint('create_network_connector', 'networking', 'POST', '/v2.0/network_connectors',
+                 body=_network_connector_config, extract=api.field('network_connector', 'id'),
+                 cache=namecache.create('network_connector', 'connector_name')),
+    api.Endpoint('create_network_connector_endpoint', 'networking', 'POST', '/v2.0/network_connector_endpoints',
+                 body=_network_connector_endpoint_config, extract=api.field('network_connector_endpoint', 'id'),
+                 cache=namecache.create('network_connector_endpoint', 'endpoint_name')),
+    api.Endpoint('list_network_connector_endpoints', 'networking', 'GET', '/v2.0/network_connector_endpoints'),
+    api.Endpoint('get_network_connector_endpoint_id', 'networking', 'GET', '/v2.0/network_connector_endpoints',
+                 query=api.name_filter('endpoint_name'),
+                 extract=api.find('network_connector_endpoints', 'endpoint_name'),
+                 cache=namecache.lookup('network_connector_endpoint', 'endpoint_name')),
+    api.Endpoint('get_network_connector_endpoint_info', 'networking', 'GET',
+                 '/v2.0/network_connector_endpoints/{network_connector_endpoint_id}'),
+    api.Endpoint('list_network_connector_endpoint_interfaces', 'networking', 'GET',
+                 '/v2.0/network_connector_endpoints/{network_connector_endpoint_id}/interfaces'),
+    api.Endpoint('connect_network_connector_endpoint', 'networking', 'PUT',
+                 '/v2.0/network_connector_endpoints/{endpoint_id}/connect',
+                 body=lambda args: {'interface': {'port_id': args['port_id']}}),
+    api.Endpoint('disconnect_network_connector_endpoint', 'networking', 'PUT',
+                 '/v2.0/network_connector_endpoints/{endpoint_id}/disconnect',
+                 body=lambda args: {'interface': {'port_id': args['port_id']}}),
+    api.Endpoint('delete_network_connector_endpoint', 'networking', 'DELETE',
+                 '/v2.0/network_connector_endpoints/{connector_endpoint_id}', extract=api.raw,
+                 cache=namecache.delete('network_connector_endpoint', 'connector_endpoint_id')),
+    api.Endpoint('list_network_connectors', 'networking', 'GET', '/v2.0/network_connectors'),
+    api.Endpoint('get_network_connector_id', 'networking', 'GET', '/v2.0/network_connectors',
+                 query=api.name_filter('connector_name'), extract=api.find('network_connectors', 'connector_name'),
+                 cache=namecache.lookup('network_connector', 'connector_name')),
+    api.Endpoint('delete_network_connector', 'networking', 'DELETE', '/v2.0/network_connectors/{connector_id}',
+                 extract=api.raw, cache=namecache.delete('network_connector', 'connector_id')),
+    api.Endpoint('create_inter_project_connection', 'networking-ex', 'PUT',
+                 '/v2.0/routers/{router_id}/add_cross_project_router_interface',
+                 body=lambda args: {'port_id': args['port_id']}, extract=api.field('id')),
+    api.Endpoint('delete_inter_project_connection', 'networking-ex', 'PUT',
+                 '/v2.0/routers/{router_id}/remove_cross_project_router_interface',
+                 body=lambda args: {'port_id': args['port_id']}, extract=api.field('id')),
+    api.Endpoint('update_inter_project_connection', 'networking-ex', 'PUT', '/v2.0/routers/{router_id}',
+                 body=lambda args: {'router': {'routes': args['routes']}}, extract=api.field('router', 'id')),
+    api.Endpoint('create_port_on_network', 'networking', 'POST', '/v2.0/ports', body=_port_config,
+                 extract=api.field('port', 'id'), cache=namecache.create('port', 'port_name')),
+    api.Endpoint('list_ports', 'networking', 'GET', '/v2.0/ports'),
+    api.Endpoint('get_port_id', 'networking', 'GET', '/v2.0/ports', query=api.name_filter('port_name'),
+                 extract=api.find('ports', 'port_name'), cache=namecache.lookup('port', 'port_name')),
+    api.Endpoint('delete_port', 'networking', 'DELETE', '/v2.0/ports/{port_id}', extract=api.raw,
+                 cache=namecache.delete('port', 'port_id')),
+    api.Endpoint('attach_floating_ip_to_port', 'networking', 'POST', '/v2.0/floatingips', body=_floating_ip_config,
+                 extract=api.raw),
+    api.Endpoint('list_floating_ips', 'networking', 'GET', '/v2.0/floatingips'),
+    api.Endpoint('delete_floating_ip', 'networking', 'DELETE', '/v2.0/floatingips/{floating_ip_id}', extract=api.raw),
+    api.Endpoint('create_network', 'networking', 'POST', '/v2.0/networks', body=_network_config,
+                 extract=api.field('network', 'id'), cache=namecache.create('network', 'network_name')),
+    api.Endpoint('delete_network', 'networking', 'DELETE', '/v2.0/networks/{network_id}', extract=api.raw,
+                 cache=namecache.delete('network', 'network_id')),
+    api.Endpoint('list_networks', 'networking', 'GET', '/v2.0/networks'),
+    api.Endpoint('get_network_id', 'networking', 'GET', '/v2.0/networks', query=api.name_filter('network_name'),
+                 extract=api.find('networks', 'network_name'), cache=namecache.lookup('network', 'network_name')),
+    api.Endpoint('create_subnet', 'networking', 'POST', '/v2.0/subnets', body=_subnet_config,
+                 extract=api.field('subnet', 'id'), cache=namecache.create('subnet', 'subnet_name')),
+    api.Endpoint('get_subnet_info', 'networking', 'GET', '/v2.0/subnets/{subnet_id}', extract=api.field('subnet')),
+    # Only fixed IPs of ports on one subnet
+    api.Endpoint('list_subnet_ports', 'networking', 'GET', '/v2.0/ports',
+                 query=lambda args: [('fixed_ips', 'subnet_id=' + args['subnet_id']), ('fields', 'fixed_ips')],
+                 extract=api.field('ports')),
+    api.Endpoint('delete_subnet', 'networking', 'DELETE', '/v2.0/subnets/{subnet_id}', extract=api.raw,
+                 cache=namecache.delete('subnet', 'subnet_id')),
+    api.Endpoint('list_subnets', 'networking', 'GET', '/v2.0/subnets'),
+    api.Endpoint('get_subnet_id', 'networking', 'GET', '/v2.0/subnets', query=api.name_filter('subnet_name'),
+                 extract=api.find('subnets', 'subnet_name'), cache=namecache.lookup('subnet', 'subnet_name')),
+    api.Endpoint('create_security_group', 'networking', 'POST', '/v2.0/security-groups', body=_security_group_config,
+                 extract=api.field('security_group', 'id'), cache=namecache.create('security_group', 'name')),
+    api.Endpoint('delete_security_group', 'networking', 'DELETE', '/v2.0/security-groups/{security_group_id}',
+                 extract=api.status_code, cache=namecache.delete('security_group', 'security_group_id')),
+    api.Endpoint('list_security_groups', 'networking', 'GET', '/v2.0/security-groups'),
+    api.Endpoint('get_security_group_id', 'networking', 'GET', '/v2.0/security-groups',
+                 query=api.name_filter('sg_name'), extract=api.find('security_groups', 'sg_name', missing='0'),
+                 cache=namecache.lookup('security_group', 'sg_name')),
+    api.Endpoint('create_security_group_rule', 'networking', 'POST', '/v2.0/security-group-rules',
+                 body=_security_group_rule_config, extract=api.field('security_group_rule', 'id')),
+    api.Endpoint('create_router', 'networking', 'POST', '/v2.0/routers', body=_router_config,
+                 extract=api.field('router', 'id'), cache=namecache.create('router', 'name')),
+    api.Endpoint('delete_router', 'networking', 'DELETE', '/v2.0/routers/{router_id}', extract=api.status_code,
+                 cache=namecache.delete('router', 'router_id')),
+    api.Endpoint('list_routers', 'networking', 'GET', '/v2.0/routers'),
+    api.Endpoint('get_router_id', 'networking', 'GET', '/v2.0/routers', query=api.name_filter('router_name'),
+                 extract=api.find('routers', 'router_name'), cache=namecache.lookup('router', 'router_name')),
+    api.Endpoint('update_router', 'networking', 'PUT', '/v2.0/routers/{router_id}', body=_router_config),
+    api.Endpoint('add_router_interface', 'networking', 'PUT', '/v2.0/routers/{router_id}/add_router_interface',
+                 body=_router_interface_config, extract=api.field('id')),
+    api.Endpoint('remove_router_interface', 'networking', 'PUT', '/v2.0/routers/{router_id}/remove_router_interface',
+                 body=_router_interface_config, extract=api.field('id')),
+)
 
 
 def create_network_connector(project_token, project_id, region, connector_name):
@@ -46,38 +233,8 @@ def create_network_connector(project_token, project_id, region, connector_name):
     :return: Network connector ID or error from requests library
 
     """
-    request = _rest_create_network_connector(project_token, project_id, region, connector_name)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()['network_connector']['id']
-
-
-def _rest_create_network_connector_endpoint(project_token, project_id, region, az, endpoint_name, networkconnector_id):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    configData = {"network_connector_endpoint": {
-        "name": endpoint_name,
-        "network_connector_id": networkconnector_id,
-        "endpoint_type": "availability_zone",
-        "location": az,
-        "tenant_id": project_id
-    }
-    }
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/network_connector_endpoints'
-
-    try:
-        request = requests.post(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['create_network_connector'], project_token, region, project_id=project_id,
+                    connector_name=connector_name)
 
 
 def create_network_connector_endpoint(project_token, project_id, region, az, endpoint_name, networkconnector_id):
@@ -94,30 +251,8 @@ def create_network_connector_endpoint(project_token, project_id, region, az, end
     :return: ID of connector if succesfull. Otherwise error code from requests library.
 
     """
-    request = _rest_create_network_connector_endpoint(project_token, project_id, region, az, endpoint_name,
-                                                      networkconnector_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()['network_connector_endpoint']['id']
-
-
-def _rest_list_network_connector_endpoints(project_token, region):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/network_connector_endpoints'
-
-    try:
-        request = requests.get(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['create_network_connector_endpoint'], project_token, region, project_id=project_id, az=az,
+                    endpoint_name=endpoint_name, networkconnector_id=networkconnector_id)
 
 
 def list_network_connector_endpoints(project_token, region):
@@ -130,12 +265,24 @@ def list_network_connector_endpoints(project_token, region):
     :return: JSON if succesfull. Otherwise error code from requests library.
 
     """
-    request = _rest_list_network_connector_endpoints(project_token, region)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        request = request.json()
-        return request
+    return api.call(ENDPOINTS['list_network_connector_endpoints'], project_token, region)
+
+
+def iter_network_connector_endpoints(project_token, region, page_size=api.DEFAULT_PAGE_SIZE, filters=None,
+                                     stream=False):
+    """
+    Iterate network connector endpoints page by page.
+
+    :param project_token: A valid K5 project token.
+    :param region: K5 region name.
+    :param page_size: (optional) Items per request, None for one request. Defaults 100.
+    :param filters: (optional) Dictionary of extra URL query parameters supported by the service.
+    :param stream: (optional) If True, responses are decoded incrementally. Defaults False.
+    :return: Generator of network connector endpoint dictionaries. If a request fails, error is yielded as the last item.
+
+    """
+    return api.iterate(ENDPOINTS['list_network_connector_endpoints'], project_token, region, 'network_connector_endpoints',
+                       page_size=page_size, filters=filters, stream=stream)
 
 
 def get_network_connector_endpoint_id(project_token, region, endpoint_name):
@@ -149,40 +296,7 @@ def get_network_connector_endpoint_id(project_token, region, endpoint_name):
     :return: ID if succesfull. Otherwise error from requests library.
 
     """
-    request = _rest_list_network_connector_endpoints(project_token, region)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        request = request.json()
-        # Get ID of our connector endpoint from info
-        outputList = []
-        outputDict = request['network_connector_endpoints']
-
-        counter = 0
-        for i in outputDict:
-            if str(i['name']) == endpoint_name:
-                outputList.append(str(i['id']))
-                counter += 1
-
-        return outputList[0]
-
-
-def _rest_get_network_connector_endpoint_info(project_token, region, network_connector_endpoint_id):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/network_connector_endpoints/' + network_connector_endpoint_id
-
-    try:
-        request = requests.get(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['get_network_connector_endpoint_id'], project_token, region, endpoint_name=endpoint_name)
 
 
 def get_network_connector_endpoint_info(project_token, region, network_connector_endpoint_id):
@@ -196,31 +310,8 @@ def get_network_connector_endpoint_info(project_token, region, network_connector
     :return: JSON if succesfull. Otherwise error code from requests library.
 
     """
-    request = _rest_get_network_connector_endpoint_info(project_token, region, network_connector_endpoint_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        request = request.json()
-        return request
-
-
-def _rest_list_network_connector_endpoint_interfaces(project_token, region, network_connector_endpoint_id):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/network_connector_endpoints/' \
-          + network_connector_endpoint_id + '/interfaces'
-
-    try:
-        request = requests.get(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error('Error: ' + str(e))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['get_network_connector_endpoint_info'], project_token, region,
+                    network_connector_endpoint_id=network_connector_endpoint_id)
 
 
 def list_network_connector_endpoint_interfaces(project_token, region, network_connector_endpoint_id):
@@ -234,31 +325,8 @@ def list_network_connector_endpoint_interfaces(project_token, region, network_co
     :return: JSON if succesfull. Otherwise error code from requests library.
 
     """
-    request = _rest_list_network_connector_endpoint_interfaces(project_token, region, network_connector_endpoint_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        request = request.json()
-        return request
-
-
-def _rest_create_inter_project_connection(project_token, region, router_id, port_id):
-    headers = {'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    configData = {"port_id": port_id}
-
-    url = 'https://networking-ex.' + region + '.cloud.global.fujitsu.com/v2.0/routers/' + router_id + '/add_cross_project_router_interface'
-
-    try:
-        request = requests.put(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error('Error: ' + str(e))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['list_network_connector_endpoint_interfaces'], project_token, region,
+                    network_connector_endpoint_id=network_connector_endpoint_id)
 
 
 def create_inter_project_connection(project_token, region, router_id, port_id):
@@ -273,30 +341,8 @@ def create_inter_project_connection(project_token, region, router_id, port_id):
     :return: ID of inter project connection if succesfull. Otherwise error code from requests library.
 
     """
-    request = _rest_create_inter_project_connection(project_token, region, router_id, port_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()['id']
-
-
-def _rest_delete_inter_project_connection(project_token, region, router_id, port_id):
-    headers = {'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    configData = {"port_id": port_id}
-
-    url = 'https://networking-ex.' + region + '.cloud.global.fujitsu.com/v2.0/routers/' + router_id + '/remove_cross_project_router_interface'
-
-    try:
-        request = requests.put(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['create_inter_project_connection'], project_token, region, router_id=router_id,
+                    port_id=port_id)
 
 
 def delete_inter_project_connection(project_token, region, router_id, port_id):
@@ -311,32 +357,8 @@ def delete_inter_project_connection(project_token, region, router_id, port_id):
     :return: ID of inter project connection if succesfull. Otherwise error code from requests library.
 
     """
-    request = _rest_delete_inter_project_connection(project_token, region, router_id, port_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()['id']
-
-
-def _rest_update_inter_project_connection(project_token, region, router_id, routes):
-    headers = {'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    configData = {"router": {
-        "routes": routes}
-    }
-
-    url = 'https://networking-ex.' + region + '.cloud.global.fujitsu.com/v2.0/routers/' + router_id
-
-    try:
-        request = requests.put(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['delete_inter_project_connection'], project_token, region, router_id=router_id,
+                    port_id=port_id)
 
 
 def update_inter_project_connection(project_token, region, router_id, routes):
@@ -353,81 +375,8 @@ def update_inter_project_connection(project_token, region, router_id, routes):
     :return: ID of connection if succesfull. Otherwise error from requests library.
 
     """
-    request = _rest_update_inter_project_connection(project_token, region, router_id, routes)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()['router']['id']
-
-
-def _rest_create_port_on_network(project_token, region, az, network_id, port_name, securitygroup_id, subnet_id, ip_address):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    if securitygroup_id is None:
-        securitygroup_id_list = None
-    else:
-        securitygroup_id_list = [securitygroup_id]
-
-    if ip_address is None:
-        fixed_ips_list = None
-    else: fixed_ips_list = [{"ip_address": ip_address,
-                             "subnet_id": subnet_id}]
-
-    configData = {"port": {
-        "network_id": network_id,
-        "name": port_name,
-        "admin_state_up": True,
-        "availability_zone": az,
-        "fixed_ips": fixed_ips_list,
-        "security_groups": securitygroup_id_list}
-    }
-
-    """
-    if ip_address is None:
-        configData = {"port": {
-            "network_id": network_id,
-            "name": port_name,
-            "admin_state_up": True,
-            "availability_zone": az,
-            "security_groups":
-                securitygroup_id_list}
-        }
-    else:
-        configData = {"port": {
-            "network_id": network_id,
-            "name": port_name,
-            "admin_state_up": True,
-            "availability_zone": az,
-            "fixed_ips": [{
-                "ip_address": ip_address,
-                "subnet_id": subnet_id}],
-            "security_groups":
-                securitygroup_id_list}
-        }
-    """
-
-    # Remove optional variables that are empty. This prevents 400 errors from api.
-    # loop trough copy of configdata and evaluate value, remove if None
-    for key in configData['port'].copy().keys():
-        log.info('Evaluate key: ' + key)
-        log.info('Evaluate value: ' + str(configData['port'][key]))
-        if configData['port'][key] is None:
-            log.info('Remove null value ' + str(configData['port'][key]))
-            del configData['port'][key]
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/ports'
-
-    try:
-        request = requests.post(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['update_inter_project_connection'], project_token, region, router_id=router_id,
+                    routes=routes)
 
 
 def create_port_on_network(project_token, region, az, network_id, port_name='Port', securitygroup_id=None, subnet_id=None,
@@ -447,47 +396,40 @@ def create_port_on_network(project_token, region, az, network_id, port_name='Por
     :return: ID of port if succesfull. Otherwise error code from requests library.
 
     """
-    request = _rest_create_port_on_network(project_token, region, az, network_id, port_name, securitygroup_id, subnet_id,
-                                           ip_address)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()['port'].get('id')
+    return api.call(ENDPOINTS['create_port_on_network'], project_token, region, az=az, network_id=network_id,
+                    port_name=port_name, securitygroup_id=securitygroup_id, subnet_id=subnet_id,
+                    ip_address=ip_address)
 
 
-def _rest_list_ports(project_token, region):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
+def list_ports(project_token, region, models=False):
+    """
+    List ports.
 
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/ports'
+    :param project_token: A valid K5 project token.
+    :param region: K5 region name.
+    :param models: (optional) If True, list of k5lib.models.Port objects is returned. Default False.
+    :return: JSON if succesfull. Otherwise error code from requests library.
 
-    try:
-        request = requests.get(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(str(e))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    """
+    ports = api.call(ENDPOINTS['list_ports'], project_token, region)
+    if models:
+        return load_list(Port, ports)
+    return ports
 
 
-def list_ports(project_token, region):
+def iter_ports(project_token, region, page_size=api.DEFAULT_PAGE_SIZE, filters=None, stream=False):
     """
-    List ports.
+    Iterate ports page by page.
 
     :param project_token: A valid K5 project token.
     :param region: K5 region name.
-    :return: JSON if succesfull. Otherwise error code from requests library.
+    :param page_size: (optional) Items per request, None for one request. Defaults 100.
+    :param filters: (optional) Dictionary of extra URL query parameters supported by the service.
+    :param stream: (optional) If True, responses are decoded incrementally. Defaults False.
+    :return: Generator of port dictionaries. If a request fails, error is yielded as the last item.
 
     """
-    request = _rest_list_ports(project_token, region)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        request = request.json()
-        return request
+    return api.iterate(ENDPOINTS['list_ports'], project_token, region, 'ports', page_size=page_size, filters=filters, stream=stream)
 
 
 def get_port_id(project_token, region, port_name):
@@ -502,44 +444,7 @@ def get_port_id(project_token, region, port_name):
     :return: ID if succesfull. Otherwise error code from requests library.
 
     """
-    request = _rest_list_ports(project_token, region)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        request = request.json()
-
-        # Get ID of our connector from info
-        outputList = []
-        outputDict = request['ports']
-
-        counter = 0
-        for i in outputDict:
-            if str(i['name']) == port_name:
-                outputList.append(str(i['id']))
-                counter += 1
-        if counter > 0:
-            return outputList[0]
-        else:
-            return 'Error: Not found'
-
-
-
-def _rest_delete_port(project_token, region, port_id):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/ports/' + port_id
-
-    try:
-        request = requests.delete(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(str(e))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['get_port_id'], project_token, region, port_name=port_name)
 
 
 def delete_port(project_token, region, port_id):
@@ -553,35 +458,7 @@ def delete_port(project_token, region, port_id):
     :return: Http 204 if succesfull. Otherwise error code from requests library.
 
     """
-    request = _rest_delete_port(project_token, region, port_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request
-
-def _rest_attach_floating_ip_to_port(project_token, region, az, network_id, port_id):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/floatingips'
-
-    configData = {"floatingip": {
-            "floating_network_id": network_id,
-            "port_id": port_id,
-            "availability_zone": az
-        },
-    }
-
-    try:
-        request = requests.post(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(str(e))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['delete_port'], project_token, region, port_id=port_id)
 
 
 def attach_floating_ip_to_port(project_token, region, az, network_id, port_id):
@@ -596,30 +473,8 @@ def attach_floating_ip_to_port(project_token, region, az, network_id, port_id):
 
     :return: JSON if succesfull. Otherwise error code from requests library.
     """
-    request = _rest_attach_floating_ip_to_port(project_token, region, az, network_id, port_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request
-
-
-
-def _rest_list_network_connectors(project_token, region):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/network_connectors'
-
-    try:
-        request = requests.get(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(str(e))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['attach_floating_ip_to_port'], project_token, region, az=az, network_id=network_id,
+                    port_id=port_id)
 
 
 def list_network_connectors(project_token, region):
@@ -631,12 +486,23 @@ def list_network_connectors(project_token, region):
     :return: JSON that contains network connectors if succesfull. Otherwise error from requests library.
 
     """
-    request = _rest_list_network_connectors(project_token, region)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        request = request.json()
-        return request
+    return api.call(ENDPOINTS['list_network_connectors'], project_token, region)
+
+
+def iter_network_connectors(project_token, region, page_size=api.DEFAULT_PAGE_SIZE, filters=None, stream=False):
+    """
+    Iterate network connectors page by page.
+
+    :param project_token: A valid K5 project token.
+    :param region: K5 region name.
+    :param page_size: (optional) Items per request, None for one request. Defaults 100.
+    :param filters: (optional) Dictionary of extra URL query parameters supported by the service.
+    :param stream: (optional) If True, responses are decoded incrementally. Defaults False.
+    :return: Generator of network connector dictionaries. If a request fails, error is yielded as the last item.
+
+    """
+    return api.iterate(ENDPOINTS['list_network_connectors'], project_token, region, 'network_connectors',
+                       page_size=page_size, filters=filters, stream=stream)
 
 
 def get_network_connector_id(project_token, region, connector_name):
@@ -649,43 +515,7 @@ def get_network_connector_id(project_token, region, connector_name):
     :return: ID of the connector if succesfull. Otherwise error from requests library
 
     """
-    request = _rest_list_network_connectors(project_token, region)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        request = request.json()
-
-        # Get ID of our connector from info
-        outputList = []
-        outputDict = request['network_connectors']
-
-        counter = 0
-        for i in outputDict:
-            if str(i['name']) == connector_name:
-                outputList.append(str(i['id']))
-                counter += 1
-        if counter > 0:
-            return outputList[0]
-        else:
-            return 'Error: Not found'
-
-
-def _rest_delete_network_connector(project_token, region, networkConnector_id):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/network_connectors' + '/' + networkConnector_id
-
-    try:
-        request = requests.delete(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(str(e))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['get_network_connector_id'], project_token, region, connector_name=connector_name)
 
 
 def delete_network_connector(project_token, region, networkConnector_id):
@@ -698,34 +528,7 @@ def delete_network_connector(project_token, region, networkConnector_id):
     :return:  Http 204 if succesfull. Otherwise error code from requests library.
 
     """
-    request = _rest_delete_network_connector(project_token, region, networkConnector_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request
-
-
-def _rest_connect_network_connector_endpoint(project_token, region, endpoint_id, port_id):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    configData = {"interface": {
-        "port_id": port_id}
-    }
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/network_connector_endpoints/' + endpoint_id + '/connect'
-
-    try:
-        request = requests.put(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        log.error(json.dumps(request.json(), indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['delete_network_connector'], project_token, region, connector_id=networkConnector_id)
 
 
 def connect_network_connector_endpoint(project_token, region, endpoint_id, port_id):
@@ -739,35 +542,8 @@ def connect_network_connector_endpoint(project_token, region, endpoint_id, port_
     :return: JSON if succesfull operation. Otherwise error code from requests library.
 
     """
-    request = _rest_connect_network_connector_endpoint(project_token, region, endpoint_id, port_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        request = request.json()
-        return request
-
-
-def _rest_disconnect_network_connector_endpoint(project_token, region, endpoint_id, port_id):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    configData = {"interface": {
-        "port_id": port_id}
-    }
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/network_connector_endpoints/' + endpoint_id + '/disconnect'
-
-    try:
-        request = requests.put(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        log.error(json.dumps(request.json(), indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['connect_network_connector_endpoint'], project_token, region, endpoint_id=endpoint_id,
+                    port_id=port_id)
 
 
 def disconnect_network_connector_endpoint(project_token, region, endpoint_id, port_id):
@@ -782,30 +558,8 @@ def disconnect_network_connector_endpoint(project_token, region, endpoint_id, po
     :return: JSON if succesfull operation. Otherwise error code from requests library.
 
     """
-    request = _rest_disconnect_network_connector_endpoint(project_token, region, endpoint_id, port_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        request = request.json()
-        return request
-
-
-def _rest_delete_network_connector_endpoint(project_token, region, connector_endpoint_id):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/network_connector_endpoints' + '/' + connector_endpoint_id
-
-    try:
-        request = requests.delete(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(str(e))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['disconnect_network_connector_endpoint'], project_token, region, endpoint_id=endpoint_id,
+                    port_id=port_id)
 
 
 def delete_network_connector_endpoint(project_token, region, connector_endpoint_id):
@@ -819,35 +573,8 @@ def delete_network_connector_endpoint(project_token, region, connector_endpoint_
     :return: Http result code 204 succesfull operation. Otherwise error code from requests library.
 
     """
-    request = _rest_delete_network_connector_endpoint(project_token, region, connector_endpoint_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request
-
-
-def _rest_create_network(project_token, region, az, network_name):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    configData = {"network": {
-                  "name": network_name,
-                  "admin_state_up": True,
-                  "availability_zone": az}
-                  }
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/networks'
-
-    try:
-        request = requests.post(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['delete_network_connector_endpoint'], project_token, region,
+                    connector_endpoint_id=connector_endpoint_id)
 
 
 def create_network(project_token, region, az, network_name):
@@ -862,47 +589,7 @@ def create_network(project_token, region, az, network_name):
     :return: ID of network if suucesfull, otherwise error from requests lib
 
     """
-    request = _rest_create_network(project_token, region, az, network_name)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()['network']['id']
-
-
-def _rest_list_networks(project_token, region):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/networks'
-
-    try:
-        request = requests.get(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(str(e))
-        return 'Error: ' + str(e)
-    else:
-        return request
-
-
-def _rest_delete_network(project_token, region, network_id):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/networks/' + network_id
-
-    try:
-        request = requests.delete(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error('Error: ' + str(e))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['create_network'], project_token, region, az=az, network_name=network_name)
 
 
 def delete_network(project_token, region, network_id):
@@ -915,27 +602,39 @@ def delete_network(project_token, region, network_id):
     :return: Http returncode 204 if succesful. otherwise error code from requests library.
 
     """
-    request = _rest_delete_network(project_token, region, network_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request
+    return api.call(ENDPOINTS['delete_network'], project_token, region, network_id=network_id)
 
 
-def list_networks(project_token, region):
+def list_networks(project_token, region, models=False):
     """
     List networks visible for project in region.
 
     :param project_token: A valid K5 project token
     :param region: K5 region name.
+    :param models: (optional) If True, list of k5lib.models.Network objects is returned. Default False.
 
     :return: JSON that contains networks if succesfull. Otherwise error from requests library.
     """
-    request = _rest_list_networks(project_token, region)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
+    networks = api.call(ENDPOINTS['list_networks'], project_token, region)
+    if models:
+        return load_list(Network, networks)
+    return networks
+
+
+def iter_networks(project_token, region, page_size=api.DEFAULT_PAGE_SIZE, filters=None, stream=False):
+    """
+    Iterate networks page by page.
+
+    :param project_token: A valid K5 project token.
+    :param region: K5 region name.
+    :param page_size: (optional) Items per request, None for one request. Defaults 100.
+    :param filters: (optional) Dictionary of extra URL query parameters supported by the service.
+    :param stream: (optional) If True, responses are decoded incrementally. Defaults False.
+    :return: Generator of network dictionaries. If a request fails, error is yielded as the last item.
+
+    """
+    return api.iterate(ENDPOINTS['list_networks'], project_token, region, 'networks',
+                       page_size=page_size, filters=filters, stream=stream)
 
 
 def get_network_id(project_token, region, network_name):
@@ -949,63 +648,7 @@ def get_network_id(project_token, region, network_name):
     :return: ID of the connector if successful. Otherwise error from requests library
 
     """
-    request = _rest_list_networks(project_token, region)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        request = request.json()
-
-        # Get ID of our connector from info
-        outputList = []
-        outputDict = request['networks']
-
-        counter = 0
-        for i in outputDict:
-            if str(i['name']) == network_name:
-                outputList.append(str(i['id']))
-                counter += 1
-        if counter > 0:
-            return outputList[0]
-        else:
-            return 'Error: Not found'
-
-def _rest_create_subnet(project_token, region,  network_id, cidr, subnet_name, version, az,
-                        enable_dhcp, allocation_pools, dns_nameservers, host_routes, gateway_ip):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    configData = {"subnet": {
-                  "name": subnet_name,
-                  "network_id": network_id,
-                  "ip_version": version,
-                  "cidr": cidr,
-                  "availability_zone": az,
-                  "enable_dhcp": enable_dhcp,
-                  "allocation_pools": allocation_pools,
-                  "dns_nameservers": dns_nameservers,
-                  "host_routes": host_routes,
-                  "gateway_ip": gateway_ip}
-                  }
-
-    # Remove optional variables that are empty. This prevents 400 errors from api.
-    # loop trough copy of configdata and evaluate value, remove if None
-    for key in configData['subnet'].copy().keys():
-        if configData['subnet'][key] is None:
-            log.info('Remove null value ' + str(configData['subnet'][key]))
-            del configData['subnet'][key]
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/subnets'
-
-    try:
-        request = requests.post(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['get_network_id'], project_token, region, network_name=network_name)
 
 
 def create_subnet(project_token, region, network_id, cidr, subnet_name='subnet', version='4', az=None,
@@ -1042,30 +685,10 @@ def create_subnet(project_token, region, network_id, cidr, subnet_name='subnet',
     :return: Subnet ID if successful, otherwise error from request library
 
     """
-    request = _rest_create_subnet(project_token, region,  network_id, cidr, subnet_name, version, az,
-                                  enable_dhcp, allocation_pools, dns_nameservers, host_routes, gateway_ip)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()['subnet']['id']
-
-
-def _rest_delete_subnet(project_token, region, subnet_id):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/subnets/' + subnet_id
-
-    try:
-        request = requests.delete(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error('Error: ' + str(e))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['create_subnet'], project_token, region, network_id=network_id, cidr=cidr,
+                    subnet_name=subnet_name, version=version, az=az, enable_dhcp=enable_dhcp,
+                    allocation_pools=allocation_pools, dns_nameservers=dns_nameservers, host_routes=host_routes,
+                    gateway_ip=gateway_ip)
 
 
 def delete_subnet(project_token, region, subnet_id):
@@ -1078,45 +701,39 @@ def delete_subnet(project_token, region, subnet_id):
     :return: Http returncode 204 if succesful. otherwise error code from requests library.
 
     """
-    request = _rest_delete_subnet(project_token, region, subnet_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request
+    return api.call(ENDPOINTS['delete_subnet'], project_token, region, subnet_id=subnet_id)
 
 
-def _rest_list_subnets(project_token, region):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
+def list_subnets(project_token, region, models=False):
+    """
+    List subnets visible for project in region.
 
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/subnets'
+    :param project_token: A valid K5 project token
+    :param region: K5 region name.
+    :param models: (optional) If True, list of k5lib.models.Subnet objects is returned. Default False.
+    :return: JSON that contains subnets if succesfull. Otherwise error from requests library.
 
-    try:
-        request = requests.get(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(str(e))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    """
+    subnets = api.call(ENDPOINTS['list_subnets'], project_token, region)
+    if models:
+        return load_list(Subnet, subnets)
+    return subnets
 
 
-def list_subnets(project_token, region):
+def iter_subnets(project_token, region, page_size=api.DEFAULT_PAGE_SIZE, filters=None, stream=False):
     """
-    List subnets visible for project in region.
+    Iterate subnets page by page.
 
-    :param project_token: A valid K5 project token
+    :param project_token: A valid K5 project token.
     :param region: K5 region name.
-    :return: JSON that contains subnets if succesfull. Otherwise error from requests library.
+    :param page_size: (optional) Items per request, None for one request. Defaults 100.
+    :param filters: (optional) Dictionary of extra URL query parameters supported by the service.
+    :param stream: (optional) If True, responses are decoded incrementally. Defaults False.
+    :return: Generator of subnet dictionaries. If a request fails, error is yielded as the last item.
 
     """
-    request = _rest_list_subnets(project_token, region)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
+    return api.iterate(ENDPOINTS['list_subnets'], project_token, region, 'subnets',
+                       page_size=page_size, filters=filters, stream=stream)
 
 
 def get_subnet_id(project_token, region, subnet_name):
@@ -1130,108 +747,163 @@ def get_subnet_id(project_token, region, subnet_name):
         :return: ID of subnet if succesfull. Otherwise Error: Not Found string.
 
         """
-    request = _rest_list_subnets(project_token, region)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        request = request.json()
+    return api.call(ENDPOINTS['get_subnet_id'], project_token, region, subnet_name=subnet_name)
+
+
+def get_subnet_info(project_token, region, subnet_id):
+    """
+    Get subnet info.
+
+    :param project_token: A valid K5 project token.
+    :param region: K5 region name.
+    :param subnet_id: ID of the subnet.
+
+    :return: Subnet JSON if succesfull. Otherwise error code from requests library.
+
+    """
+    return api.call(ENDPOINTS['get_subnet_info'], project_token, region, subnet_id=subnet_id)
+
 
-        # Get ID of our subnet from info
-        outputList = []
-        outputDict = request['subnets']
+def _subnet_allocator(project_token, region, subnet_id, exclude_pools, exclude):
+    subnet = get_subnet_info(project_token, region, subnet_id)
+    if isinstance(subnet, str):
+        return subnet
+    ports = api.call(ENDPOINTS['list_subnet_ports'], project_token, region, subnet_id=subnet_id)
+    if isinstance(ports, str):
+        return ports
 
-        counter = 0
-        for i in outputDict:
-            if str(i['name']) == subnet_name:
-                outputList.append(str(i['id']))
-                counter += 1
-        if counter > 0:
-            return outputList[0]
-        else:
-            return 'Error: Not found'
+    # Port filter may be ignored by the service, check subnet of every address
+    used = [fixed_ip['ip_address'] for port in ports for fixed_ip in port.get('fixed_ips', [])
+            if fixed_ip['subnet_id'] == subnet_id]
+    allocator = ipam.IPAllocator(subnet['cidr'], used, exclude or ())
+    if subnet.get('gateway_ip'):
+        allocator.mark(subnet['gateway_ip'])
+    if exclude_pools:
+        for pool in subnet.get('allocation_pools', []):
+            allocator.exclude(pool['start'], pool['end'])
+    return subnet, allocator
 
 
-def find_first_free_ip(project_token, region, subnet_id=None, subnet_name=None, offset=None):
+def get_ip_allocator(project_token, region, subnet_id, exclude_pools=False, exclude=None):
+    """
+    Build free address bookkeeping of a subnet.
+
+    Only the subnet and ports with an address on it are fetched. Gateway address is never free.
+
+    :param project_token: A valid K5 project token.
+    :param region: K5 region name.
+    :param subnet_id: ID of the subnet.
+    :param exclude_pools: (optional) If True, addresses of allocation pools are not free either,
+                          so they stay for automatic assignment. Defaults False.
+    :param exclude: (optional) List of addresses or (first, last) ranges which are not free.
+
+    :return: k5lib.ipam.IPAllocator object if succesfull. Otherwise error code from requests library.
+
+    """
+    result = _subnet_allocator(project_token, region, subnet_id, exclude_pools, exclude)
+    if isinstance(result, str):
+        return result
+    return result[1]
+
+
+def reserve_free_ips(project_token, region, subnet_id, count, offset=None, exclude_pools=False, exclude=None,
+                     port_name=None, securitygroup_id=None):
+    """
+    Find several free addresses at once, optionally reserving them with ports.
+
+    Each subnet and its ports are listed once, however many addresses are needed. Without
+    port_name other callers may still take the returned addresses. With port_name a port is
+    created for every address, and an address taken meanwhile by somebody else is replaced
+    with the next free one.
+
+    :param project_token: A valid K5 project token.
+    :param region: K5 region name.
+    :param subnet_id: ID of the subnet, or list of subnet IDs used in order.
+    :param count: Number of addresses.
+    :param offset: (optional) Addresses up to network address + offset are skipped. Default 0.
+    :param exclude_pools: (optional) If True, addresses of allocation pools are skipped. Default False.
+    :param exclude: (optional) List of addresses or (first, last) ranges to skip.
+    :param port_name: (optional) Name of reserving ports. Defaults no ports are created.
+    :param securitygroup_id: (optional) Security group ID of reserving ports.
+
+    :return: List of ipaddress objects, or list of (ipaddress, port ID) tuples if ports were created.
+             Otherwise error. Ports created before an error are deleted.
+
+    """
+    if isinstance(subnet_id, str):
+        subnet_ids = [subnet_id]
+    else:
+        subnet_ids = list(subnet_id)
+
+    reserved = []
+    for current_id in subnet_ids:
+        if len(reserved) >= count:
+            break
+        result = _subnet_allocator(project_token, region, current_id, exclude_pools, exclude)
+        if isinstance(result, str):
+            _release_ports(project_token, region, reserved)
+            return result
+        subnet, allocator = result
+
+        while len(reserved) < count:
+            address = allocator.allocate(offset)
+            if address is None:
+                break
+            if port_name is None:
+                reserved.append(address)
+                continue
+            port_id = create_port_on_network(project_token, region, subnet.get('availability_zone'),
+                                             subnet['network_id'], port_name, securitygroup_id, current_id,
+                                             str(address))
+            if 'Error: 409' in str(port_id):
+                # Address was taken after ports were listed, try next one
+                continue
+            if 'Error' in str(port_id):
+                _release_ports(project_token, region, reserved)
+                return port_id
+            reserved.append((address, port_id))
+
+    if len(reserved) < count:
+        _release_ports(project_token, region, reserved)
+        return 'Error: Only ' + str(len(reserved)) + ' free addresses available'
+    return reserved
+
+
+def _release_ports(project_token, region, reserved):
+    for item in reserved:
+        if isinstance(item, tuple):
+            delete_port(project_token, region, item[1])
+
+
+def find_first_free_ip(project_token, region, subnet_id=None, subnet_name=None, offset=None, exclude_pools=False,
+                       exclude=None):
     """
 
     :param project_token: Valid K5 project token.
     :param subnet_id: ID of the subnet. (optional)
     :param subnet_name: Name of the subnet.(optional)
     :param offset: Starting point from start of network adresses. Default 0.
+    :param exclude_pools: (optional) If True, addresses of allocation pools are skipped. Default False.
+    :param exclude: (optional) List of addresses or (first, last) ranges to skip.
 
     :return: ipaddress object if succesfull. Otherwise Error
 
     ..Note::
         You need to provide either subnet_id or subnet_name parameter
     """
-
-    ip_list = []
-
-    # Verify offset
-    if not offset:
-        offset = 0
-
-    #print('Offset: ', offset)
-
     # Verify we have proper subnet info available
     if subnet_name:
         subnet_id = get_subnet_id(project_token, region, subnet_name)
-        # print('subnet_id: ', subnet_id)
+        if 'Error' in str(subnet_id):
+            return subnet_id
 
     if not subnet_id:
-        # print('Error: no  subnet ID available')
         return 'Error: no subnet ID available'
 
-    # Loop trough subnets and find our subnet
-    subnet_list = list_subnets(project_token, region)
-
-    dict_subnets = subnet_list['subnets']
-    for i in dict_subnets:
-        if i['id'] in subnet_id:
-            cidr = i['cidr']
-            #print('cidr: ', cidr)
-            network = ipaddress.IPv4Network(cidr)
-
-            # Loop ports and collect subnet IP adresses
-            port_list = list_ports(project_token, region)
-            dict_ports = port_list['ports']
-            for j in dict_ports:
-                for k in j.get('fixed_ips'):
-                    if k['subnet_id'] in subnet_id:
-                        ip_list.append(ipaddress.IPv4Address(k['ip_address']))
-                        # print('Reserved IP: ', ipaddress.IPv4Address(k['ip_address']))
-
-            # Loop network adresses and check if address is on subnet ip list
-            # return first free IP
-            for l in network.hosts():
-                if ipaddress.IPv4Address(l) > network.network_address + offset:
-                    if ipaddress.IPv4Address(l) not in ip_list:
-                        # print('free IP: ',l)
-                        return ipaddress.IPv4Address(l)
-
-
-def _rest_create_security_group(project_token, region, name, description):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    configData = {'security_group': {
-                     'name': name,
-                     'description': description
-                      }
-                  }
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/security-groups'
-
-    try:
-        request = requests.post(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    allocator = get_ip_allocator(project_token, region, subnet_id, exclude_pools, exclude)
+    if 'Error' in str(allocator):
+        return allocator
+    return allocator.first_free(offset)
 
 
 def create_security_group(project_token, region, name, description):
@@ -1245,29 +917,12 @@ def create_security_group(project_token, region, name, description):
     :return: Security group ID if succesfull, otherwise error from request library.
 
     """
-    request = _rest_create_security_group(project_token, region, name, description)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()['security_group']['id']
+    return api.call(ENDPOINTS['create_security_group'], project_token, region, name=name, description=description)
 
 
 def _rest_delete_security_group(project_token, region, security_group_id):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/security-groups/' + security_group_id
-
-    try:
-        request = requests.delete(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error('Error: ' + str(e))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.request(ENDPOINTS['delete_security_group'], project_token, region,
+                       {'security_group_id': security_group_id})
 
 
 def delete_security_group(project_token, region, security_group_id):
@@ -1281,47 +936,39 @@ def delete_security_group(project_token, region, security_group_id):
     :return: Security group ID if succesfull, otherwise error from request library.
 
     """
-    request = _rest_delete_security_group(project_token, region, security_group_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.status_code
-
-
-def _rest_list_security_groups(project_token, region):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/security-groups'
-
-    try:
-        request = requests.get(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['delete_security_group'], project_token, region, security_group_id=security_group_id)
 
 
-def list_security_groups(project_token, region):
+def list_security_groups(project_token, region, models=False):
     """
     List security groups visible to project
 
     :param project_token:
     :param region:
+    :param models: (optional) If True, list of k5lib.models.SecurityGroup objects is returned. Default False.
 
     :return: JSON if succesfull, otherwise error from request library.
     """
+    security_groups = api.call(ENDPOINTS['list_security_groups'], project_token, region)
+    if models:
+        return load_list(SecurityGroup, security_groups)
+    return security_groups
 
-    request = _rest_list_security_groups(project_token, region)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
+
+def iter_security_groups(project_token, region, page_size=api.DEFAULT_PAGE_SIZE, filters=None, stream=False):
+    """
+    Iterate security groups page by page.
+
+    :param project_token: A valid K5 project token.
+    :param region: K5 region name.
+    :param page_size: (optional) Items per request, None for one request. Defaults 100.
+    :param filters: (optional) Dictionary of extra URL query parameters supported by the service.
+    :param stream: (optional) If True, responses are decoded incrementally. Defaults False.
+    :return: Generator of security group dictionaries. If a request fails, error is yielded as the last item.
+
+    """
+    return api.iterate(ENDPOINTS['list_security_groups'], project_token, region, 'security_groups',
+                       page_size=page_size, filters=filters, stream=stream)
 
 
 def get_security_group_id(project_token, region, sg_name):
@@ -1334,63 +981,7 @@ def get_security_group_id(project_token, region, sg_name):
     :return: ID of security group if succesfull. Otherwise error code from requests library.
 
     """
-    request = _rest_list_security_groups(project_token, region)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        request = request.json()
-
-        # Get ID of our connector from info
-        outputList = []
-        outputDict = request['security_groups']
-
-        counter = 0
-        for i in outputDict:
-            if str(i['name']) == sg_name:
-                outputList.append(str(i['id']))
-                counter += 1
-        if counter != 0:
-          return outputList[0]
-        else:
-            return '0'
-
-def _rest_create_security_group_rule(project_token, region, security_group_id, direction, ethertype, protocol,
-                                     port_range_min, port_range_max, remote_ip_prefix, remote_group_id):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    configData = {'security_group_rule': {
-                     'direction': direction,
-                     'port_range_min': port_range_min,
-                     'ethertype': ethertype,
-                     'port_range_max': port_range_max,
-                     'protocol': protocol,
-                     'remote_group_id': remote_group_id,
-                     'security_group_id': security_group_id,
-                     'remote_ip_prefix': remote_ip_prefix
-    }
-    }
-
-    # Remove optional variables that are empty. This prevents 400 errors from api.
-    # loop trough copy of configdata and evaluate value, remove if None
-    for key in configData['security_group_rule'].copy().keys():
-        if configData['security_group_rule'][key] is None:
-            log.info('Remove null value ' + str(configData['security_group_rule'][key]))
-            del configData['security_group_rule'][key]
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/security-group-rules'
-
-    try:
-        request = requests.post(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
-
+    return api.call(ENDPOINTS['get_security_group_id'], project_token, region, sg_name=sg_name)
 
 
 def create_security_group_rule(project_token, region, security_group_id, direction, ethertype='IPv4', protocol=None,
@@ -1429,44 +1020,10 @@ def create_security_group_rule(project_token, region, security_group_id, directi
     :return: Security group ID if succesfull, otherwise error from request library.
 
     """
-    request = _rest_create_security_group_rule(project_token, region, security_group_id, direction, ethertype, protocol,
-                                               port_range_min, port_range_max,  remote_ip_prefix, remote_group_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()['security_group_rule']['id']
-
-
-def _rest_create_router(project_token, region, name, az, admin_state_up):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    configData = {'router': {
-                     'name': name,
-                     'availability_zone': az,
-                     'admin_state_up': admin_state_up
-                      }
-                  }
-
-    # Remove optional variables that are empty. This prevents 400 errors from api.
-    # loop trough copy of configdata and evaluate value, remove if None
-    for key in configData['router'].copy().keys():
-        if configData['router'][key] is None:
-            log.info('Remove null value ' + str(configData['router'][key]))
-            del configData['router'][key]
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/routers'
-
-    try:
-        request = requests.post(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['create_security_group_rule'], project_token, region,
+                    security_group_id=security_group_id, direction=direction, ethertype=ethertype, protocol=protocol,
+                    port_range_min=port_range_min, port_range_max=port_range_max, remote_ip_prefix=remote_ip_prefix,
+                    remote_group_id=remote_group_id)
 
 
 def create_router(project_token, region, name=None, az=None, admin_state_up=None):
@@ -1482,30 +1039,7 @@ def create_router(project_token, region, name=None, az=None, admin_state_up=None
     :return: Router ID if succesfull, otherwise error from request library.
 
     """
-    request = _rest_create_router(project_token, region, name, az, admin_state_up)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()['router']['id']
-
-
-def _rest_delete_router(project_token, region, router_id):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/routers/' + router_id
-
-    try:
-        request = requests.delete(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error('Error: ' + str(e))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['create_router'], project_token, region, name=name, az=az, admin_state_up=admin_state_up)
 
 
 def delete_router(project_token, region, router_id):
@@ -1519,48 +1053,40 @@ def delete_router(project_token, region, router_id):
     :return: HTTP 204 if succesfull, otherwise HTTP error.
 
     """
-    request = _rest_delete_router(project_token, region, router_id)
-    if 'Error' in str(request):
-        return 'Error: ' + str(request)
-    else:
-        return request.status_code
-
+    return api.call(ENDPOINTS['delete_router'], project_token, region, router_id=router_id)
 
 
-def _rest_list_routers(project_token, region):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/routers'
-
-    try:
-        request = requests.get(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
-
-
-def list_routers(project_token, region):
+def list_routers(project_token, region, models=False):
     """
     List routers in project.
 
     :param project_token: Valid K5 project token
     :param region: K5 Region eg 'fi-1'
+    :param models: (optional) If True, list of k5lib.models.Router objects is returned. Default False.
 
     :return:JSON if succesfull, otherwise error from request library.
 
     """
+    routers = api.call(ENDPOINTS['list_routers'], project_token, region)
+    if models:
+        return load_list(Router, routers)
+    return routers
 
-    request = _rest_list_routers(project_token, region)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
+
+def iter_routers(project_token, region, page_size=api.DEFAULT_PAGE_SIZE, filters=None, stream=False):
+    """
+    Iterate routers page by page.
+
+    :param project_token: A valid K5 project token.
+    :param region: K5 region name.
+    :param page_size: (optional) Items per request, None for one request. Defaults 100.
+    :param filters: (optional) Dictionary of extra URL query parameters supported by the service.
+    :param stream: (optional) If True, responses are decoded incrementally. Defaults False.
+    :return: Generator of router dictionaries. If a request fails, error is yielded as the last item.
+
+    """
+    return api.iterate(ENDPOINTS['list_routers'], project_token, region, 'routers',
+                       page_size=page_size, filters=filters, stream=stream)
 
 
 def get_router_id(project_token, region, router_name):
@@ -1573,62 +1099,7 @@ def get_router_id(project_token, region, router_name):
 
     :return: Router ID if succesfull, otherwise error.
     """
-
-    request = _rest_list_routers(project_token, region)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        request = request.json()
-        # Get ID of our router from info
-        outputList = []
-        outputDict = request['routers']
-
-        counter = 0
-        for i in outputDict:
-            if str(i['name']) == router_name:
-                outputList.append(str(i['id']))
-                counter += 1
-        if counter > 0:
-            return outputList[0]
-        else:
-            return 'Error: Not found'
-
-def _rest_update_router(project_token, region, router_id, name, az, admin_state_up, network_id, route_table):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    configData = {'router': {
-                     'name': name,
-                     'availability_zone': az,
-                     'admin_state_up': admin_state_up,
-                     'external_gateway_info': {
-                         'network_id': network_id
-                      },
-                     'routes': route_table
-                      }
-                  }
-    # Remove optional variables that are empty. This prevents 400 errors from api.
-    if configData['router']['external_gateway_info']['network_id']is None:
-        del configData['router']['external_gateway_info']['network_id']
-        del configData['router']['external_gateway_info']
-
-    for key in configData['router'].copy().keys():
-        if configData['router'][key] is None:
-            log.info('Remove null value' + str(configData['router'][key]))
-            del configData['router'][key]
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/routers/' + router_id
-
-    try:
-        request = requests.put(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['get_router_id'], project_token, region, router_name=router_name)
 
 
 def update_router(project_token, region, router_id, name=None, az=None, admin_state_up=None, network_id=None, route_table=None):
@@ -1648,41 +1119,9 @@ def update_router(project_token, region, router_id, name=None, az=None, admin_st
     :return: JSON if succesfull otherwise error from reguests library.
 
     """
-    request = _rest_update_router(project_token, region, router_id, name, az, admin_state_up, network_id, route_table)
-
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
-
-
-def _rest_add_router_interface(project_token, region, router_id, subnet_id, port_id):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    configData = {
-        'subnet_id': subnet_id,
-        'port_id': port_id
-    }
+    return api.call(ENDPOINTS['update_router'], project_token, region, router_id=router_id, name=name, az=az,
+                    admin_state_up=admin_state_up, network_id=network_id, route_table=route_table)
 
-    # Delete Null values from config data this prevents 400 errosrs from api
-    if configData['subnet_id'] is None:
-            del configData['subnet_id']
-    if configData['port_id'] is None:
-            del configData['port_id']
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/routers/' + router_id + '/add_router_interface'
-
-    try:
-        request = requests.put(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
 
 def add_router_interface(project_token, region, router_id, subnet_id=None, port_id=None):
     """
@@ -1699,43 +1138,10 @@ def add_router_interface(project_token, region, router_id, subnet_id=None, port_
 
     Submit only subnet_id OR port_id. If both are declared result is an error.
     """
-
-    request = _rest_add_router_interface(project_token, region, router_id, subnet_id, port_id )
-
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()['id']
+    return api.call(ENDPOINTS['add_router_interface'], project_token, region, router_id=router_id,
+                    subnet_id=subnet_id, port_id=port_id)
 
 
-def _rest_remove_router_interface(project_token, region, router_id, subnet_id, port_id):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    configData = {
-        'subnet_id': subnet_id,
-        'port_id': port_id
-    }
-
-    # Delete Null values from config data this prevents 400 errosrs from api
-    if configData['subnet_id'] is None:
-            del configData['subnet_id']
-    if configData['port_id'] is None:
-            del configData['port_id']
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/routers/' + router_id + '/remove_router_interface'
-
-    try:
-        request = requests.put(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
-
 def remove_router_interface(project_token, region, router_id, subnet_id=None, port_id=None):
     """
     Remove an interface from router.
@@ -1750,37 +1156,50 @@ def remove_router_interface(project_token, region, router_id, subnet_id=None, po
 
     Submit only subnet_id OR port_id. If both are declared result is an error.
     """
+    return api.call(ENDPOINTS['remove_router_interface'], project_token, region, router_id=router_id,
+                    subnet_id=subnet_id, port_id=port_id)
 
-    request = _rest_remove_router_interface(project_token, region, router_id, subnet_id, port_id )
 
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()['id']
+def delete_floating_ip(project_token, region, floating_ip_id):
+    """
+    Delete floating IP.
 
+    :param project_token: A valid K5 project token
+    :param region: K5 region name.
+    :param floating_ip_id: Floating IP ID.
+    :return: Http 204 if succesfull. Otherwise error code from requests library.
 
-def _rest_list_floating_ips(project_token, region):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
+    """
+    return api.call(ENDPOINTS['delete_floating_ip'], project_token, region, floating_ip_id=floating_ip_id)
 
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/floatingips'
 
-    try:
-        request = requests.get(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
+def list_floating_ips(project_token, region, models=False):
+    """
+    List floating IPs.
 
+    :param project_token: Valid K5 project token
+    :param region: K5 Region eg 'fi-1'
+    :param models: (optional) If True, list of k5lib.models.FloatingIP objects is returned. Default False.
 
-def list_floating_ips(project_token, region):
+    :return: JSON if succesfull, otherwise error from request library.
+    """
+    floating_ips = api.call(ENDPOINTS['list_floating_ips'], project_token, region)
+    if models:
+        return load_list(FloatingIP, floating_ips)
+    return floating_ips
 
-    request = _rest_list_floating_ips(project_token, region)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
\ No newline at end of file
+
+def iter_floating_ips(project_token, region, page_size=api.DEFAULT_PAGE_SIZE, filters=None, stream=False):
+    """
+    Iterate floating IPs page by page.
+
+    :param project_token: A valid K5 project token.
+    :param region: K5 region name.
+    :param page_size: (optional) Items per request, None for one request. Defaults 100.
+    :param filters: (optional) Dictionary of extra URL query parameters supported by the service.
+    :param stream: (optional) If True, responses are decoded incrementally. Defaults False.
+    :return: Generator of floating IP dictionaries. If a request fails, error is yielded as the last item.
+
+    """
+    return api.iterate(ENDPOINTS['list_floating_ips'], project_token, region, 'floatingips',
+                       page_size=page_size, filters=filters, stream=stream)
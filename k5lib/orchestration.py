@@ -4,37 +4,32 @@ Orchestration module.
  orchestration module provide functions to orchestration service of Fujitsu K5 cloud REST API
 
 """
-import requests
-import json
 import logging
+from . import api
 
 log = logging.getLogger(__name__)
 
 
-def _rest_create_stack(project_token, region, project_id, stack_name, template):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    configData = {"stack_name": stack_name,
-                  "template": template,
-                  "disable_rollback": True,
-                  "timeout_mins": 60
-                  }
-    # from portal https://orchestration.fi-1.cloud.global.fujitsu.com/v1/e77679bd08104b0483d5cd5aba0f704d
-    # from log:   https://orchestration.fi-1.cloud.global.fujitsu.com/v1/9c15ef58ce7e42098e1844b5d81202fe/stacks
-    url = 'https://orchestration.' + region + '.cloud.global.fujitsu.com/v1/' + project_id + '/stacks'
-
-    try:
-        request = requests.post(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        log.error(json.dumps(request.json(), indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
+def _stack_config(args):
+    return {"stack_name": args['stack_name'],
+            "template": args['template'],
+            "disable_rollback": True,
+            "timeout_mins": 60
+            }
+
+
+# from portal https://orchestration.fi-1.cloud.global.fujitsu.com/v1/e77679bd08104b0483d5cd5aba0f704d
+# from log:   https://orchestration.fi-1.cloud.global.fujitsu.com/v1/9c15ef58ce7e42098e1844b5d81202fe/stacks
+ENDPOINTS = api.table(
+    api.Endpoint('create_stack', 'orchestration', 'POST', '/v1/{project_id}/stacks', body=_stack_config),
+    api.Endpoint('delete_stack', 'orchestration', 'DELETE', '/v1/{project_id}/stacks/{stack_name}/{stack_id}',
+                 extract=api.raw),
+    api.Endpoint('get_stack_info', 'orchestration', 'GET', '/v1/{project_id}/stacks/{stack_name}/{stack_id}'),
+    api.Endpoint('list_stacks', 'orchestration', 'GET', '/v1/{project_id}/stacks'),
+    api.Endpoint('get_stack_id', 'orchestration', 'GET', '/v1/{project_id}/stacks',
+                 extract=api.find('stacks', 'stack_name', key='stack_name', partial=True, last=True,
+                                  missing='')),
+)
 
 
 def create_stack(project_token, region, project_id, stack_name, template):
@@ -55,29 +50,8 @@ def create_stack(project_token, region, project_id, stack_name, template):
     :return: JSON if succesfull. Otherwise error code from requests library.
 
     """
-    request = _rest_create_stack(project_token, region, project_id, stack_name, template)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
-
-
-def _rest_delete_stack(project_token, region, project_id, stack_name, stack_id):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    url = 'https://orchestration.' + region + '.cloud.global.fujitsu.com/v1/' + project_id + '/stacks' + '/' + stack_name + '/' + stack_id
-
-    try:
-        request = requests.delete(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error('Error: ' + str(e))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['create_stack'], project_token, region, project_id=project_id, stack_name=stack_name,
+                    template=template)
 
 
 def delete_stack(project_token, region, project_id, stack_name, stack_id):
@@ -92,32 +66,8 @@ def delete_stack(project_token, region, project_id, stack_name, stack_id):
     :return: Http return code 204 if succesful. Otherwise error code from requests library.
 
     """
-    request = _rest_delete_stack(project_token, region, project_id, stack_name, stack_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request
-
-
-def _rest_get_stack_info(project_token, project_id, region, stack_name, stack_id):
-    headers = {'Content-Type': 'application/json',
-               'X-Auth-Token': project_token
-               }
-
-    url = 'https://orchestration.' + region + '.cloud.global.fujitsu.com/v1/' + project_id + '/stacks/' + stack_name + '/' + stack_id
-
-    try:
-        request = requests.get(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error('headers:')
-        log.error(headers)
-        log.error('url')
-        log.error(url)
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['delete_stack'], project_token, region, project_id=project_id, stack_name=stack_name,
+                    stack_id=stack_id)
 
 
 def get_stack_info(project_token, project_id, region, stack_name, stack_id):
@@ -132,29 +82,8 @@ def get_stack_info(project_token, project_id, region, stack_name, stack_id):
     :return: JSON if succesfull. Otherwise error code from requests library.
 
     """
-    request = _rest_get_stack_info(project_token, project_id, region, stack_name, stack_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
-
-
-def _rest_list_stacks(project_token, region, project_id):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    url = 'https://orchestration.' + region + '.cloud.global.fujitsu.com/v1/' + project_id + '/stacks'
-
-    try:
-        request = requests.get(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error('Error: ' + str(e))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['get_stack_info'], project_token, region, project_id=project_id, stack_name=stack_name,
+                    stack_id=stack_id)
 
 
 def list_stacks(project_token, region, project_id):
@@ -167,34 +96,37 @@ def list_stacks(project_token, region, project_id):
     :return: JSON if succesfull. Otherwise error code from requests library.
 
     """
-    request = _rest_list_stacks(project_token, region, project_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
+    return api.call(ENDPOINTS['list_stacks'], project_token, region, project_id=project_id)
+
+
+def iter_stacks(project_token, region, project_id, page_size=api.DEFAULT_PAGE_SIZE, filters=None, stream=False):
+    """
+    Iterate stacks page by page.
+
+    :param project_token: A valid K5 project token.
+    :param region: K5 region name.
+    :param project_id: A valid project ID.
+    :param page_size: (optional) Items per request, None for one request. Defaults 100.
+    :param filters: (optional) Dictionary of extra URL query parameters supported by the service.
+    :param stream: (optional) If True, responses are decoded incrementally. Defaults False.
+    :return: Generator of stack dictionaries. If a request fails, error is yielded as the last item.
+
+    """
+    return api.iterate(ENDPOINTS['list_stacks'], project_token, region, 'stacks',
+                       page_size=page_size, filters=filters, stream=stream, project_id=project_id)
 
 
 def get_stack_id(project_token, region, project_id, stack_name):
     """
     Get stack ID.
 
+    Stack names are matched partially, the last stack in the listing whose name contains stack_name is returned.
+
     :param project_token: A valid K5 project token
     :param region: K5 region name.
     :param project_id: ID of the project
     :param stack_name: Name of the stack
-    :return: Stack ID if succesfull. Otherwise error code from requests library.
+    :return: Stack ID if succesfull, empty string if no stack matches. Otherwise error code from requests library.
 
     """
-    request = _rest_list_stacks(project_token, region, project_id)
-
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        returnValue = ''
-        outputDict = request.json()["stacks"]
-        counter = 0
-        for i in outputDict:
-            if stack_name in str(i['stack_name']):
-                returnValue = (str(i['id']))
-
-        return returnValue
+    return api.call(ENDPOINTS['get_stack_id'], project_token, region, project_id=project_id, stack_name=stack_name)
@@ -0,0 +1,305 @@
+"""
+Plan module.
+
+ Build several resources in parallel in order of their dependencies.
+
+ Resources of a topology are added to a Plan as steps. A step is a k5lib function with its
+ keyword arguments. Arguments can refer to results of other steps with the Ref returned by
+ add(), so a subnet can take ID of a network before the network exists. References make the
+ step depend on the referred step, other dependencies are given with after.
+
+ apply() runs every step as soon as all its dependencies are done, so independent branches,
+ for example two availability zones, are built at the same time. If a step fails, steps
+ depending on it are skipped and other branches continue.
+
+ Example::
+
+    from k5lib import network, plan
+
+    topology = plan.Plan(project_token, region)
+    for az in ('fi-1a', 'fi-1b'):
+        net = topology.add('net-' + az, network.create_network, az=az, network_name='net-' + az)
+        subnet = topology.add('subnet-' + az, network.create_subnet, network_id=net, cidr='10.0.0.0/24', az=az)
+        router = topology.add('router-' + az, network.create_router, name='router-' + az, az=az)
+        topology.add('interface-' + az, network.add_router_interface, router_id=router, subnet_id=subnet)
+
+    result = topology.apply()
+    print(result.results, result.elapsed, result.critical_path, result.critical_path_time)
+
+"""
+import collections
+import concurrent.futures
+import logging
+import time
+
+log = logging.getLogger(__name__)
+
+# Steps run at the same time.
+DEFAULT_MAX_WORKERS = 16
+
+
+class Ref(object):
+    """
+    Reference to result of a step.
+
+    :param name: Name of the step.
+    :param keys: (optional) Keys to pick from the result, for example Ref('server', 'server', 'id').
+
+    """
+
+    __slots__ = ('name', 'keys')
+
+    def __init__(self, name, *keys):
+        """Create a reference."""
+        self.name = name
+        self.keys = keys
+
+    def __getitem__(self, key):
+        """Refer to a part of the result."""
+        return Ref(self.name, *(self.keys + (key,)))
+
+    def resolve(self, results):
+        """
+        Get the referred value.
+
+        :param results: Dictionary of step results by name.
+        :return: Result of the step, or part of it.
+
+        """
+        value = results[self.name]
+        for key in self.keys:
+            value = value[key]
+        return value
+
+    def __repr__(self):
+        """Show step name and keys."""
+        return '<Ref ' + self.name + ''.join('[' + repr(key) + ']' for key in self.keys) + '>'
+
+
+def _refs(value):
+    if isinstance(value, Ref):
+        yield value
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            for ref in _refs(item):
+                yield ref
+    elif isinstance(value, dict):
+        for item in value.values():
+            for ref in _refs(item):
+                yield ref
+
+
+def _resolve(value, results):
+    if isinstance(value, Ref):
+        return value.resolve(results)
+    if isinstance(value, (list, tuple)):
+        return type(value)(_resolve(item, results) for item in value)
+    if isinstance(value, dict):
+        return dict((key, _resolve(item, results)) for key, item in value.items())
+    return value
+
+
+class Step(object):
+    """
+    One call of a plan.
+
+    :ivar name: Unique name of the step.
+    :ivar function: Function called.
+    :ivar args: Dictionary of keyword arguments, values may contain Ref objects.
+    :ivar depends: Set of names of steps which must be done first.
+
+    """
+
+    __slots__ = ('name', 'function', 'args', 'depends')
+
+    def __init__(self, name, function, args, depends):
+        """Create a step."""
+        self.name = name
+        self.function = function
+        self.args = args
+        self.depends = depends
+
+    def __repr__(self):
+        """Show name and function."""
+        return '<Step ' + self.name + ' ' + getattr(self.function, '__name__', str(self.function)) + '>'
+
+
+class PlanResult(object):
+    """
+    Outcome of Plan.apply().
+
+    :ivar results: Dictionary of step results by name, for example created IDs.
+    :ivar errors: Dictionary of errors by name of failed and skipped steps.
+    :ivar timings: Dictionary of (start, end) seconds from start of apply by name of run steps.
+    :ivar elapsed: Seconds the whole apply took.
+    :ivar critical_path: List of step names in the longest chain of dependencies.
+    :ivar critical_path_time: Seconds the critical path took, lower bound of elapsed with any parallelism.
+
+    """
+
+    def __init__(self, results, errors, timings, elapsed, critical_path, critical_path_time):
+        """Create a result."""
+        self.results = results
+        self.errors = errors
+        self.timings = timings
+        self.elapsed = elapsed
+        self.critical_path = critical_path
+        self.critical_path_time = critical_path_time
+
+    @property
+    def ok(self):
+        """True if every step succeeded."""
+        return not self.errors
+
+    def __repr__(self):
+        """Show counts and times."""
+        return '<PlanResult ' + str(len(self.results)) + ' done, ' + str(len(self.errors)) + ' failed, ' \
+            + '%.2fs, critical path %.2fs>' % (self.elapsed, self.critical_path_time)
+
+
+def _failed(result):
+    return isinstance(result, str) and result.startswith('Error')
+
+
+class Plan(object):
+    """
+    Set of steps with dependencies.
+
+    :param project_token: (optional) Token given to every step as project_token, unless the step has its own.
+    :param region: (optional) Region given to every step as region, unless the step has its own.
+
+    """
+
+    def __init__(self, project_token=None, region=None):
+        """Create an empty plan."""
+        self.defaults = dict((key, value) for key, value in (('project_token', project_token), ('region', region))
+                             if value is not None)
+        self.steps = collections.OrderedDict()
+
+    def add(self, step, function, after=(), **args):
+        """
+        Add a step.
+
+        :param step: Unique name of the step.
+        :param function: Function to call, for example k5lib.create_network.
+        :param after: (optional) Names or Refs of steps which must be done first, in addition to referred ones.
+        :param args: Keyword arguments of the function. Ref values are replaced by results of their steps.
+        :return: Ref to result of the step.
+
+        """
+        if step in self.steps:
+            raise ValueError('Step ' + step + ' already exists')
+        depends = set(ref.name for ref in _refs(args))
+        depends.update(item.name if isinstance(item, Ref) else item for item in after)
+        call_args = dict(self.defaults)
+        call_args.update(args)
+        self.steps[step] = Step(step, function, call_args, depends)
+        return Ref(step)
+
+    def levels(self):
+        """
+        Order steps by dependency depth without running them.
+
+        Steps of one level depend only on steps of earlier levels and can run at the same time.
+
+        :return: List of lists of step names.
+
+        """
+        for step in self.steps.values():
+            for name in step.depends:
+                if name not in self.steps:
+                    raise ValueError('Step ' + step.name + ' depends on unknown step ' + name)
+        levels = []
+        done = set()
+        remaining = list(self.steps.values())
+        while remaining:
+            level = [step.name for step in remaining if step.depends <= done]
+            if not level:
+                raise ValueError('Dependency cycle between steps ' + ', '.join(step.name for step in remaining))
+            levels.append(level)
+            done.update(level)
+            remaining = [step for step in remaining if step.name not in done]
+        return levels
+
+    def _run(self, step, results, started):
+        start = time.monotonic() - started
+        try:
+            result = step.function(**_resolve(step.args, results))
+        except Exception as e:
+            result = 'Error: ' + str(e)
+        return result, (start, time.monotonic() - started)
+
+    def apply(self, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Run all steps, each as soon as its dependencies are done.
+
+        :param max_workers: (optional) Steps run at the same time. Defaults 16.
+        :return: PlanResult object.
+
+        """
+        self.levels()
+        started = time.monotonic()
+        results = {}
+        errors = {}
+        timings = {}
+        waiting = dict((name, set(step.depends)) for name, step in self.steps.items())
+        dependents = collections.defaultdict(list)
+        for step in self.steps.values():
+            for name in step.depends:
+                dependents[name].append(step.name)
+
+        def skip(name, reason):
+            # Skip a step and everything depending on it
+            errors[name] = reason
+            waiting.pop(name, None)
+            for dependent in dependents[name]:
+                if dependent in waiting:
+                    skip(dependent, 'Error: skipped, ' + name + ' did not succeed')
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            running = {}
+            while waiting or running:
+                for name in [name for name, depends in waiting.items() if not depends]:
+                    del waiting[name]
+                    running[executor.submit(self._run, self.steps[name], results, started)] = name
+                done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    result, timings[name] = future.result()
+                    if _failed(result):
+                        log.error('Plan step ' + name + ' failed: ' + result)
+                        skip(name, result)
+                        continue
+                    results[name] = result
+                    for dependent in dependents[name]:
+                        if dependent in waiting:
+                            waiting[dependent].discard(name)
+
+        critical_path, critical_path_time = self._critical_path(timings)
+        elapsed = time.monotonic() - started
+        log.info('Plan applied in %.2fs, critical path %.2fs: %s' % (elapsed, critical_path_time,
+                                                                     ' -> '.join(critical_path)))
+        return PlanResult(results, errors, timings, elapsed, critical_path, critical_path_time)
+
+    def _critical_path(self, timings):
+        # Longest chain of step durations along dependencies
+        length = {}
+        previous = {}
+        for level in self.levels():
+            for name in level:
+                if name not in timings:
+                    continue
+                start, end = timings[name]
+                before = [depend for depend in self.steps[name].depends if depend in length]
+                best = max(before, key=lambda depend: length[depend], default=None)
+                length[name] = end - start + (length[best] if best is not None else 0)
+                previous[name] = best
+        if not length:
+            return [], 0.0
+        name = max(length, key=lambda key: length[key])
+        total = length[name]
+        path = []
+        while name is not None:
+            path.append(name)
+            name = previous[name]
+        return list(reversed(path)), total
@@ -0,0 +1,320 @@
+"""
+Prometheus module.
+
+ Metrics of k5lib in Prometheus text format.
+
+ Exporter is a k5lib.instrument hook. It counts requests, errors, retries of throttled requests,
+ bytes and latency per service, region and endpoint, and requests in flight per service and
+ region. When metrics are read it adds connection pool usage of the shared session, hit ratios
+ of the name cache and token manager, token refreshes, coalesced requests and current rates of the
+ rate limiter.
+
+ Counting is done per thread without locks, threads are summed only when metrics are read.
+ Metrics are served over HTTP for Prometheus to scrape, or written to a file for the textfile
+ collector of node_exporter.
+
+ Token authentications are counted as requests of identity service, for example
+ operation="authenticate_project". Throttled responses have code="429" or code="503".
+
+ Example::
+
+    from k5lib import prometheus
+
+    exporter = prometheus.start_http_server(9464)
+
+    exporter = prometheus.Exporter()
+    exporter.write_textfile('/var/lib/node_exporter/textfile/k5lib.prom', interval=15)
+
+"""
+import http.server
+import logging
+import os
+import tempfile
+import threading
+
+from . import authenticate
+from . import instrument
+from . import namecache
+from . import ratelimit
+from . import session
+from . import singleflight
+
+log = logging.getLogger(__name__)
+
+# Port of the metrics server.
+DEFAULT_PORT = 9464
+# Upper bounds of latency histogram buckets in seconds.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(key + '="' + _escape(value) + '"' for key, value in labels) + '}'
+
+
+def _number(value):
+    if isinstance(value, int):
+        return str(value)
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value))
+
+
+class _Metrics(object):
+
+    def __init__(self):
+        self.lines = []
+
+    def family(self, name, kind, help_text, samples):
+        # samples is a list of (labels, value), or (suffix, labels, value) for histograms
+        if not samples:
+            return
+        self.lines.append('# HELP ' + name + ' ' + help_text)
+        self.lines.append('# TYPE ' + name + ' ' + kind)
+        for sample in samples:
+            suffix, labels, value = sample if len(sample) == 3 else ('',) + tuple(sample)
+            self.lines.append(name + suffix + _labels(labels) + ' ' + _number(value))
+
+    def text(self):
+        return '\n'.join(self.lines) + '\n'
+
+
+class Exporter(instrument.Hook):
+    """
+    Hook collecting k5lib metrics for Prometheus.
+
+    :param buckets: (optional) Upper bounds of latency buckets in seconds. Defaults DEFAULT_BUCKETS.
+    :param register: (optional) If False, exporter is not added to k5lib.instrument hooks. Defaults True.
+
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, register=True):
+        """Create an exporter."""
+        self.buckets = tuple(sorted(buckets))
+        self.aggregator = instrument.Aggregator()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._started = []
+        self._server = None
+        self._writer = None
+        self._stop = threading.Event()
+        if register:
+            instrument.add_hook(self)
+
+    def _shard(self):
+        try:
+            return self._local.started
+        except AttributeError:
+            started = self._local.started = set()
+            with self._lock:
+                self._started.append(started)
+            return started
+
+    def start(self, call):
+        """Count a request in flight."""
+        self._shard().add(call)
+
+    def finish(self, call):
+        """Count a finished request."""
+        # Hooks of a request are called in one thread, calls started before the exporter are not in the set
+        self._shard().discard(call)
+        self.aggregator.finish(call)
+
+    def _in_flight(self):
+        with self._lock:
+            shards = list(self._started)
+        in_flight = {}
+        for shard in shards:
+            for call in list(shard):
+                key = (call.service, call.region)
+                in_flight[key] = in_flight.get(key, 0) + 1
+        return in_flight
+
+    def render(self):
+        """
+        Get current metrics.
+
+        :return: Metrics in Prometheus text exposition format.
+
+        """
+        stats = self.aggregator.stats()
+        in_flight = self._in_flight()
+        metrics = _Metrics()
+
+        def labels(key):
+            return list(zip(('service', 'region', 'operation'), key))
+
+        ordered = sorted(stats.items(), key=lambda pair: tuple(map(str, pair[0])))
+        requests = []
+        for key, item in ordered:
+            for status, count in sorted(item.statuses.items(), key=lambda pair: str(pair[0])):
+                requests.append((labels(key) + [('method', item.method), ('code', status or 'none')], count))
+        metrics.family('k5lib_requests_total', 'counter', 'HTTP requests sent, code none means no response.',
+                       requests)
+        for name, attribute, help_text in (
+                ('k5lib_request_errors_total', 'errors', 'Requests without response or with status 400 or above.'),
+                ('k5lib_request_retries_total', 'retries', 'Retries of throttled requests.'),
+                ('k5lib_request_bytes_total', 'bytes_sent', 'Bytes of request bodies.'),
+                ('k5lib_response_bytes_total', 'bytes_received', 'Bytes of response bodies.')):
+            metrics.family(name, 'counter', help_text,
+                           [(labels(key), getattr(item, attribute)) for key, item in ordered])
+
+        samples = []
+        for key, item in ordered:
+            histogram = item.histogram
+            counts = histogram.buckets()
+            index = 0
+            seen = 0
+            for bound in self.buckets:
+                # HDR buckets are much finer, take the ones ending at or below the bound
+                while index < len(counts) and counts[index][0] <= bound:
+                    seen = counts[index][1]
+                    index += 1
+                samples.append(('_bucket', labels(key) + [('le', _number(bound))], seen))
+            samples.append(('_bucket', labels(key) + [('le', '+Inf')], histogram.count))
+            samples.append(('_sum', labels(key), histogram.total))
+            samples.append(('_count', labels(key), histogram.count))
+        metrics.family('k5lib_request_duration_seconds', 'histogram', 'Time from sending a request to whole response.',
+                       samples)
+        metrics.family('k5lib_requests_in_flight', 'gauge', 'Requests sent and not answered yet.',
+                       [(list(zip(('service', 'region'), key)), count)
+                        for key, count in sorted(in_flight.items(), key=lambda pair: tuple(map(str, pair[0])))])
+
+        pools = session.get_pool_stats()
+        for name, field, kind, help_text in (
+                ('k5lib_pool_connections_in_use', 'in_use', 'gauge', 'Connections taken from the pool.'),
+                ('k5lib_pool_connections_idle', 'idle', 'gauge', 'Open connections waiting in the pool.'),
+                ('k5lib_pool_maxsize', 'maxsize', 'gauge', 'Connections kept open per host.'),
+                ('k5lib_pool_connections_opened_total', 'opened', 'counter', 'Connections opened.')):
+            metrics.family(name, kind, help_text, [([('host', pool['host'])], pool[field]) for pool in pools])
+
+        caches = {'name': namecache.get_name_cache_stats()}
+        # Token manager is not created just for metrics
+        manager = authenticate._token_manager
+        if manager is not None:
+            caches['token'] = manager.stats
+        for cache, counters in sorted(caches.items()):
+            hits = counters['hits']
+            misses = counters['misses']
+            metrics.family('k5lib_' + cache + '_cache_hits_total', 'counter', 'Lookups answered from ' + cache
+                           + ' cache.', [([], hits)])
+            metrics.family('k5lib_' + cache + '_cache_misses_total', 'counter', 'Lookups not found in ' + cache
+                           + ' cache.', [([], misses)])
+            metrics.family('k5lib_' + cache + '_cache_hit_ratio', 'gauge', 'Hits of all ' + cache
+                           + ' cache lookups since start.', [([], hits / float(hits + misses) if hits + misses else 0.0)])
+        metrics.family('k5lib_name_cache_entries', 'gauge', 'Cached name to ID resolutions.',
+                       [([], caches['name']['entries'])])
+        if 'token' in caches:
+            metrics.family('k5lib_token_refreshes_total', 'counter', 'Background token refreshes.',
+                           [([], caches['token']['refreshes'])])
+            metrics.family('k5lib_token_refresh_errors_total', 'counter', 'Failed background token refreshes.',
+                           [([], caches['token']['refresh_errors'])])
+
+        metrics.family('k5lib_coalesced_requests_total', 'counter', 'GET requests answered with the response of an '
+                       'identical request in flight.', [([], singleflight.get_single_flight_stats()['shared'])])
+        # Buckets never throttled have no rate
+        rates = sorted(((key, rate) for key, rate in ratelimit.get_rates().items() if rate is not None),
+                       key=lambda pair: tuple(map(str, pair[0])))
+        metrics.family('k5lib_rate_limit_requests_per_second', 'gauge', 'Current rate of the rate limiter.',
+                       [(list(zip(('region', 'service'), key)), rate) for key, rate in rates])
+        return metrics.text()
+
+    def serve(self, port=DEFAULT_PORT, host='127.0.0.1'):
+        """
+        Serve metrics over HTTP in a daemon thread.
+
+        :param port: (optional) TCP port, 0 picks a free one. Defaults 9464.
+        :param host: (optional) Address to listen. Defaults '127.0.0.1'.
+        :return: Port served.
+
+        """
+        exporter = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                content = exporter.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format, *args):
+                log.debug(self.address_string() + ' ' + format % args)
+
+        self._server = http.server.ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name='k5lib-prometheus', daemon=True).start()
+        port = self._server.server_address[1]
+        log.info('Serving k5lib metrics on ' + host + ':' + str(port))
+        return port
+
+    def write_textfile(self, path, interval=None):
+        """
+        Write metrics to a file, replacing it atomically.
+
+        :param path: File path, should end with .prom for node_exporter.
+        :param interval: (optional) If set, write again every interval seconds in a daemon thread.
+        :return: none
+
+        """
+        self._write(path)
+        if interval:
+            def write_again():
+                while not self._stop.wait(interval):
+                    try:
+                        self._write(path)
+                    except OSError as e:
+                        log.error('Writing metrics to ' + path + ' failed: ' + str(e))
+            self._writer = threading.Thread(target=write_again, name='k5lib-prometheus-textfile', daemon=True)
+            self._writer.start()
+        return
+
+    def _write(self, path):
+        directory = os.path.dirname(os.path.abspath(path))
+        handle, temporary = tempfile.mkstemp(prefix='.k5lib-', suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(handle, 'w') as output:
+                output.write(self.render())
+            os.chmod(temporary, 0o644)
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+    def close(self):
+        """
+        Stop serving and writing, and remove the exporter from hooks.
+
+        :return: none
+
+        """
+        instrument.remove_hook(self)
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        return
+
+
+def start_http_server(port=DEFAULT_PORT, host='127.0.0.1'):
+    """
+    Start collecting metrics and serve them over HTTP.
+
+    :param port: (optional) TCP port. Defaults 9464.
+    :param host: (optional) Address to listen. Defaults '127.0.0.1'.
+    :return: Exporter object.
+
+    """
+    exporter = Exporter()
+    exporter.serve(port, host)
+    return exporter
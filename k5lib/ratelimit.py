@@ -0,0 +1,282 @@
+"""
+Ratelimit module.
+
+ Client side rate limiting of k5lib requests.
+
+ Every (region, service) pair, for example ('fi-1', 'networking'), has its own token bucket.
+ A bucket does not hold requests back until K5 answers 429 Too Many Requests or 503 Service
+ Unavailable. From then on requests wait for a token before they are sent, and rate of the
+ bucket adapts to the API: it is cut in half on every throttling response and grows slowly
+ while requests succeed, so sustained throughput settles just under the limit of the API. A
+ bucket whose rate grows back to max_rate stops limiting again.
+
+ Throttled requests are retried with jittered exponential backoff, or after the delay given in
+ Retry-After header, capped at max_backoff. Idempotent requests are retried on both 429 and 503.
+ POST requests are retried only on 429, which means the request was rejected before it was
+ processed.
+
+ Example::
+
+    from k5lib import configure_rate_limit
+
+    configure_rate_limit(rate=5, max_rate=20, retries=8)
+
+"""
+import email.utils
+import random
+import threading
+import time
+import logging
+
+log = logging.getLogger(__name__)
+
+# Requests per second a bucket starts with, None for no limit until the first throttling response.
+DEFAULT_RATE = None
+# Bounds of the adapted rate. A bucket throttled without a rate starts from max rate, and stops
+# limiting when its rate is back there.
+DEFAULT_MIN_RATE = 0.5
+DEFAULT_MAX_RATE = 100.0
+# Requests a bucket lets through at once after idle time.
+DEFAULT_BURST = 10
+# Rate is raised about this many requests per second every second while requests succeed.
+DEFAULT_INCREASE = 1.0
+# Rate is multiplied with this on throttling responses.
+DEFAULT_DECREASE = 0.5
+# Retries of throttled requests.
+DEFAULT_RETRIES = 5
+# First retry waits at most this many seconds, the limit doubles on every retry.
+DEFAULT_BACKOFF = 0.5
+DEFAULT_MAX_BACKOFF = 30.0
+
+# Status codes telling the client to slow down.
+THROTTLE_STATUS = (429, 503)
+# Methods safe to send again after 503.
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE')
+
+_settings = {'enabled': True,
+             'rate': DEFAULT_RATE,
+             'min_rate': DEFAULT_MIN_RATE,
+             'max_rate': DEFAULT_MAX_RATE,
+             'burst': DEFAULT_BURST,
+             'increase': DEFAULT_INCREASE,
+             'decrease': DEFAULT_DECREASE,
+             'retries': DEFAULT_RETRIES,
+             'backoff': DEFAULT_BACKOFF,
+             'max_backoff': DEFAULT_MAX_BACKOFF}
+
+_buckets = {}
+_lock = threading.Lock()
+
+
+class _Bucket(object):
+
+    __slots__ = ('rate', 'tokens', 'updated', 'blocked_until', 'decreased')
+
+    def __init__(self, now):
+        # Rate None means requests are not limited
+        self.rate = None if _settings['rate'] is None else float(_settings['rate'])
+        self.tokens = float(_settings['burst'])
+        self.updated = now
+        self.blocked_until = 0.0
+        self.decreased = 0.0
+
+    def refill(self, now):
+        if self.rate is not None:
+            self.tokens = min(float(_settings['burst']), self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+def _bucket(key, now):
+    bucket = _buckets.get(key)
+    if bucket is None:
+        bucket = _buckets[key] = _Bucket(now)
+    return bucket
+
+
+def configure_rate_limit(enabled=None, rate=None, min_rate=None, max_rate=None, burst=None, increase=None,
+                         decrease=None, retries=None, backoff=None, max_backoff=None):
+    """
+    Configure client side rate limiting.
+
+    Settings are applied to all buckets, adapted rates start again from rate.
+
+    :param enabled: (optional) If False, requests are neither limited nor retried. Defaults True.
+    :param rate: (optional) Requests per second a bucket starts with. Defaults None, no limit until
+                 the first throttling response.
+    :param min_rate: (optional) Lowest adapted rate. Defaults 0.5.
+    :param max_rate: (optional) Rate a throttled bucket starts from and stops limiting at. Defaults 100.
+    :param burst: (optional) Requests let through at once after idle time. Defaults 10.
+    :param increase: (optional) Rate increase per second while requests succeed. Defaults 1.
+    :param decrease: (optional) Rate multiplier on throttling responses. Defaults 0.5.
+    :param retries: (optional) Retries of throttled requests. Defaults 5.
+    :param backoff: (optional) Maximum wait before first retry in seconds. Defaults 0.5.
+    :param max_backoff: (optional) Maximum wait before any retry in seconds, also caps waits asked by
+                        Retry-After header. Defaults 30.
+    :return: none
+
+    """
+    options = {'enabled': enabled,
+               'rate': rate,
+               'min_rate': min_rate,
+               'max_rate': max_rate,
+               'burst': burst,
+               'increase': increase,
+               'decrease': decrease,
+               'retries': retries,
+               'backoff': backoff,
+               'max_backoff': max_backoff}
+
+    with _lock:
+        for key, value in options.items():
+            if value is not None:
+                _settings[key] = value
+        log.info('Rate limit settings: ' + str(_settings))
+        _buckets.clear()
+    return
+
+
+def get_rate(region, service):
+    """
+    Get current adapted rate of a service.
+
+    :param region: K5 region name.
+    :param service: Service host prefix, for example 'networking'.
+    :return: Requests per second as float, or None while requests are not limited.
+
+    """
+    with _lock:
+        return _bucket((region, service), time.monotonic()).rate
+
+
+def get_rates():
+    """
+    Get current rates of all buckets.
+
+    :return: Dictionary of requests per second by (region, service), None for buckets not limiting.
+
+    """
+    with _lock:
+        return dict((key, bucket.rate) for key, bucket in _buckets.items())
+
+
+def reserve(region, service):
+    """
+    Take a token from bucket of a service.
+
+    Token is taken right away, caller must wait the returned time before sending the request.
+
+    :param region: K5 region name.
+    :param service: Service host prefix, for example 'networking'.
+    :return: Seconds to wait as float.
+
+    """
+    if not _settings['enabled']:
+        return 0.0
+    with _lock:
+        now = time.monotonic()
+        bucket = _bucket((region, service), now)
+        if bucket.rate is None:
+            return max(0.0, bucket.blocked_until - now)
+        bucket.refill(now)
+        bucket.tokens -= 1
+        delay = 0.0
+        if bucket.tokens < 0:
+            delay = -bucket.tokens / bucket.rate
+        return max(delay, bucket.blocked_until - now)
+
+
+def wait(region, service):
+    """
+    Wait until a request to a service may be sent.
+
+    :param region: K5 region name.
+    :param service: Service host prefix, for example 'networking'.
+    :return: none
+
+    """
+    delay = reserve(region, service)
+    if delay > 0:
+        time.sleep(delay)
+    return
+
+
+def retry_after(headers):
+    """
+    Read Retry-After header.
+
+    :param headers: Response headers.
+    :return: Seconds as float, or None when header is missing or invalid.
+
+    """
+    value = headers.get('Retry-After') if headers is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def record(region, service, status_code, headers=None):
+    """
+    Adapt rate of a service to a response.
+
+    :param region: K5 region name.
+    :param service: Service host prefix, for example 'networking'.
+    :param status_code: HTTP status code of the response.
+    :param headers: (optional) Response headers.
+    :return: none
+
+    """
+    if not _settings['enabled']:
+        return
+    with _lock:
+        now = time.monotonic()
+        bucket = _bucket((region, service), now)
+        if status_code in THROTTLE_STATUS:
+            delay = retry_after(headers)
+            if delay is not None:
+                bucket.blocked_until = max(bucket.blocked_until, now + min(delay, _settings['max_backoff']))
+            # Requests sent in the same second are throttled together, decrease once per second
+            if now - bucket.decreased >= 1.0:
+                if bucket.rate is None:
+                    bucket.rate = float(_settings['max_rate'])
+                bucket.refill(now)
+                bucket.rate = max(float(_settings['min_rate']), bucket.rate * _settings['decrease'])
+                bucket.tokens = min(bucket.tokens, 0.0)
+                bucket.decreased = now
+                log.warning('Throttled by ' + service + ' in ' + region + ' (' + str(status_code)
+                            + '), rate lowered to ' + '%.2f' % bucket.rate + ' requests per second')
+        elif status_code < 400 and bucket.rate is not None:
+            # Additive increase, about increase requests per second every second at full rate
+            bucket.rate += _settings['increase'] / bucket.rate
+            if bucket.rate >= _settings['max_rate']:
+                bucket.rate = None
+                log.info('Rate limit of ' + service + ' in ' + region + ' lifted')
+    return
+
+
+def retry_delay(method, status_code, headers, attempt):
+    """
+    Decide whether a throttled request is retried.
+
+    :param method: HTTP method of the request.
+    :param status_code: HTTP status code of the response.
+    :param headers: Response headers.
+    :param attempt: Number of retries done already.
+    :return: Seconds to wait before retry as float, or None when request is not retried.
+
+    """
+    if not _settings['enabled'] or attempt >= _settings['retries']:
+        return None
+    if status_code == 429 or (status_code == 503 and method.upper() in IDEMPOTENT_METHODS):
+        delay = retry_after(headers)
+        if delay is None:
+            # Full jitter spreads retries of concurrent callers
+            delay = random.uniform(0, min(_settings['max_backoff'], _settings['backoff'] * 2 ** attempt))
+        return min(delay, _settings['max_backoff'])
+    return None
@@ -0,0 +1,151 @@
+"""
+Session module.
+
+ Session module keeps one pooled HTTP session which is shared by all other k5lib modules.
+
+ K5 exposes every service of every region on its own host (for example
+ networking.fi-1.cloud.global.fujitsu.com), so the session keeps a separate keep-alive
+ connection pool per host. Pool sizes can be tuned with configure_session().
+
+"""
+import os
+import threading
+import logging
+
+log = logging.getLogger(__name__)
+
+# Number of per host pools cached by the session. One pool per regional service host.
+DEFAULT_POOL_CONNECTIONS = 32
+# Number of connections kept open per host.
+DEFAULT_POOL_MAXSIZE = 16
+
+_settings = {'pool_connections': DEFAULT_POOL_CONNECTIONS,
+             'pool_maxsize': DEFAULT_POOL_MAXSIZE,
+             'pool_block': False,
+             'keep_alive': True,
+             'max_retries': 0}
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+
+def _create_session():
+    # Imported with the first session to keep import k5lib light
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=_settings['pool_connections'],
+                          pool_maxsize=_settings['pool_maxsize'],
+                          pool_block=_settings['pool_block'],
+                          max_retries=_settings['max_retries'])
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    if not _settings['keep_alive']:
+        session.headers['Connection'] = 'close'
+    return session
+
+
+def get_session():
+    """
+    Get the shared HTTP session.
+
+    Session is created on first use. A forked child process gets its own session so
+    pooled connections are never shared between processes.
+
+    :return: requests.Session object.
+
+    """
+    global _session, _session_pid
+    session = _session
+    if session is not None and _session_pid == os.getpid():
+        return session
+    with _session_lock:
+        if _session is None or _session_pid != os.getpid():
+            _session = _create_session()
+            _session_pid = os.getpid()
+        return _session
+
+
+def configure_session(pool_connections=None, pool_maxsize=None, pool_block=None, keep_alive=None, max_retries=None):
+    """
+    Configure the shared HTTP session.
+
+    Settings are applied to a new session, currently open connections are closed.
+
+    :param pool_connections: (optional) Number of per host connection pools to keep. Defaults 32.
+    :param pool_maxsize: (optional) Maximum number of connections kept open per host. Defaults 16.
+    :param pool_block: (optional) If True, callers wait for a free connection instead of opening
+                       extra connections when a host pool is full. Defaults False.
+    :param keep_alive: (optional) If False, connections are closed after every request. Defaults True.
+    :param max_retries: (optional) Number of retries on failed connections. Defaults 0.
+    :return: none
+
+    """
+    options = {'pool_connections': pool_connections,
+               'pool_maxsize': pool_maxsize,
+               'pool_block': pool_block,
+               'keep_alive': keep_alive,
+               'max_retries': max_retries}
+
+    with _session_lock:
+        for key, value in options.items():
+            if value is not None:
+                _settings[key] = value
+        log.info('Session settings: ' + str(_settings))
+        _close()
+    return
+
+
+def close_session():
+    """
+    Close the shared HTTP session and all pooled connections.
+
+    A new session is created automatically on next request.
+
+    :return: none
+
+    """
+    with _session_lock:
+        _close()
+    return
+
+
+def get_pool_stats():
+    """
+    Get connection pool usage of the shared session.
+
+    A session is not created by this call.
+
+    :return: List of dictionaries with host, maxsize, in_use, idle, opened and requests of every
+             per host pool. opened and requests count since the pool was created.
+
+    """
+    session = _session
+    if session is None or _session_pid != os.getpid():
+        return []
+    stats = []
+    adapters = dict((id(adapter), adapter) for adapter in session.adapters.values())
+    for adapter in adapters.values():
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            # Queue holds idle connections and None for each connection which may still be opened
+            queue = list(pool.pool.queue) if pool.pool is not None else []
+            maxsize = pool.pool.maxsize if pool.pool is not None else 0
+            stats.append({'host': pool.scheme + '://' + pool.host + ':' + str(pool.port), 'maxsize': maxsize,
+                          'in_use': max(0, maxsize - len(queue)),
+                          'idle': sum(1 for connection in queue if connection is not None),
+                          'opened': pool.num_connections, 'requests': pool.num_requests})
+    return stats
+
+
+def _close():
+    global _session, _session_pid
+    if _session is not None and _session_pid == os.getpid():
+        _session.close()
+    _session = None
+    _session_pid = None
@@ -0,0 +1,174 @@
+"""
+Singleflight module.
+
+ Coalescing of identical concurrent GET requests.
+
+ When many threads resolve the same thing at once, for example find_first_free_ip listing
+ subnets or get_security_group_id listing security groups during parallel provisioning, only
+ the first one sends the request. Others asking for the same token, method and URL while it is
+ in flight wait for it and get the same response, or the same exception. Nothing is cached:
+ a request asked after the response arrived is sent again.
+
+ Streamed requests are never shared, their body can be read only once. Coroutines of k5lib.aio
+ are coalesced the same way within their event loop.
+
+ Example::
+
+    from k5lib import configure_single_flight, get_single_flight_stats
+
+    configure_single_flight(enabled=False)
+    print(get_single_flight_stats()['shared'])
+
+"""
+import threading
+import logging
+
+log = logging.getLogger(__name__)
+
+# Methods whose concurrent identical requests are answered with one response.
+COALESCED_METHODS = ('GET',)
+
+_settings = {'enabled': True}
+
+# Requests in flight by key, Flight objects for threads and asyncio tasks for event loops
+_flights = {}
+_stats = {'sent': 0, 'shared': 0}
+_lock = threading.Lock()
+
+
+class Flight(object):
+    """
+    Request in flight, waited by threads sharing it.
+
+    :ivar result: Return value of the request, set when done.
+    :ivar error: Exception raised by the request, or None.
+
+    """
+
+    def __init__(self):
+        """Create a flight at its start."""
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def configure_single_flight(enabled=None):
+    """
+    Configure coalescing of identical concurrent GET requests.
+
+    :param enabled: (optional) If False, every request is sent. Defaults True.
+    :return: none
+
+    """
+    with _lock:
+        if enabled is not None:
+            _settings['enabled'] = enabled
+        log.info('Single flight settings: ' + str(_settings))
+    return
+
+
+def get_single_flight_stats():
+    """
+    Get counters of request coalescing.
+
+    :return: Dictionary with GET requests sent and GET requests answered with a shared response since
+             start, and number of them in flight.
+
+    """
+    with _lock:
+        return {'sent': _stats['sent'], 'shared': _stats['shared'], 'in_flight': len(_flights)}
+
+
+def key(token, method, url, params=None):
+    """
+    Get key of a request, or None if it is not coalesced.
+
+    Token is part of the key, so only callers with the same scope share a response.
+
+    :param token: K5 token or None.
+    :param method: HTTP method.
+    :param url: Request URL without query.
+    :param params: (optional) URL query parameters as dictionary or list of pairs.
+    :return: Hashable key or None.
+
+    """
+    if not _settings['enabled'] or method not in COALESCED_METHODS:
+        return None
+    if isinstance(params, dict):
+        params = params.items()
+    return (token, method, url, tuple((name, str(value)) for name, value in params or ()))
+
+
+def do(key, function):
+    """
+    Run a request, or wait for the identical one in flight.
+
+    :param key: Key from key(), None runs function without coalescing.
+    :param function: Function sending the request.
+    :return: Return value of function, shared by all callers with the same key.
+
+    """
+    if key is None:
+        return function()
+    with _lock:
+        flight = _flights.get(key)
+        if flight is None:
+            flight = _flights[key] = Flight()
+            _stats['sent'] += 1
+            leader = True
+        else:
+            _stats['shared'] += 1
+            leader = False
+    if not leader:
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    try:
+        flight.result = function()
+    except BaseException as e:
+        flight.error = e
+        raise
+    finally:
+        with _lock:
+            del _flights[key]
+        flight.done.set()
+    return flight.result
+
+
+async def do_async(key, function):
+    """
+    Run a request in the event loop, or wait for the identical one in flight. Asyncio counterpart of do().
+
+    Request runs in a task of its own, so a caller cancelled while waiting does not cancel it for others.
+
+    :param key: Key from key(), None runs function without coalescing.
+    :param function: Coroutine function sending the request.
+    :return: Return value of function, shared by all callers with the same key.
+
+    """
+    # Imported here, blocking calls do not need asyncio loaded
+    import asyncio
+
+    if key is None:
+        return await function()
+    loop = asyncio.get_running_loop()
+    key = (loop,) + key
+    with _lock:
+        task = _flights.get(key)
+        if task is None:
+            task = _flights[key] = loop.create_task(function())
+            _stats['sent'] += 1
+
+            def land(task):
+                with _lock:
+                    del _flights[key]
+                # Exception is raised to callers awaiting it, retrieving it here too stops the
+                # warning of asyncio when all of them were cancelled
+                if not task.cancelled():
+                    task.exception()
+            task.add_done_callback(land)
+        else:
+            _stats['shared'] += 1
+    return await asyncio.shield(task)
@@ -0,0 +1,174 @@
+"""
+Stream module.
+
+ Incremental decoding of large list responses.
+
+ K5 list responses look like {"ports": [{...}, {...}, ...]}. ItemDecoder takes the body in
+ chunks as it arrives from the socket and returns items of the list one by one, so the whole
+ body string and the whole decoded tree are never in memory at the same time. Only standard
+ library json is used: every item is decoded separately with json.JSONDecoder.raw_decode().
+
+ Example::
+
+    from k5lib import network
+
+    for port in network.iter_ports(project_token, region, page_size=None, stream=True):
+        print(port['id'])
+
+"""
+import codecs
+import json
+import re
+
+# Chunk size read from the socket.
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_whitespace = re.compile(r'[ \t\n\r]*')
+_decoder = json.JSONDecoder()
+
+
+class ItemDecoder(object):
+    """
+    Push decoder returning items of one list of a JSON object.
+
+    Other members of the object are decoded and dropped.
+
+    :param collection: Name of the list, for example 'ports'.
+
+    """
+
+    def __init__(self, collection):
+        """Create a decoder at start of the body."""
+        self.collection = collection
+        self._text = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._pos = 0
+        self._state = 'start'
+        self._key = None
+
+    def feed(self, data):
+        """
+        Decode next chunk of body.
+
+        :param data: Bytes of the body.
+        :return: List of items completed by this chunk.
+
+        """
+        self._buffer = self._buffer[self._pos:] + self._text.decode(data)
+        self._pos = 0
+        items = []
+        while self._step(items):
+            pass
+        return items
+
+    def close(self):
+        """
+        Check that the whole body was decoded.
+
+        :return: none
+
+        """
+        if self._state != 'done':
+            raise ValueError('Truncated JSON response, ' + self.collection + ' list was not complete')
+        return
+
+    def _next_char(self):
+        self._pos = _whitespace.match(self._buffer, self._pos).end()
+        if self._pos < len(self._buffer):
+            return self._buffer[self._pos]
+        return None
+
+    def _value(self):
+        # Decode one complete value, None when more data is needed
+        char = self._next_char()
+        if char is None:
+            return None
+        try:
+            value, end = _decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            return None
+        if char not in '{["' and (end == len(self._buffer) or self._buffer[end] not in ',]} \t\n\r'):
+            # Number or literal may continue in the next chunk
+            return None
+        self._pos = end
+        return (value,)
+
+    def _expect(self, char, state):
+        found = self._next_char()
+        if found != char:
+            raise ValueError(repr(char) + ' expected, got ' + repr(found))
+        self._pos += 1
+        self._state = state
+        return True
+
+    def _step(self, items):
+        char = self._next_char()
+        if char is None or self._state == 'done':
+            return False
+
+        if self._state == 'start':
+            if char != '{':
+                raise ValueError('JSON object expected, got ' + repr(char))
+            self._pos += 1
+            self._state = 'key'
+        elif self._state in ('key', 'next'):
+            if char == '}':
+                self._pos += 1
+                self._state = 'done'
+            elif self._state == 'next':
+                if char != ',':
+                    raise ValueError('Comma expected, got ' + repr(char))
+                self._pos += 1
+                self._state = 'key'
+            else:
+                key = self._value()
+                if key is None:
+                    return False
+                self._key = key[0]
+                self._state = 'colon'
+        elif self._state == 'colon':
+            return self._expect(':', 'value')
+        elif self._state == 'value':
+            if self._key == self.collection:
+                return self._expect('[', 'first')
+            if self._value() is None:
+                return False
+            self._state = 'next'
+        elif self._state in ('first', 'item', 'after'):
+            if char == ']' and self._state != 'item':
+                self._pos += 1
+                self._state = 'next'
+            elif self._state == 'after':
+                if char != ',':
+                    raise ValueError('Comma expected, got ' + repr(char))
+                self._pos += 1
+                self._state = 'item'
+            else:
+                item = self._value()
+                if item is None:
+                    return False
+                items.append(item[0])
+                self._state = 'after'
+        return True
+
+
+def iter_items(response, collection, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Iterate items of a list response while it is read.
+
+    Response is closed when iteration ends.
+
+    :param response: requests.Response object of a request sent with stream=True.
+    :param collection: Name of the list, for example 'ports'.
+    :param chunk_size: (optional) Bytes read at a time. Defaults 64 KiB.
+    :return: Generator of item dictionaries.
+
+    """
+    decoder = ItemDecoder(collection)
+    try:
+        for chunk in response.iter_content(chunk_size):
+            for item in decoder.feed(chunk):
+                yield item
+        decoder.close()
+    finally:
+        response.close()
@@ -0,0 +1,267 @@
+"""
+Teardown module.
+
+ Delete a set of resources in parallel in order of their dependencies.
+
+ Resources are selected by name prefix, by IDs or, with all=True, by taking everything in a
+ Snapshot. Only resources whose tenant_id is the project are ever selected, so shared and
+ external networks listed by K5 are left alone, and a snapshot with listing errors is refused
+ instead of acting on a partial view. The selection is widened with what has to go first: ports
+ and subnets of selected networks, endpoints of selected connectors, floating IPs of selected
+ ports. Links between resources are read from device_id and device_owner of ports, so router
+ interfaces are removed before their router and subnet, and ports are disconnected from
+ connector endpoints before the endpoints are deleted.
+
+ Deletions are run by a k5lib.plan.Plan, so every resource is deleted as soon as everything
+ depending on it is gone. A deletion answered with 409 Conflict, for example while a server
+ is still shutting down, is tried again until timeout. A resource already gone counts as deleted.
+
+ Example::
+
+    from k5lib import teardown
+
+    print(teardown.plan_teardown(project_token, region, project_id, prefix='demo-').levels())
+    result = teardown.delete_resources(project_token, region, project_id, prefix='demo-')
+    print(result.errors)
+
+"""
+import logging
+import time
+
+from . import compute
+from . import fleet
+from . import inventory
+from . import namecache
+from . import network
+from .inventory import _value
+from .plan import DEFAULT_MAX_WORKERS, Plan
+
+log = logging.getLogger(__name__)
+
+# Seconds a deletion answered with 409 Conflict is tried again.
+DEFAULT_CONFLICT_TIMEOUT = 300
+# Longest seconds between tries of a conflicting deletion.
+MAX_CONFLICT_DELAY = 10.0
+
+_ROUTER_INTERFACE = 'network:router_interface'
+# Ports removed together with their owner
+_OWNED_PORTS = ('network:dhcp', 'network:router_gateway', 'network:floatingip')
+
+
+def _retrying(function, timeout):
+    def call(**args):
+        deadline = time.monotonic() + timeout
+        delay = 1.0
+        while True:
+            result = function(**args)
+            if not isinstance(result, str):
+                return result
+            if result.startswith('Error: 404'):
+                return 'Already deleted'
+            if not result.startswith('Error: 409') or time.monotonic() + delay > deadline:
+                return result
+            log.info(function.__name__ + ': conflict, trying again in ' + str(delay) + ' seconds')
+            time.sleep(delay)
+            delay = min(MAX_CONFLICT_DELAY, delay * 2)
+    call.__name__ = function.__name__
+    return call
+
+
+def _disconnect(project_token, region, endpoint_ids, port_id):
+    # Port knows its connector, not the endpoint, so try endpoints of the connector
+    result = 'Error: no endpoint to disconnect from'
+    for endpoint_id in endpoint_ids:
+        result = network.disconnect_network_connector_endpoint(project_token, region, endpoint_id, port_id)
+        if not isinstance(result, str) or not result.startswith('Error'):
+            break
+    return result
+
+
+def _wait_deleted(project_token, region, project_id, server_ids, timeout):
+    return fleet.wait_for_servers(project_token, region, project_id, server_ids, status='DELETED', timeout=timeout)
+
+
+def plan_teardown(project_token, region, project_id=None, prefix=None, ids=None, snapshot=None,
+                  timeout=DEFAULT_CONFLICT_TIMEOUT, all=False):
+    """
+    Make a plan deleting selected resources.
+
+    :param project_token: A valid K5 project token.
+    :param region: K5 region name.
+    :param project_id: (optional) Project ID. Defaults project of a token authenticated by k5lib.
+    :param prefix: (optional) Select resources with name starting with prefix.
+    :param ids: (optional) Iterable of IDs of resources to select.
+    :param snapshot: (optional) Snapshot of the project. Defaults a new snapshot.
+    :param timeout: (optional) Seconds deletions answered with 409 Conflict are tried again. Defaults 300.
+    :param all: (optional) If True, everything of the project in snapshot is selected. Defaults False.
+    :return: k5lib.plan.Plan object, see its levels() and apply(). Otherwise error.
+
+    """
+    ids = set(ids or ())
+    if prefix is None and not ids and not all:
+        return 'Error: Nothing selected, give prefix or ids, or all=True to delete everything of the project'
+    if project_id is None:
+        project_id = namecache.get_project_id(project_token)
+    if project_id is None:
+        return 'Error: Project ID not known, resources of other projects can not be told apart'
+    if snapshot is None:
+        snapshot = inventory.snapshot_project(project_token, region, project_id)
+    if snapshot.errors:
+        return 'Error: Snapshot is incomplete, ' + '; '.join(name + ': ' + str(error)
+                                                             for name, error in sorted(snapshot.errors.items()))
+
+    def owned(item):
+        return _value(item, 'tenant_id') == project_id
+
+    def picked(item, scoped=False):
+        if not scoped and not owned(item):
+            return False
+        if all:
+            return True
+        name = _value(item, 'name')
+        return _value(item, 'id') in ids or (prefix is not None and isinstance(name, str) and name.startswith(prefix))
+
+    def select(items, scoped=False):
+        return set(_value(item, 'id') for item in items if picked(item, scoped))
+
+    # Servers are listed under the project ID, they never belong to other projects
+    servers = select(snapshot.servers, scoped=True)
+    networks = select(snapshot.networks)
+    subnets = select(snapshot.subnets)
+    ports = select(snapshot.ports)
+    routers = select(snapshot.routers)
+    connectors = select(snapshot.network_connectors)
+    endpoints = select(snapshot.network_connector_endpoints)
+    floating_ips = select(snapshot.floating_ips)
+    security_groups = set(_value(item, 'id') for item in snapshot.security_groups
+                          if picked(item) and _value(item, 'name') != 'default')
+
+    # Whatever blocks deletion of a selected resource goes too
+    for network_id in networks:
+        subnets.update(_value(item, 'id') for item in snapshot.subnets_by_network.get(network_id, []))
+        ports.update(_value(item, 'id') for item in snapshot.ports_by_network.get(network_id, []))
+    for subnet_id in subnets:
+        ports.update(_value(item, 'id') for item in snapshot.ports_by_subnet.get(subnet_id, []))
+    for server_id in servers:
+        ports.update(_value(item, 'id') for item in snapshot.ports_by_device.get(server_id, []))
+    for connector_id in connectors:
+        endpoints.update(item['id'] for item in snapshot.endpoints_by_connector.get(connector_id, []))
+    for port_id in ports:
+        floating_ips.update(_value(item, 'id') for item in snapshot.floating_ips_by_port.get(port_id, []))
+    # Widening must not reach resources of other projects either, for example ports on a shared network
+    foreign = set(_value(item, 'id') for items in (snapshot.subnets, snapshot.ports, snapshot.floating_ips,
+                                                   snapshot.network_connector_endpoints)
+                  for item in items if not owned(item))
+    for selected in (subnets, ports, endpoints, floating_ips):
+        selected -= foreign
+
+    connector_endpoints = dict((connector_id, [item['id'] for item in items])
+                               for connector_id, items in snapshot.endpoints_by_connector.items())
+    endpoint_ids = set(item['id'] for item in snapshot.network_connector_endpoints)
+
+    plan = Plan(project_token, region)
+    floating_ip_steps = []
+    for floating_ip_id in floating_ips:
+        floating_ip_steps.append(plan.add('floating_ip:' + floating_ip_id,
+                                          _retrying(network.delete_floating_ip, timeout),
+                                          floating_ip_id=floating_ip_id))
+
+    server_steps = [plan.add('server:' + server_id, _retrying(compute.delete_server, timeout),
+                             project_id=project_id, server_id=server_id) for server_id in servers]
+    servers_gone = None
+    if server_steps:
+        servers_gone = plan.add('servers_deleted', _wait_deleted, after=server_steps, project_id=project_id,
+                                server_ids=sorted(servers), timeout=timeout)
+
+    # Last step of every port, by port ID
+    port_steps = {}
+    detach_steps = {}
+    disconnects = []
+    for port in snapshot.ports:
+        port_id = _value(port, 'id')
+        owner = _value(port, 'device_owner') or ''
+        device_id = _value(port, 'device_id')
+        if owner.startswith(_ROUTER_INTERFACE):
+            if port_id in ports or device_id in routers:
+                step = plan.add('router_interface:' + port_id, _retrying(network.remove_router_interface, timeout),
+                                after=floating_ip_steps, router_id=device_id, port_id=port_id)
+                port_steps[port_id] = detach_steps[port_id] = step
+            continue
+        if owner.startswith(_OWNED_PORTS):
+            continue
+
+        if device_id in endpoint_ids:
+            candidates = [device_id]
+        else:
+            candidates = connector_endpoints.get(device_id, [])
+        after = [step for step in (servers_gone,) if step is not None and device_id in servers]
+        after.extend('floating_ip:' + _value(item, 'id') for item in snapshot.floating_ips_by_port.get(port_id, [])
+                     if _value(item, 'id') in floating_ips)
+        if candidates and (port_id in ports or device_id in connectors or endpoints.intersection(candidates)):
+            step = plan.add('disconnect:' + port_id, _retrying(_disconnect, timeout), endpoint_ids=candidates,
+                            port_id=port_id)
+            port_steps[port_id] = detach_steps[port_id] = step
+            disconnects.append((candidates, step))
+            after.append(step)
+        if port_id in ports:
+            port_steps[port_id] = plan.add('port:' + port_id, _retrying(network.delete_port, timeout), after=after,
+                                           port_id=port_id)
+
+    def port_steps_of(items):
+        return [port_steps[_value(item, 'id')] for item in items if _value(item, 'id') in port_steps]
+
+    for subnet_id in subnets:
+        plan.add('subnet:' + subnet_id, _retrying(network.delete_subnet, timeout),
+                 after=port_steps_of(snapshot.ports_by_subnet.get(subnet_id, [])), subnet_id=subnet_id)
+    for network_id in networks:
+        after = port_steps_of(snapshot.ports_by_network.get(network_id, []))
+        after.extend('subnet:' + _value(item, 'id') for item in snapshot.subnets_by_network.get(network_id, []))
+        plan.add('network:' + network_id, _retrying(network.delete_network, timeout), after=after,
+                 network_id=network_id)
+    for router_id in routers:
+        after = [detach_steps[_value(item, 'id')] for item in snapshot.ports_by_device.get(router_id, [])
+                 if _value(item, 'id') in detach_steps]
+        plan.add('router:' + router_id, _retrying(network.delete_router, timeout), after=after, router_id=router_id)
+    for endpoint_id in endpoints:
+        after = [step for candidates, step in disconnects if endpoint_id in candidates]
+        plan.add('endpoint:' + endpoint_id, _retrying(network.delete_network_connector_endpoint, timeout),
+                 after=after, connector_endpoint_id=endpoint_id)
+    for connector_id in connectors:
+        after = ['endpoint:' + endpoint_id for endpoint_id in connector_endpoints.get(connector_id, [])
+                 if endpoint_id in endpoints]
+        plan.add('connector:' + connector_id, _retrying(network.delete_network_connector, timeout), after=after,
+                 networkConnector_id=connector_id)
+    for security_group_id in security_groups:
+        after = [port_steps[_value(port, 'id')] for port in snapshot.ports
+                 if _value(port, 'id') in port_steps and security_group_id in (_value(port, 'security_groups') or ())]
+        if servers_gone is not None:
+            after.append(servers_gone)
+        plan.add('security_group:' + security_group_id, _retrying(network.delete_security_group, timeout),
+                 after=after, security_group_id=security_group_id)
+    return plan
+
+
+def delete_resources(project_token, region, project_id=None, prefix=None, ids=None, snapshot=None,
+                     timeout=DEFAULT_CONFLICT_TIMEOUT, max_workers=DEFAULT_MAX_WORKERS, all=False):
+    """
+    Delete selected resources, independent ones at the same time.
+
+    See plan_teardown() for selection.
+
+    :param project_token: A valid K5 project token.
+    :param region: K5 region name.
+    :param project_id: (optional) Project ID. Defaults project of a token authenticated by k5lib.
+    :param prefix: (optional) Select resources with name starting with prefix.
+    :param ids: (optional) Iterable of IDs of resources to select.
+    :param snapshot: (optional) Snapshot of the project. Defaults a new snapshot.
+    :param timeout: (optional) Seconds deletions answered with 409 Conflict are tried again. Defaults 300.
+    :param max_workers: (optional) Deletions sent at the same time. Defaults 16.
+    :param all: (optional) If True, everything of the project is deleted. Defaults False.
+    :return: k5lib.plan.PlanResult object, failed and skipped deletions are in errors. Otherwise error.
+
+    """
+    plan = plan_teardown(project_token, region, project_id=project_id, prefix=prefix, ids=ids, snapshot=snapshot,
+                         timeout=timeout, all=all)
+    if isinstance(plan, str):
+        return plan
+    return plan.apply(max_workers=max_workers)
@@ -3,35 +3,164 @@
 VPN module provide functions for VPN service of Fujitsu K5 cloud REST API
 
 """
-import requests
-import json
 import logging as log
+from . import api
+from . import namecache
 
 
-def _rest_create_ipsec_vpn_service(project_token, region, az, name, router_id, subnet_id):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    configData = {"vpnservice": {
-                      "subnet_id": subnet_id,
-                      "router_id": router_id,
-                      "name": name,
-                      "admin_state_up": True,
-                      "availability_zone": az
-                  }
-                  }
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/vpn/vpnservices'
-
-    try:
-        request = requests.post(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
+def _ipsec_vpn_service_config(args):
+    return {"vpnservice": {
+        "subnet_id": args['subnet_id'],
+        "router_id": args['router_id'],
+        "name": args['name'],
+        "admin_state_up": True,
+        "availability_zone": args['az']}
+    }
+
+
+def _ipsec_policy_config(args):
+    return {"ipsecpolicy": {
+        "name": args['policy_name'],
+        "transform_protocol": args['transform_protocol'],
+        "auth_algorithm": args['auth_algorithm'],
+        "encapsulation_mode": args['encapsulation_mode'],
+        "encryption_algorithm": args['encryption_algorithm'],
+        "pfs": args['pfs'],
+        "lifetime": {
+            "units": "seconds",
+            "value": args['lifetime']
+        },
+        "availability_zone": args['az']}
+    }
+
+
+def _ike_policy_config(args):
+    return {"ikepolicy": {
+        "phase1_negotiation_mode": args['phase1_negotiation_mode'],
+        "auth_algorithm": args['auth_algorithm'],
+        "encryption_algorithm": args['encryption_algorithm'],
+        "pfs": args['pfs'],
+        "lifetime": {
+            "units": "seconds",
+            "value": args['lifetime']
+        },
+        "ike_version": args['ike_version'],
+        "name": args['policy_name'],
+        "availability_zone": args['az']}
+    }
+
+
+def _ipsec_vpn_connection_config(args):
+    return {"ipsec_site_connection": {
+        "psk": args['psk'],
+        "initiator": "bi-directional",
+        "ipsecpolicy_id": args['ipsecpolicy_id'],
+        "admin_state_up": True,
+        "peer_cidrs": args['peer_cidrs'],
+        "ikepolicy_id": args['ikepolicy_id'],
+        "dpd": {
+            "action": "hold",
+            "interval": 60,
+            "timeout": 240
+        },
+        "vpnservice_id": args['vpnservice_id'],
+        "peer_address": args['peer_address'],
+        "peer_id": args['peer_address'],
+        "name": args['connection_name'],
+        "availability_zone": args['az']}
+    }
+
+
+def _ssl_vpn_service_config(args):
+    return {'vpnservice': {
+        'availability_zone': args['az'],
+        'subnet_id': args['subnet_id'],
+        'router_id': args['router_id'],
+        'name': args['service_name'],
+        'description': args['description'],
+        'admin_state_up': args['admin_state']}
+    }
+
+
+def _ssl_vpn_connection_config(args):
+    return {"ssl_vpn_v2_connection": {
+        "name": args['connection_name'],
+        "client_address_pool_cidrs": args['pool_cidr'],
+        "admin_state_up": args['admin_state'],
+        "credential_id": args['container_id'],
+        "vpnservice_id": args['vpn_service_id'],
+        "availability_zone": args['az'],
+        "protocol": "tcp"}
+    }
+
+
+ENDPOINTS = api.table(
+    # IPsec VPN service
+    api.Endpoint('create_ipsec_vpn_service', 'networking', 'POST', '/v2.0/vpn/vpnservices',
+                 body=_ipsec_vpn_service_config, extract=api.field('vpnservice', 'id'),
+                 cache=namecache.create('vpnservice', 'name')),
+    api.Endpoint('list_ipsec_vpn_services', 'networking', 'GET', '/v2.0/vpn/vpnservices'),
+    api.Endpoint('get_ipsec_vpn_service_id', 'networking', 'GET', '/v2.0/vpn/vpnservices',
+                 query=api.name_filter('service_name'), extract=api.find('vpnservices', 'service_name'),
+                 cache=namecache.lookup('vpnservice', 'service_name')),
+    api.Endpoint('get_ipsec_vpn_service_info', 'networking', 'GET', '/v2.0/vpn/vpnservices/{service_id}'),
+    api.Endpoint('delete_ipsec_vpn_service', 'networking', 'DELETE', '/v2.0/vpn/vpnservices/{service_id}',
+                 extract=api.text, cache=namecache.delete('vpnservice', 'service_id')),
+    api.Endpoint('update_ipsec_vpn_service', 'networking', 'PUT', '/v2.0/vpn/vpnservices/{service_id}',
+                 body=_ipsec_vpn_service_config),
+    # IPsec policy
+    api.Endpoint('list_ipsec_policies', 'networking', 'GET', '/v2.0/vpn/ipsecpolicies'),
+    api.Endpoint('get_ipsec_policy_id', 'networking', 'GET', '/v2.0/vpn/ipsecpolicies',
+                 query=api.name_filter('policy_name'), extract=api.find('ipsecpolicies', 'policy_name'),
+                 cache=namecache.lookup('ipsecpolicy', 'policy_name')),
+    api.Endpoint('get_ipsec_policy_info', 'networking', 'GET', '/v2.0/vpn/ipsecpolicies/{policy_id}'),
+    api.Endpoint('delete_ipsec_policy', 'networking', 'DELETE', '/v2.0/vpn/ipsecpolicies/{policy_id}',
+                 extract=api.text, cache=namecache.delete('ipsecpolicy', 'policy_id')),
+    api.Endpoint('create_ipsec_policy', 'networking', 'POST', '/v2.0/vpn/ipsecpolicies', body=_ipsec_policy_config,
+                 extract=api.field('ipsecpolicy', 'id'), cache=namecache.create('ipsecpolicy', 'policy_name')),
+    api.Endpoint('update_ipsec_policy', 'networking', 'PUT', '/v2.0/vpn/ipsecpolicies', body=_ipsec_policy_config),
+    # IKE policy
+    api.Endpoint('list_ike_policies', 'networking', 'GET', '/v2.0/vpn/ikepolicies'),
+    api.Endpoint('get_ike_policy_id', 'networking', 'GET', '/v2.0/vpn/ikepolicies',
+                 query=api.name_filter('policy_name'), extract=api.find('ikepolicies', 'policy_name'),
+                 cache=namecache.lookup('ikepolicy', 'policy_name')),
+    api.Endpoint('get_ike_policy_info', 'networking', 'GET', '/v2.0/vpn/ikepolicies/{policy_id}'),
+    api.Endpoint('delete_ike_policy', 'networking', 'DELETE', '/v2.0/vpn/ikepolicies/{policy_id}',
+                 extract=api.text, cache=namecache.delete('ikepolicy', 'policy_id')),
+    api.Endpoint('create_ike_policy', 'networking', 'POST', '/v2.0/vpn/ikepolicies', body=_ike_policy_config,
+                 extract=api.field('ikepolicy', 'id'), cache=namecache.create('ikepolicy', 'policy_name')),
+    api.Endpoint('update_ike_policy', 'networking', 'PUT', '/v2.0/vpn/ikepolicies', body=_ike_policy_config),
+    # IPsec VPN connection, request body holds pre-shared key.
+    api.Endpoint('create_ipsec_vpn_connection', 'networking', 'POST', '/v2.0/vpn/ipsec-site-connections',
+                 body=_ipsec_vpn_connection_config, extract=api.field('ipsec_site_connection', 'id'), secret=True,
+                 cache=namecache.create('ipsec_site_connection', 'connection_name')),
+    api.Endpoint('list_ipsec_vpn_connections', 'networking', 'GET', '/v2.0/vpn/ipsec-site-connections'),
+    api.Endpoint('get_ipsec_vpn_connection_id', 'networking', 'GET', '/v2.0/vpn/ipsec-site-connections',
+                 query=api.name_filter('connection_name'),
+                 extract=api.find('ipsec_site_connections', 'connection_name'),
+                 cache=namecache.lookup('ipsec_site_connection', 'connection_name')),
+    api.Endpoint('get_ipsec_vpn_connection_info', 'networking', 'GET',
+                 '/v2.0/vpn/ipsec-site-connections/{connection_id}'),
+    api.Endpoint('delete_ipsec_vpn_connection', 'networking', 'DELETE',
+                 '/v2.0/vpn/ipsec-site-connections/{connection_id}', extract=api.text,
+                 cache=namecache.delete('ipsec_site_connection', 'connection_id')),
+    api.Endpoint('update_ipsec_vpn_connection', 'networking', 'PUT', '/v2.0/vpn/ipsec-site-connections/{connection_id}',
+                 body=_ipsec_vpn_connection_config, secret=True),
+    # SSL VPN
+    api.Endpoint('create_ssl_vpn_service', 'networking', 'POST', '/v2.0/vpn/vpnservices',
+                 body=_ssl_vpn_service_config, cache=namecache.create('vpnservice', 'service_name', key='vpnservice')),
+    api.Endpoint('create_ssl_vpn_connection', 'networking', 'POST', '/v2.0/vpn/ssl-vpn-v2-connections',
+                 body=_ssl_vpn_connection_config,
+                 cache=namecache.create('ssl_vpn_connection', 'connection_name', key='ssl_vpn_v2_connection')),
+    api.Endpoint('list_ssl_vpn_connections', 'networking', 'GET', '/v2.0/vpn/ssl-vpn-v2-connections'),
+    api.Endpoint('get_ssl_vpn_connection_id', 'networking', 'GET', '/v2.0/vpn/ssl-vpn-v2-connections',
+                 query=api.name_filter('connection_name'),
+                 extract=api.find('ssl_vpn_v2_connections', 'connection_name', missing='Not found'),
+                 cache=namecache.lookup('ssl_vpn_connection', 'connection_name')),
+    api.Endpoint('delete_ssl_vpn_connection', 'networking', 'DELETE',
+                 '/v2.0/vpn/ssl-vpn-v2-connections/{connection_id}', extract=api.raw,
+                 cache=namecache.delete('ssl_vpn_connection', 'connection_id')),
+)
 
 
 def create_ipsec_vpn_service(project_token, region, az, name, router_id, subnet_id):
@@ -46,29 +175,8 @@ def create_ipsec_vpn_service(project_token, region, az, name, router_id, subnet_
     :param subnet_id: ID of subnet to connect service
     :return: ID of IPsec vpn service if succesfull. Otherwise error from requests library.
     """
-    request = _rest_create_ipsec_vpn_service(project_token, region, az, name, router_id, subnet_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()['vpnservice']['id']
-
-
-def _rest_list_ipsec_services(project_token, region):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/vpn/vpnservices'
-
-    try:
-        request = requests.get(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error('Error: ' + str(e))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['create_ipsec_vpn_service'], project_token, region, az=az, name=name, router_id=router_id,
+                    subnet_id=subnet_id)
 
 
 def list_ipsec_vpn_services(project_token, region):
@@ -80,61 +188,35 @@ def list_ipsec_vpn_services(project_token, region):
     :return: JSON that contains IPsec VPN services if succesfull. Otherwise error from requests library.
 
     """
-    request = _rest_list_ipsec_services(project_token, region)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
+    return api.call(ENDPOINTS['list_ipsec_vpn_services'], project_token, region)
 
 
-def get_ipsec_vpn_service_id(project_token, region, service_name):
+def iter_ipsec_vpn_services(project_token, region, page_size=api.DEFAULT_PAGE_SIZE, filters=None, stream=False):
     """
-    List IPsec VPN services.
+    Iterate IPsec VPN services page by page.
 
-    :param project_token: A valid K5 project token
+    :param project_token: A valid K5 project token.
     :param region: K5 region name.
-    :return: JSON that contains IPsec VPN services if succesfull. Otherwise error from requests library.
+    :param page_size: (optional) Items per request, None for one request. Defaults 100.
+    :param filters: (optional) Dictionary of extra URL query parameters supported by the service.
+    :param stream: (optional) If True, responses are decoded incrementally. Defaults False.
+    :return: Generator of IPsec VPN service dictionaries. If a request fails, error is yielded as the last item.
 
     """
-    request = _rest_list_ipsec_services(project_token, region)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        request = request.json()
+    return api.iterate(ENDPOINTS['list_ipsec_vpn_services'], project_token, region, 'vpnservices',
+                       page_size=page_size, filters=filters, stream=stream)
 
-        # Get ID of our connector from info
-        outputList = []
-        outputDict = request['vpnservices']
 
-        counter = 0
-        for i in outputDict:
-            if str(i['name']) == service_name:
-                outputList.append(str(i['id']))
-                counter += 1
-
-        return outputList[0]
-
-
-def _rest_get_delete_ipsec_vpn_service(http_method, project_token, region, service_id):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/vpn/vpnservices/' + service_id
+def get_ipsec_vpn_service_id(project_token, region, service_name):
+    """
+    List IPsec VPN services.
 
-    try:
-        if 'get' in http_method:
-            request = requests.get(url, headers=headers)
-        else:
-            request = requests.delete(url, headers=headers)
+    :param project_token: A valid K5 project token
+    :param region: K5 region name.
+    :return: JSON that contains IPsec VPN services if succesfull. Otherwise error from requests library.
 
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error('Error: ' + str(e))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    """
+    return api.call(ENDPOINTS['get_ipsec_vpn_service_id'], project_token, region, service_name=service_name)
 
 
 def get_ipsec_vpn_service_info(project_token, region, service_id):
@@ -147,12 +229,7 @@ def get_ipsec_vpn_service_info(project_token, region, service_id):
     :return: JSON that contains IPsec VPN service info if succesfull. Otherwise error from requests library.
 
     """
-    http_method = 'get'
-    request = _rest_get_delete_ipsec_vpn_service(http_method, project_token, region, service_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
+    return api.call(ENDPOINTS['get_ipsec_vpn_service_info'], project_token, region, service_id=service_id)
 
 
 def delete_ipsec_vpn_service(project_token, region, service_id):
@@ -164,38 +241,7 @@ def delete_ipsec_vpn_service(project_token, region, service_id):
     :return: Http 204 code if succesfull. Otherwise error from requests library.
 
     """
-    http_method = 'delete'
-    request = _rest_get_delete_ipsec_vpn_service(http_method, project_token, region, service_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return str(request)
-
-
-def _rest_update_ipsec_vpn_service(project_token, region, az, service_id, name, router_id, subnet_id):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    configData = {"vpnservice": {
-                      "subnet_id": subnet_id,
-                      "router_id": router_id,
-                      "name": name,
-                      "admin_state_up": True,
-                      "availability_zone": az
-                  }
-                  }
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/vpn/vpnservices/' + service_id
-
-    try:
-        request = requests.put(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['delete_ipsec_vpn_service'], project_token, region, service_id=service_id)
 
 
 def update_ipsec_vpn_service(project_token, region, az, service_id, name=None, router_id=None, subnet_id=None):
@@ -212,35 +258,14 @@ def update_ipsec_vpn_service(project_token, region, az, service_id, name=None, r
     :return: JSON IPsec vpn service if succesfull. Otherwise error from requests library.
 
     """
-    request = _rest_update_ipsec_vpn_service(project_token, region, az, service_id, name, router_id, subnet_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
+    return api.call(ENDPOINTS['update_ipsec_vpn_service'], project_token, region, az=az, service_id=service_id,
+                    name=name, router_id=router_id, subnet_id=subnet_id)
 
 
 ########################################################################################################################
 # IPsec policy
 ########################################################################################################################
 
-def _rest_list_ipsec_policies(project_token, region):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/vpn/ipsecpolicies'
-
-    try:
-        request = requests.get(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error('Error: ' + str(e))
-        return 'Error: ' + str(e)
-    else:
-        return request
-
-
 def list_ipsec_policies(project_token, region):
     """
     List IPsec vpn policies.
@@ -250,11 +275,23 @@ def list_ipsec_policies(project_token, region):
     :return: JSON that contains ipsec policies if succesfull. Otherwise error from requests library.
 
     """
-    request = _rest_list_ipsec_policies(project_token, region)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
+    return api.call(ENDPOINTS['list_ipsec_policies'], project_token, region)
+
+
+def iter_ipsec_policies(project_token, region, page_size=api.DEFAULT_PAGE_SIZE, filters=None, stream=False):
+    """
+    Iterate IPsec policies page by page.
+
+    :param project_token: A valid K5 project token.
+    :param region: K5 region name.
+    :param page_size: (optional) Items per request, None for one request. Defaults 100.
+    :param filters: (optional) Dictionary of extra URL query parameters supported by the service.
+    :param stream: (optional) If True, responses are decoded incrementally. Defaults False.
+    :return: Generator of IPsec policy dictionaries. If a request fails, error is yielded as the last item.
+
+    """
+    return api.iterate(ENDPOINTS['list_ipsec_policies'], project_token, region, 'ipsecpolicies',
+                       page_size=page_size, filters=filters, stream=stream)
 
 
 def get_ipsec_policy_id(project_token, region, policy_name):
@@ -267,45 +304,7 @@ def get_ipsec_policy_id(project_token, region, policy_name):
     :return: ID of the ipsec policy if succesfull. Otherwise error from requests library.
 
     """
-    request = _rest_list_ipsec_policies(project_token, region)
-
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        request = request.json()
-
-        # Get ID of our connector from info
-        outputList = []
-        outputDict = request['ipsecpolicies']
-
-        counter = 0
-        for i in outputDict:
-            if str(i['name']) == policy_name:
-                outputList.append(str(i['id']))
-                counter += 1
-
-        return outputList[0]
-
-
-def _rest_get_delete_ipsec_policy(http_method, project_token, region, policy_id):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/vpn/ipsecpolicies/' + policy_id
-
-    try:
-        if 'get' in http_method:
-            request = requests.get(url, headers=headers)
-        else:
-            request = requests.delete(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error('Error: ' + str(e))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['get_ipsec_policy_id'], project_token, region, policy_name=policy_name)
 
 
 def get_ipsec_policy_info(project_token, region, policy_id):
@@ -318,12 +317,7 @@ def get_ipsec_policy_info(project_token, region, policy_id):
     :return: JSON that contains ipsec policies if succesfull. Otherwise error from requests library.
 
     """
-    http_method = 'get'
-    request = _rest_get_delete_ipsec_policy(http_method, project_token, region, policy_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
+    return api.call(ENDPOINTS['get_ipsec_policy_info'], project_token, region, policy_id=policy_id)
 
 
 def delete_ipsec_policy(project_token, region, policy_id):
@@ -336,49 +330,7 @@ def delete_ipsec_policy(project_token, region, policy_id):
     :return: Http code 204 if succesfull. Otherwise error from requests library.
 
     """
-    http_method = 'delete'
-    request = _rest_get_delete_ipsec_policy(http_method, project_token, region, policy_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return str(request)
-
-
-def _rest_create_update_ipsec_policy(http_method, project_token, region, az, policy_name, transform_protocol,
-                                     auth_algorithm, encapsulation_mode, encryption_algorithm, pfs, lifetime):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    configData = {"ipsecpolicy": {
-                      "name": policy_name,
-                      "transform_protocol": transform_protocol,
-                      "auth_algorithm": auth_algorithm,
-                      "encapsulation_mode": encapsulation_mode,
-                      "encryption_algorithm": encryption_algorithm,
-                      "pfs": pfs,
-                      "lifetime": {
-                           "units": "seconds",
-                           "value": lifetime
-                       },
-                      "availability_zone": az
-                  }
-                  }
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/vpn/ipsecpolicies'
-
-    try:
-        if 'post' in http_method:
-            request = requests.post(url, json=configData, headers=headers)
-        else:
-            request = requests.put(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['delete_ipsec_policy'], project_token, region, policy_id=policy_id)
 
 
 def create_ipsec_policy(project_token, region, az, policy_name, transform_protocol, auth_algorithm, encapsulation_mode,
@@ -398,13 +350,10 @@ def create_ipsec_policy(project_token, region, az, policy_name, transform_protoc
     :return:
 
     """
-    http_method = 'post'
-    request = _rest_create_update_ipsec_policy(http_method, project_token, region, az, policy_name, transform_protocol,
-                                               auth_algorithm, encapsulation_mode, encryption_algorithm, pfs, lifetime)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()['ipsecpolicy']['id']
+    return api.call(ENDPOINTS['create_ipsec_policy'], project_token, region, az=az, policy_name=policy_name,
+                    transform_protocol=transform_protocol, auth_algorithm=auth_algorithm,
+                    encapsulation_mode=encapsulation_mode, encryption_algorithm=encryption_algorithm, pfs=pfs,
+                    lifetime=lifetime)
 
 
 def update_ipsec_policy(project_token, region, az, policy_name, transform_protocol, auth_algorithm, encapsulation_mode,
@@ -424,50 +373,15 @@ def update_ipsec_policy(project_token, region, az, policy_name, transform_protoc
     :param lifetime:
     :return:
     """
-    """
-    Update a IPsec vpn policy.
-
-    :param project_token: A valid K5 project token
-    :param region: K5 region name.
-    :param az: Availability zone name.
-    :param policy_name: Name of IPsec policy to be created.
-    :param transform_protocol:
-    :param auth_algorithm:
-    :param encryption_algorithm:
-    :param pfs:
-    :param lifetime:
-    :return: JSON of udated ipsec policy if succesfull. Otherwise error from rewuests library.
-
-    """
-    http_method = 'put'
-    request = _rest_create_update_ipsec_policy(http_method, project_token, region, az, policy_name, transform_protocol,
-                                               auth_algorithm, encapsulation_mode, encryption_algorithm, pfs, lifetime)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
+    return api.call(ENDPOINTS['update_ipsec_policy'], project_token, region, az=az, policy_name=policy_name,
+                    transform_protocol=transform_protocol, auth_algorithm=auth_algorithm,
+                    encapsulation_mode=encapsulation_mode, encryption_algorithm=encryption_algorithm, pfs=pfs,
+                    lifetime=lifetime)
 
 
 ########################################################################################################################
 # IKE policy
 ########################################################################################################################
-def _rest_list_ike_policies(project_token, region):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/vpn/ikepolicies'
-
-    try:
-        request = requests.get(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error('Error: ' + str(e))
-        return 'Error: ' + str(e)
-    else:
-        return request
-
 
 def list_ike_policies(project_token, region):
     """
@@ -478,11 +392,23 @@ def list_ike_policies(project_token, region):
     :return: JSON that contains IKE policies if succesfull. Otherwise error from requests library.
 
     """
-    request = _rest_list_ike_policies(project_token, region)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
+    return api.call(ENDPOINTS['list_ike_policies'], project_token, region)
+
+
+def iter_ike_policies(project_token, region, page_size=api.DEFAULT_PAGE_SIZE, filters=None, stream=False):
+    """
+    Iterate IKE policies page by page.
+
+    :param project_token: A valid K5 project token.
+    :param region: K5 region name.
+    :param page_size: (optional) Items per request, None for one request. Defaults 100.
+    :param filters: (optional) Dictionary of extra URL query parameters supported by the service.
+    :param stream: (optional) If True, responses are decoded incrementally. Defaults False.
+    :return: Generator of IKE policy dictionaries. If a request fails, error is yielded as the last item.
+
+    """
+    return api.iterate(ENDPOINTS['list_ike_policies'], project_token, region, 'ikepolicies',
+                       page_size=page_size, filters=filters, stream=stream)
 
 
 def get_ike_policy_id(project_token, region, policy_name):
@@ -495,45 +421,7 @@ def get_ike_policy_id(project_token, region, policy_name):
     :return: ID of the ike policy if succesfull. Otherwise error from requests library.
 
     """
-    request = _rest_list_ike_policies(project_token, region)
-
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        request = request.json()
-
-        # Get ID of our connector from info
-        outputList = []
-        outputDict = request['ikepolicies']
-
-        counter = 0
-        for i in outputDict:
-            if str(i['name']) == policy_name:
-                outputList.append(str(i['id']))
-                counter += 1
-
-        return outputList[0]
-
-
-def _rest_get_delete_ike_policy(http_method, project_token, region, policy_id):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/vpn/ikepolicies/' + policy_id
-
-    try:
-        if 'get' in http_method:
-            request = requests.get(url, headers=headers)
-        else:
-            request = requests.delete(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error('Error: ' + str(e))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['get_ike_policy_id'], project_token, region, policy_name=policy_name)
 
 
 def get_ike_policy_info(project_token, region, policy_id):
@@ -546,12 +434,7 @@ def get_ike_policy_info(project_token, region, policy_id):
     :return: JSON that contains ike policy information if succesfull. Otherwise error from requests library.
 
     """
-    http_method = 'get'
-    request = _rest_get_delete_ike_policy(http_method, project_token, region, policy_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
+    return api.call(ENDPOINTS['get_ike_policy_info'], project_token, region, policy_id=policy_id)
 
 
 def delete_ike_policy(project_token, region, policy_id):
@@ -564,48 +447,7 @@ def delete_ike_policy(project_token, region, policy_id):
     :return: Http code 204 if succesfull. Otherwise error from requests library.
 
     """
-    http_method = 'delete'
-    request = _rest_get_delete_ike_policy(http_method, project_token, region, policy_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return str(request)
-
-
-def _rest_create_update_ike_policy(http_method, project_token, region, az, policy_name, phase1_negotiation_mode, auth_algorithm, encryption_algorithm, pfs, lifetime, ike_version):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    configData = {"ikepolicy": {
-                     "phase1_negotiation_mode": phase1_negotiation_mode,
-                     "auth_algorithm": auth_algorithm,
-                     "encryption_algorithm": encryption_algorithm,
-                     "pfs": pfs,
-                     "lifetime": {
-                         "units": "seconds",
-                         "value": lifetime
-                      },
-                     "ike_version": ike_version,
-                     "name": policy_name,
-                     "availability_zone": az
-                  }
-                  }
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/vpn/ikepolicies'
-
-    try:
-        if 'post' in http_method:
-            request = requests.post(url, json=configData, headers=headers)
-        else:
-            request = requests.put(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['delete_ike_policy'], project_token, region, policy_id=policy_id)
 
 
 def create_ike_policy(project_token, region, az, policy_name, phase1_negotiation_mode, auth_algorithm, encryption_algorithm, pfs, lifetime, ike_version):
@@ -630,12 +472,9 @@ def create_ike_policy(project_token, region, az, policy_name, phase1_negotiation
     :return: ID of IKE policy if succesfull. Otherwise error from requests library.
 
     """
-    http_method = 'post'
-    request = _rest_create_update_ike_policy(http_method, project_token, region, az, policy_name, phase1_negotiation_mode, auth_algorithm, encryption_algorithm, pfs, lifetime, ike_version)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()['ikepolicy']['id']
+    return api.call(ENDPOINTS['create_ike_policy'], project_token, region, az=az, policy_name=policy_name,
+                    phase1_negotiation_mode=phase1_negotiation_mode, auth_algorithm=auth_algorithm,
+                    encryption_algorithm=encryption_algorithm, pfs=pfs, lifetime=lifetime, ike_version=ike_version)
 
 
 def update_ike_policy(project_token, region, az, policy_name, phase1_negotiation_mode, auth_algorithm, encryption_algorithm, pfs, lifetime, ike_version):
@@ -655,55 +494,14 @@ def update_ike_policy(project_token, region, az, policy_name, phase1_negotiation
     :return: JSON of updated IKE policy if succesfull. Otherwise error from requests library.
 
     """
-    http_method = 'put'
-    request = _rest_create_update_ike_policy(http_method, project_token, region, az, policy_name, phase1_negotiation_mode, auth_algorithm, encryption_algorithm, pfs, lifetime, ike_version)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
+    return api.call(ENDPOINTS['update_ike_policy'], project_token, region, az=az, policy_name=policy_name,
+                    phase1_negotiation_mode=phase1_negotiation_mode, auth_algorithm=auth_algorithm,
+                    encryption_algorithm=encryption_algorithm, pfs=pfs, lifetime=lifetime, ike_version=ike_version)
 
 
 ########################################################################################################################
 # IPsec VPN connection
 ########################################################################################################################
-def _rest_create_ipsec_vpn_connection(project_token, region, az, connection_name, ipsecpolicy_id, ikepolicy_id,
-                                      vpnservice_id, peer_cidrs, peer_address, psk):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    configData = {"ipsec_site_connection": {
-                     "psk": psk,
-                     "initiator": "bi-directional",
-                     "ipsecpolicy_id": ipsecpolicy_id,
-                     "admin_state_up": True,
-                     "peer_cidrs": peer_cidrs,
-                     "ikepolicy_id": ikepolicy_id,
-                     "dpd": {
-                         "action": "hold",
-                         "interval": 60,
-                         "timeout": 240
-                      },
-                     "vpnservice_id": vpnservice_id,
-                     "peer_address": peer_address,
-                     "peer_id": peer_address,
-                     "name": connection_name,
-                     "availability_zone": az
-                  }
-                  }
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/vpn/ipsec-site-connections'
-
-    try:
-        request = requests.post(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
-
 
 def create_ipsec_vpn_connection(project_token, region, az, connection_name, ipsecpolicy_id, ikepolicy_id,
                                 vpnservice_id, peer_cidrs, peer_address, psk):
@@ -722,30 +520,9 @@ def create_ipsec_vpn_connection(project_token, region, az, connection_name, ipse
     :param psk:
     :return: ID of IPsec vpn connection if succesfull. Otherwise error from requests library.
     """
-    request = _rest_create_ipsec_vpn_connection(project_token, region, az, connection_name, ipsecpolicy_id, ikepolicy_id,
-                                                vpnservice_id, peer_cidrs, peer_address, psk)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()['ipsec_site_connection']['id']
-
-
-def _rest_list_ipsec_connections(project_token, region):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/vpn/ipsec-site-connections'
-
-    try:
-        request = requests.get(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error('Error: ' + str(e))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['create_ipsec_vpn_connection'], project_token, region, az=az,
+                    connection_name=connection_name, ipsecpolicy_id=ipsecpolicy_id, ikepolicy_id=ikepolicy_id,
+                    vpnservice_id=vpnservice_id, peer_cidrs=peer_cidrs, peer_address=peer_address, psk=psk)
 
 
 def list_ipsec_vpn_connections(project_token, region):
@@ -757,11 +534,23 @@ def list_ipsec_vpn_connections(project_token, region):
     :return: JSON that contains IPsec VPN connections if succesfull. Otherwise error from requests library.
 
     """
-    request = _rest_list_ipsec_connections(project_token, region)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
+    return api.call(ENDPOINTS['list_ipsec_vpn_connections'], project_token, region)
+
+
+def iter_ipsec_vpn_connections(project_token, region, page_size=api.DEFAULT_PAGE_SIZE, filters=None, stream=False):
+    """
+    Iterate IPsec VPN connections page by page.
+
+    :param project_token: A valid K5 project token.
+    :param region: K5 region name.
+    :param page_size: (optional) Items per request, None for one request. Defaults 100.
+    :param filters: (optional) Dictionary of extra URL query parameters supported by the service.
+    :param stream: (optional) If True, responses are decoded incrementally. Defaults False.
+    :return: Generator of IPsec VPN connection dictionaries. If a request fails, error is yielded as the last item.
+
+    """
+    return api.iterate(ENDPOINTS['list_ipsec_vpn_connections'], project_token, region, 'ipsec_site_connections',
+                       page_size=page_size, filters=filters, stream=stream)
 
 
 def get_ipsec_vpn_connection_id(project_token, region, connection_name):
@@ -774,45 +563,7 @@ def get_ipsec_vpn_connection_id(project_token, region, connection_name):
     :return: JSON that contains IPsec VPN connections if succesfull. Otherwise error from requests library.
 
     """
-    request = _rest_list_ipsec_connections(project_token, region)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        request = request.json()
-
-        # Get ID of our connector from info
-        outputList = []
-        outputDict = request['ipsec_site_connections']
-
-        counter = 0
-        for i in outputDict:
-            if str(i['name']) == connection_name:
-                outputList.append(str(i['id']))
-                counter += 1
-
-        return outputList[0]
-
-
-def _rest_get_delete_ipsec_vpn_connection(http_method, project_token, region, connection_id):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/vpn/ipsec-site-connections/' + connection_id
-
-    try:
-        if 'get' in http_method:
-            request = requests.get(url, headers=headers)
-        else:
-            request = requests.delete(url, headers=headers)
-
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error('Error: ' + str(e))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['get_ipsec_vpn_connection_id'], project_token, region, connection_name=connection_name)
 
 
 def get_ipsec_vpn_connection_info(project_token, region, connection_id):
@@ -825,12 +576,7 @@ def get_ipsec_vpn_connection_info(project_token, region, connection_id):
     :return: JSON that contains IPsec VPN connection info if succesfull. Otherwise error from requests library.
 
     """
-    http_method = 'get'
-    request = _rest_get_delete_ipsec_vpn_connection(http_method, project_token, region, connection_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
+    return api.call(ENDPOINTS['get_ipsec_vpn_connection_info'], project_token, region, connection_id=connection_id)
 
 
 def delete_ipsec_vpn_connection(project_token, region, connection_id):
@@ -843,52 +589,7 @@ def delete_ipsec_vpn_connection(project_token, region, connection_id):
     :return: Http 204 code if succesfull. Otherwise error from requests library.
 
     """
-    http_method = 'delete'
-    request = _rest_get_delete_ipsec_vpn_connection(http_method, project_token, region, connection_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return str(request)
-
-
-def _rest_update_ipsec_vpn_connection(project_token, region, az, connection_id, connection_name, ipsecpolicy_id,
-                                      ikepolicy_id, vpnservice_id, peer_cidrs, peer_address, psk):
-
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    configData = {"ipsec_site_connection": {
-                      "psk": psk,
-                      "initiator": "bi-directional",
-                      "ipsecpolicy_id": ipsecpolicy_id,
-                      "admin_state_up": True,
-                      "peer_cidrs": peer_cidrs,
-                      "ikepolicy_id": ikepolicy_id,
-                      "dpd": {
-                          "action": "hold",
-                          "interval": 60,
-                          "timeout": 240
-                       },
-                      "vpnservice_id": vpnservice_id,
-                      "peer_address": peer_address,
-                      "peer_id": peer_address,
-                      "name": connection_name,
-                      "availability_zone": az
-     }
-     }
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/vpn/ipsec-site-connections/' + connection_id
-
-    try:
-        request = requests.put(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['delete_ipsec_vpn_connection'], project_token, region, connection_id=connection_id)
 
 
 def update_ipsec_vpn_connection(project_token, region, az, connection_id, connection_name, ipsecpolicy_id, ikepolicy_id,
@@ -910,12 +611,11 @@ def update_ipsec_vpn_connection(project_token, region, az, connection_id, connec
     :return:  JSON IPsec vpn service if succesfull. Otherwise error from requests library.
 
     """
-    request = _rest_update_ipsec_vpn_connection(project_token, region, az, connection_id, connection_name, ipsecpolicy_id,
-                                                ikepolicy_id, vpnservice_id, peer_cidrs, peer_address, psk)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
+    return api.call(ENDPOINTS['update_ipsec_vpn_connection'], project_token, region, az=az,
+                    connection_id=connection_id, connection_name=connection_name, ipsecpolicy_id=ipsecpolicy_id,
+                    ikepolicy_id=ikepolicy_id, vpnservice_id=vpnservice_id, peer_cidrs=peer_cidrs,
+                    peer_address=peer_address, psk=psk)
+
 
 ###################################################################################################
 #
@@ -923,34 +623,6 @@ def update_ipsec_vpn_connection(project_token, region, az, connection_id, connec
 #
 ###################################################################################################
 
-def _rest_create_ssl_vpn_service(project_token, region, az, subnet_id, router_id, service_name, description, admin_state):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    configData = {'vpnservice': {
-                     'availability_zone': az,
-                     'subnet_id': subnet_id,
-                     'router_id': router_id,
-                     'name': service_name,
-                     'description': description,
-                     'admin_state_up': admin_state,
-                 }
-    }
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/vpn/vpnservices'
-
-    try:
-        request = requests.post(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
-
-
 def create_ssl_vpn_service(project_token, region, az, subnet_id, router_id, service_name='vpnservice',
                            description='ssl vpn service', admin_state=True):
     """Create SSL VPN service
@@ -966,56 +638,8 @@ def create_ssl_vpn_service(project_token, region, az, subnet_id, router_id, serv
 
     :return: JSON if succesful, othervise error from request library
     """
-    request = _rest_create_ssl_vpn_service(project_token, region, az, subnet_id, router_id,
-                                           service_name, description, admin_state)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
-
-
-def _rest_create_ssl_vpn_connection(project_token, region, az, vpn_service_id, container_id, connection_name,
-                                    pool_cidr, admin_state):
-
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-    """
-    configData = {"ssl_vpn_v2_connection": {
-         "name": connection_name,
-         "client_address_pool_cidrs": pool_cidr,
-         "admin_state_up": admin_state,
-         "credential_id": container_id ,
-         "vpnservice_id": vpn_service_id,
-         "availability_zone": az,
-         "protocol": "tcp",
-         "floatingips": None
-        }
-       }
-    """
-    configData = {"ssl_vpn_v2_connection": {
-         "name": connection_name,
-         "client_address_pool_cidrs": pool_cidr,
-         "admin_state_up": admin_state,
-         "credential_id": container_id ,
-         "vpnservice_id": vpn_service_id,
-         "availability_zone": az,
-         "protocol": "tcp"
-        }
-       }
-
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/vpn/ssl-vpn-v2-connections'
-
-    try:
-        request = requests.post(url, json=configData, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['create_ssl_vpn_service'], project_token, region, az=az, subnet_id=subnet_id,
+                    router_id=router_id, service_name=service_name, description=description, admin_state=admin_state)
 
 
 def create_ssl_vpn_connection(project_token, region, az, vpn_service_id, container_id, connection_name='ssl vpn connection',
@@ -1038,32 +662,9 @@ def create_ssl_vpn_connection(project_token, region, az, vpn_service_id, contain
 
     :return: JSON if succesfull. Otherwise error from requests library.
     """
-
-    request = _rest_create_ssl_vpn_connection(project_token, region, az, vpn_service_id, container_id, connection_name,
-                                    pool_cidr, admin_state)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
-
-
-def _rest_list_ssl_vpn_connections(project_token, region):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/vpn/ssl-vpn-v2-connections'
-
-    try:
-        request = requests.get(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error(json.dumps(configData, indent=4))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['create_ssl_vpn_connection'], project_token, region, az=az,
+                    vpn_service_id=vpn_service_id, container_id=container_id, connection_name=connection_name,
+                    pool_cidr=pool_cidr, admin_state=admin_state)
 
 
 def list_ssl_vpn_connections(project_token, region):
@@ -1075,12 +676,23 @@ def list_ssl_vpn_connections(project_token, region):
 
     :return: JSON if succesfull otherwise erroro from requests library.
     """
+    return api.call(ENDPOINTS['list_ssl_vpn_connections'], project_token, region)
+
+
+def iter_ssl_vpn_connections(project_token, region, page_size=api.DEFAULT_PAGE_SIZE, filters=None, stream=False):
+    """
+    Iterate SSL VPN connections page by page.
 
-    request = _rest_list_ssl_vpn_connections(project_token, region)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request.json()
+    :param project_token: A valid K5 project token.
+    :param region: K5 region name.
+    :param page_size: (optional) Items per request, None for one request. Defaults 100.
+    :param filters: (optional) Dictionary of extra URL query parameters supported by the service.
+    :param stream: (optional) If True, responses are decoded incrementally. Defaults False.
+    :return: Generator of SSL VPN connection dictionaries. If a request fails, error is yielded as the last item.
+
+    """
+    return api.iterate(ENDPOINTS['list_ssl_vpn_connections'], project_token, region, 'ssl_vpn_v2_connections',
+                       page_size=page_size, filters=filters, stream=stream)
 
 
 def get_ssl_vpn_connection_id(project_token, region, connection_name):
@@ -1093,44 +705,7 @@ def get_ssl_vpn_connection_id(project_token, region, connection_name):
 
     :return: ID of first found connection  if succesful, otherwise error from requests library
     """
-
-    request = _rest_list_ssl_vpn_connections(project_token, region)
-
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        request = request.json()
-
-        # Get ID of our connectoion from json
-        outputList = []
-        outputDict = request['ssl_vpn_v2_connections']
-
-        counter = 0
-        for i in outputDict:
-            if str(i['name']) == connection_name:
-                outputList.append(str(i['id']))
-                counter += 1
-        if counter:
-            return outputList[0]
-        else:
-            return 'Not found'
-
-def _rest_delete_ssl_vpn_connection(project_token, region, connection_id):
-    headers = {'Content-Type': 'application/json',
-               'Accept': 'application/json',
-               'X-Auth-Token': project_token}
-
-    url = 'https://networking.' + region + '.cloud.global.fujitsu.com/v2.0/vpn/ssl-vpn-v2-connections/'+ connection_id
-
-    try:
-        request = requests.delete(url, headers=headers)
-        request.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        # Whoops it wasn't a 200
-        log.error('Error: ' + str(e))
-        return 'Error: ' + str(e)
-    else:
-        return request
+    return api.call(ENDPOINTS['get_ssl_vpn_connection_id'], project_token, region, connection_name=connection_name)
 
 
 def delete_ssl_vpn_connection(project_token, region, connection_id):
@@ -1143,10 +718,4 @@ def delete_ssl_vpn_connection(project_token, region, connection_id):
 
     :return: HTTP 204 if succesfull otherwise error from requests library.
     """
-
-    request = _rest_delete_ssl_vpn_connection(project_token, region, connection_id)
-    if 'Error' in str(request):
-        return str(request)
-    else:
-        return request
-
+    return api.call(ENDPOINTS['delete_ssl_vpn_connection'], project_token, region, connection_id=connection_id)